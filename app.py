@@ -5,7 +5,9 @@ import json
 import time
 from datetime import datetime, timedelta
 import random
-import requests
+
+from backend.utils.http_client import API_URL, http_client
+from backend.utils.intent_router import intent_router
 
 # Page Configuration
 st.set_page_config(
@@ -72,37 +74,28 @@ st.markdown("""
 @st.cache_data(ttl=10)  # Cache for 10 seconds only (always fresh!)
 def get_live_driver_data():
     """Get live driver data from API"""
-    try:
-        response = requests.get("http://localhost:8000/current-drivers", timeout=3)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except:
-        return None
+    # Last good response while the API is down (circuit open) instead of the static fallback
+    return http_client.get_json_swr(f"{API_URL}/current-drivers", timeout=3)[0]
 
 @st.cache_data(ttl=15)  # Cache for 15 seconds
 def get_comprehensive_stats():
     """Get comprehensive system statistics"""
-    try:
-        response = requests.get("http://localhost:8000/comprehensive-stats", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except:
-        return None
+    return http_client.get_json_swr(f"{API_URL}/comprehensive-stats", timeout=5)[0]
 
 def add_emergency_driver():
     """Add emergency driver via API"""
-    try:
-        response = requests.post("http://localhost:8000/add-emergency-driver", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except:
-        return None
+    return http_client.post_json(f"{API_URL}/add-emergency-driver", timeout=5)
+
+# Routed intent -> analysis type, in priority order (for "general" questions)
+QUERY_TYPES = {
+    "emergency": "driver_safety",
+    "high_risk": "driver_safety",
+    "safety": "driver_safety",
+    "compliance": "invoice_compliance",
+    "fraud": "fraud_detection",
+    "shipment": "shipment_tracking",
+    "fleet": "fleet_optimization",
+}
 
 class LogisticsAI:
     def __init__(self):
@@ -169,6 +162,10 @@ class LogisticsAI:
     
     def process_query(self, query_type, query_text):
         """Process queries with live data integration"""
+        if query_type == "general":
+            # A general question that names a topic goes to that topic's analysis
+            query_type = QUERY_TYPES.get(intent_router.route(query_text).first(*QUERY_TYPES), "general")
+        
         if query_type == "driver_safety":
             return self.analyze_driver_safety_live(query_text)
         elif query_type == "invoice_compliance":
@@ -1,41 +1,62 @@
 import json
-import requests
+import threading
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from backend.utils.answer_cache import build_answer_cache
+from backend.utils.http_client import API_URL, MCP_URL, http_client
+from backend.utils.intent_router import intent_router
+from backend.utils.lazy import LazySingleton
+from backend.utils.notifier import delivery_summary
+
+# MCP data younger than this is current; answers built on older data are not cached
+FRESH_SECONDS = 1.0
+# MCP answers younger than this are served while a background refresh runs
+MAX_STALE_SECONDS = 5.0
 
 class WorkingLogisticsAgents:
     """Working multi-agent system for hackathon"""
     
     def __init__(self):
         print("🤖 Initializing Working Agent System...")
+        # Answers come from MCP data, not this process's stream files: expiry by TTL only
+        self.answer_cache = build_answer_cache(max_entries=512, ttl_seconds=5.0)
+        # Per calling thread: did the answer being built use default or stale MCP data?
+        self._request = threading.local()
         
     def process_query(self, query: str) -> str:
-        """Process query through agent system"""
+        """Process query through agent system (cached for a few seconds)"""
         
-        query_lower = query.lower()
+        cached = self.answer_cache.get(query)
+        if cached is not None:
+            return cached
+        
+        self._request.degraded = False
+        answer = self.route_query(query)
+        # Default or stale values are not reused: the next query retries MCP
+        if not self._request.degraded:
+            self.answer_cache.put(query, answer)
+        return answer
+    
+    def route_query(self, query: str) -> str:
+        """Route query to the matching specialist agent"""
         
-        # Route to appropriate agent based on query
-        if "driver" in query_lower or "safety" in query_lower:
+        # Route to appropriate agent based on query (first matching specialist wins)
+        intent = intent_router.route(query).first("safety", "compliance", "fraud")
+        if intent == "safety":
             return self.safety_agent(query)
-        elif "invoice" in query_lower or "compliance" in query_lower:
+        elif intent == "compliance":
             return self.compliance_agent(query)
-        elif "fraud" in query_lower or "anomaly" in query_lower:
+        elif intent == "fraud":
             return self.fraud_agent(query)
         else:
             return self.general_agent(query)
     
     def safety_agent(self, query: str) -> str:
         """Driver safety analysis agent"""
-        try:
-            # Try to get live data from MCP server
-            response = requests.get("http://localhost:8123/tools/driver_safety", timeout=2)
-            if response.status_code == 200:
-                data = response.json()
-                high_risk_count = data.get('high_risk_count', 0)
-            else:
-                high_risk_count = 2  # Fallback
-        except:
-            high_risk_count = 2  # Fallback
+        # Live data from the MCP server; last good value (with its age) if it is down or slow
+        data, age = self.mcp_data("driver_safety")
+        high_risk_count = data.get('high_risk_count', 0) if data else 2  # Fallback
             
         return f"""
 🚨 **LIVE Driver Safety Analysis** (Updated: {datetime.now().strftime('%H:%M:%S')})
@@ -44,12 +65,12 @@ class WorkingLogisticsAgents:
 - Agent Type: Safety Analysis Specialist
 - High-Risk Drivers: {high_risk_count} detected
 - Live Data Source: ✅ Pathway streams
+- Data Freshness: {self.freshness(age)}
 - Processing Time: < 1.2 seconds
 
 **Immediate Actions:**
-- Safety training notifications sent
+- Supervisor alerts (sent by the alert engine): {delivery_summary(self.delivery_status(), 'supervisors')}
 - Route reassignments initiated
-- Supervisor alerts activated
 
 **Agent Workflow:** Query → Live Data → Analysis → Response
 **Live Update Proof:** Data processed at {datetime.now().strftime('%H:%M:%S')}
@@ -57,15 +78,11 @@ class WorkingLogisticsAgents:
     
     def compliance_agent(self, query: str) -> str:
         """Invoice compliance agent"""
-        try:
-            response = requests.get("http://localhost:8123/tools/compliance_check", timeout=2)
-            if response.status_code == 200:
-                data = response.json()
-                overdue = data.get('overdue_invoices', 2)
-                due_today = data.get('due_today', 1)
-            else:
-                overdue, due_today = 2, 1
-        except:
+        data, age = self.mcp_data("compliance_check")
+        if data:
+            overdue = data.get('overdue_invoices', 2)
+            due_today = data.get('due_today', 1)
+        else:
             overdue, due_today = 2, 1
             
         return f"""
@@ -76,16 +93,39 @@ class WorkingLogisticsAgents:
 - Overdue Invoices: {overdue}
 - Due Today: {due_today}
 - Live Data: ✅ Real-time streams
+- Data Freshness: {self.freshness(age)}
 
 **Agent Actions:**
-- Payment reminders automated
+- Overdue invoice alerts (sent by the alert engine): {delivery_summary(self.delivery_status(), 'finance')}
 - Late fee calculations updated
-- Finance team notifications sent
 
 **Agent Orchestration:** Query → Route → Process → Respond
 **Live Proof:** Compliance data at {datetime.now().strftime('%H:%M:%S')}
         """
     
+    def mcp_data(self, tool: str) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """(result, age) of an MCP tool; flags the current answer as uncacheable if missing or stale"""
+        data, age = http_client.get_json_swr(f"{MCP_URL}/tools/{tool}", fresh_for=FRESH_SECONDS,
+                                             max_stale=MAX_STALE_SECONDS, timeout=2)
+        if age is None or age >= FRESH_SECONDS:
+            self._request.degraded = True
+        return data, age
+    
+    def delivery_status(self) -> Optional[Dict[str, Any]]:
+        """Webhook delivery counters of the API process, where the alert engine sends alerts"""
+        data, _ = http_client.get_json_swr(f"{API_URL}/notifications", max_stale=MAX_STALE_SECONDS, timeout=2)
+        return data.get("destinations") if data else None
+    
+    def freshness(self, age) -> str:
+        """Human-readable age of the MCP data behind an answer"""
+        if age is None:
+            return "⚠️ MCP unavailable, default values"
+        if age < 1:
+            return "< 1 second"
+        if age <= MAX_STALE_SECONDS:
+            return f"{age:.0f}s (refreshing)"
+        return f"⚠️ {age:.0f}s old (MCP unavailable, last known values)"
+    
     def fraud_agent(self, query: str) -> str:
         """Fraud detection agent"""
         return f"""
@@ -126,5 +166,5 @@ class WorkingLogisticsAgents:
 **Live Processing Evidence:** Analysis completed at {datetime.now().strftime('%H:%M:%S')}
         """
 
-# Global instance
-working_agents = WorkingLogisticsAgents()
+# Global instance (built on first use)
+working_agents = LazySingleton(WorkingLogisticsAgents)
@@ -1,13 +1,146 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import List, Dict, Any, Optional
+import asyncio
 import json
 import os
 from datetime import datetime
 import glob
 import subprocess
 import sys
+import time
+
+import anyio
+
+from backend.utils.stream_store import entity_id, entity_type, live_stream_store
+from backend.utils.hybrid_index import build_live_index
+from backend.utils.answer_cache import build_answer_cache
+from backend.utils.state_snapshot import SnapshotReader
+from backend.utils.trends import DriverTrends
+from backend.utils.score_history import ScoreHistory, parse_time_ms, parse_step_ms
+from backend.utils.alert_rules import AlertEngine, alert_rules
+from backend.utils.intent_router import intent_router
+from backend.utils.model_warmup import warmup_status_path
+from backend.utils.notifier import notifier
+from backend.utils.readiness import EventLoopLagMonitor, ReadinessChecks, load_readiness_config
+from backend.pathway.live_ingest import live_ingest, IngestBackpressure
 
 app = FastAPI(title="IntelliFlow: LIVE DATA PROOF SYSTEM")
 
+# Inverted index over stream records, kept current by the stream store
+live_index = build_live_index()
+live_stream_store.subscribe(live_index.apply_changes)
+
+# Answers are reused until the stream data they were computed from changes
+live_answer_cache = build_answer_cache(max_entries=1024)
+live_stream_store.subscribe(live_answer_cache.invalidate)
+
+# 1h / 24h sliding-window safety score trends, fed by every driver change
+driver_trends = DriverTrends()
+live_stream_store.subscribe(driver_trends.apply_changes)
+
+# Declared alert rules, evaluated on changed records only
+alert_engine = AlertEngine(alert_rules)
+live_stream_store.subscribe(alert_engine.apply_changes)
+# The notifier is subscribed on startup, once existing records have seeded the alert state
+
+# Downsampled safety score history (raw -> 1m -> 1h -> 1d as it ages)
+score_history = ScoreHistory()
+live_stream_store.subscribe(score_history.apply_changes)
+
+# Aggregates maintained incrementally by the 'live_state' Pathway profile
+aggregate_snapshot = SnapshotReader()
+
+# Per-stage lag histograms published by the pipeline's FreshnessTracker
+pipeline_freshness = SnapshotReader(os.getenv("FRESHNESS_METRICS_PATH", "./data/state/freshness_live_state.json"))
+
+# Embedding warm-up status published by the RAG pipeline processes
+rag_warmups = {profile: SnapshotReader(warmup_status_path(profile)) for profile in ("live_rag", "live_rag_system")}
+
+# Liveness / readiness: every check reads a counter maintained elsewhere (no per-check file scans)
+readiness_config = load_readiness_config()
+loop_lag = EventLoopLagMonitor()
+stream_refresher = {"passes": 0, "last_pass_ms": 0.0}
+started_at = time.time()
+
+def pipeline_commit_lag_ms() -> Optional[float]:
+    """Latest ingest -> commit lag: live_state pipeline metrics and in-process ingest"""
+    pipeline = pipeline_freshness.read() or {}
+    lags = [pipeline.get("stages", {}).get("ingest_to_commit", {}).get("last_ms")]
+    if live_ingest.running and live_ingest.visibility_lag.count:
+        lags.append(live_ingest.visibility_lag.last_ms)
+    lags = [lag for lag in lags if lag is not None]
+    return max(lags) if lags else None
+
+readiness = ReadinessChecks(readiness_config["limits"])
+readiness.add("stream_store_loaded", lambda: stream_refresher["passes"] > 0)
+readiness.add("embedding_warm", lambda: live_index.warmup is None or live_index.warmup.ready)
+readiness.add("newest_record_age_s",
+              lambda: time.time() - live_stream_store.last_change_at if live_stream_store.last_change_at else None)
+readiness.add("commit_lag_ms", pipeline_commit_lag_ms)
+readiness.add("pipeline_metrics_age_s", pipeline_freshness.age_seconds)
+readiness.add("event_loop_lag_ms", lambda: loop_lag.max_ms)
+# Sync endpoints and background refreshes wait here for a worker thread
+readiness.add("thread_pool_queue",
+              lambda: anyio.to_thread.current_default_thread_limiter().statistics().tasks_waiting)
+readiness.add("ingest_queue_fill",
+              lambda: live_ingest.queue_depth() / live_ingest.max_queue if live_ingest.running else None)
+
+@app.on_event("startup")
+async def start_health_monitors():
+    loop_lag.start()
+    
+    async def refresh_streams():
+        # Keeps the store (and the newest-record age) current without health checks touching files
+        interval = readiness_config.get("stream_refresh_interval_s", 1.0)
+        while True:
+            started = time.perf_counter()
+            await anyio.to_thread.run_sync(live_stream_store.refresh, stream_refresher["passes"] == 0)
+            stream_refresher["last_pass_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            stream_refresher["passes"] += 1
+            if not interval:
+                return
+            await anyio.sleep(interval)
+    
+    asyncio.get_running_loop().create_task(refresh_streams())
+
+@app.on_event("startup")
+async def start_embedding_warmup():
+    # Load and prime the vector model before queries need it; /ready stays 503 until then
+    if live_index.warmup is not None:
+        live_index.warmup.start()
+
+@app.on_event("startup")
+async def start_live_ingest():
+    # API writes go straight into an in-process Pathway connector
+    if os.getenv("LIVE_INGEST", "1") != "0":
+        live_ingest.start()
+
+@app.on_event("startup")
+async def start_alert_notifications():
+    async def subscribe_notifier():
+        # Records already on disk or in the ingest log fire their alerts silently (restarts
+        # don't resend the backlog); only alerts fired after this point are sent out
+        await anyio.to_thread.run_sync(live_stream_store.refresh, True)
+        if live_ingest.running:
+            await anyio.to_thread.run_sync(live_ingest.replayed.wait, 30.0)
+        alert_engine.subscribe(notifier.notify_alerts)
+    
+    asyncio.get_running_loop().create_task(subscribe_notifier())
+
+async def refresh_store():
+    """Pick up changed stream files on a worker thread (re-parsing must not block the event loop)"""
+    await anyio.to_thread.run_sync(live_stream_store.refresh)
+
+def ingest_or_429(records: List[Dict[str, Any]]) -> int:
+    """Push records into live ingest, mapping a full queue to HTTP 429"""
+    try:
+        return live_ingest.submit(records)
+    except IngestBackpressure as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
 @app.get("/")
 async def root():
     return {
@@ -31,24 +164,13 @@ async def get_current_drivers():
     """Show CURRENT state of all drivers - this will change with live updates!"""
     
     try:
-        # Read ALL driver files from streams folder (what Pathway monitors)
-        driver_files = glob.glob('./data/streams/*.json')
-        all_drivers = []
-        
-        for file_path in driver_files:
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        all_drivers.extend(data)
-                    elif isinstance(data, dict) and ('driver_id' in data or 'name' in data):
-                        all_drivers.append(data)
-            except:
-                continue
+        # Stream files changed since the last request are re-parsed (what Pathway monitors)
+        await refresh_store()
+        all_drivers = live_stream_store.records()
         
-        # Analyze driver risk levels
-        high_risk = [d for d in all_drivers if d.get('safety_score', 10) < 7.0]
-        critical_risk = [d for d in all_drivers if d.get('safety_score', 10) < 5.0]
+        # Driver risk levels from the alert engine's state
+        high_risk = alert_engine.records("driver_high_risk")
+        critical_risk = alert_engine.records("driver_critical")
         
         return {
             "live_timestamp": datetime.now().isoformat(),
@@ -58,7 +180,7 @@ async def get_current_drivers():
             "high_risk_details": high_risk[:5],  # Show top 5 for demo
             "critical_risk_details": critical_risk,
             "data_source": "LIVE FILES - Pathway monitoring",
-            "files_processed": len(driver_files),
+            "files_processed": live_stream_store.file_count,
             "proof": "This data changes when files change!",
             "average_safety_score": round(sum(d.get('safety_score', 0) for d in all_drivers) / len(all_drivers), 2) if all_drivers else 0
         }
@@ -90,50 +212,89 @@ async def add_emergency_driver():
         "created_via": "LIVE DEMO API"
     }
     
-    # Write to file (Pathway will detect this change instantly!)
-    os.makedirs('./data/streams', exist_ok=True)
-    filename = f"./data/streams/emergency_{timestamp}.json"
-    with open(filename, 'w') as f:
-        json.dump(emergency_driver, f, indent=2)
+    if live_ingest.running:
+        # Durable log + in-process Pathway connector: visible here within milliseconds, and to
+        # the pipelines and MCP servers once the ingest view is republished as a stream file
+        ingest_or_429([emergency_driver])
+        filename = live_ingest.publish_path
+        pathway_action = "Pushed straight into the Pathway ingest connector!"
+    else:
+        # Write to file (Pathway will detect this change instantly!)
+        os.makedirs('./data/streams', exist_ok=True)
+        filename = f"./data/streams/emergency_{timestamp}.json"
+        with open(filename, 'w') as f:
+            json.dump(emergency_driver, f, indent=2)
+        pathway_action = "Pathway will detect this file immediately!"
     
     return {
         "message": "🚨 EMERGENCY DRIVER ADDED TO LIVE STREAM",
         "driver": emergency_driver,
         "file_created": filename,
-        "pathway_action": "Pathway will detect this file immediately!",
+        "pathway_action": pathway_action,
         "test_instruction": "Now call /current-drivers to see the change!",
         "demo_proof": "This proves real-time file monitoring and processing!"
     }
 
+@app.post("/ingest/drivers")
+async def ingest_drivers(drivers: List[Dict[str, Any]]):
+    """Bulk ingest: driver records go through the bounded queue into Pathway"""
+    
+    if not live_ingest.running:
+        raise HTTPException(status_code=503, detail="Live ingest is disabled (LIVE_INGEST=0)")
+    
+    accepted = ingest_or_429(drivers)
+    return {
+        "accepted": accepted,
+        "rejected": len(drivers) - accepted,
+        "queue_depth": live_ingest.queue_depth(),
+        "durable_log": live_ingest.log_dir
+    }
+
 @app.get("/live-query/{question}")
 async def live_query(question: str):
     """Answer questions using LIVE data from files - responses change with data!"""
     
-    # Read current live data from all files
-    driver_files = glob.glob('./data/streams/*.json')
-    all_drivers = []
-    
-    for file_path in driver_files:
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    all_drivers.extend(data)
-                elif isinstance(data, dict) and ('driver_id' in data or 'name' in data):
-                    all_drivers.append(data)
-        except:
-            continue
+    # Pick up changed stream files only (unchanged files are not re-parsed)
+    await refresh_store()
+    # Read once: the background refresher may bump it while the answer is computed
+    version = live_stream_store.version
+    cached = live_answer_cache.get(question, version)
+    if cached is not None:
+        return {**cached, "question": question, "cache": "hit"}
+    
+    all_drivers = live_stream_store.records()
+    files_processed = live_stream_store.file_count
+    
+    # Exact id / route lookups go straight to the inverted index
+    lookup_start = time.perf_counter()
+    direct_matches = live_index.lookup(question)
+    lookup_ms = (time.perf_counter() - lookup_start) * 1000
     
     # Generate intelligent response based on CURRENT data
-    query_lower = question.lower()
+    route = intent_router.route(question)
+    intent = route.first("emergency", "high_risk", "overview")
     
-    if "emergency" in query_lower or "critical" in query_lower:
-        emergency_drivers = [d for d in all_drivers if d.get('safety_score', 10) < 2.0]
+    if direct_matches:
+        response = f"""
+🔎 DIRECT LOOKUP - Live Data at {datetime.now().strftime('%H:%M:%S')}
+
+Matching Records: {len(direct_matches)}
+Lookup Time: {lookup_ms:.3f} ms
+
+MATCHES:"""
+        
+        for i, record in enumerate(direct_matches[:5], 1):
+            details = ", ".join(f"{k}: {v}" for k, v in list(record.items())[:6])
+            response += f"""
+{i}. {details}"""
+        
+    elif intent == "emergency":
+        emergency_drivers = alert_engine.records("driver_emergency")
         response = f"""
 🚨 EMERGENCY ANALYSIS - Live Data at {datetime.now().strftime('%H:%M:%S')}
 
 Critical Drivers Found: {len(emergency_drivers)}
-Files Processed: {len(driver_files)}
+Files Processed: {files_processed}
 
 EMERGENCY DETAILS:"""
         
@@ -147,13 +308,13 @@ EMERGENCY DETAILS:"""
         if len(emergency_drivers) == 0:
             response += "\n✅ No critical emergencies detected in current data."
             
-    elif "high risk" in query_lower or "risk" in query_lower:
-        high_risk = [d for d in all_drivers if d.get('safety_score', 10) < 7.0]
+    elif intent == "high_risk":
+        high_risk = alert_engine.records("driver_high_risk")
         response = f"""
 ⚠️ HIGH RISK ANALYSIS - Live Data at {datetime.now().strftime('%H:%M:%S')}
 
 High Risk Drivers: {len(high_risk)} out of {len(all_drivers)} total
-Risk Threshold: Safety score < 7.0
+Risk Threshold: Safety score < {alert_rules.threshold('driver_high_risk')}
 
 TOP HIGH RISK DRIVERS:"""
         
@@ -162,22 +323,24 @@ TOP HIGH RISK DRIVERS:"""
 {i}. {driver.get('driver_id', 'Unknown')}: Score {driver.get('safety_score', 'N/A')}
    Incidents: {driver.get('incidents', 'N/A')}"""
             
-    elif "total" in query_lower or "count" in query_lower or "how many" in query_lower:
+    elif intent == "overview":
+        critical = alert_engine.count("driver_critical")
+        high_risk = alert_engine.count("driver_high_risk")
         response = f"""
 📊 LIVE SYSTEM OVERVIEW - Updated at {datetime.now().strftime('%H:%M:%S')}
 
 Total Drivers: {len(all_drivers)}
-Files Monitored: {len(driver_files)}
+Files Monitored: {files_processed}
 Average Safety Score: {round(sum(d.get('safety_score', 0) for d in all_drivers) / len(all_drivers), 2) if all_drivers else 0}
 
 RISK BREAKDOWN:
-• Critical (< 5.0): {len([d for d in all_drivers if d.get('safety_score', 10) < 5.0])}
-• High Risk (5.0-6.9): {len([d for d in all_drivers if 5.0 <= d.get('safety_score', 10) < 7.0])}
-• Normal (7.0+): {len([d for d in all_drivers if d.get('safety_score', 10) >= 7.0])}"""
+• Critical (< {alert_rules.threshold('driver_critical')}): {critical}
+• High Risk (< {alert_rules.threshold('driver_high_risk')}): {high_risk - critical}
+• Normal: {len(all_drivers) - high_risk}"""
 
     else:
         # General analysis
-        high_risk = [d for d in all_drivers if d.get('safety_score', 10) < 7.0]
+        high_risk = alert_engine.records("driver_high_risk")
         response = f"""
 📊 LIVE DRIVER ANALYSIS - Updated at {datetime.now().strftime('%H:%M:%S')}
 
@@ -186,88 +349,91 @@ Query: "{question}"
 Current Status:
 • Total Drivers: {len(all_drivers)}
 • High Risk Drivers: {len(high_risk)}
-• Files Processed: {len(driver_files)}
+• Files Processed: {files_processed}
 • Data Freshness: Real-time (live file monitoring)
 
 System Health: ✅ Active and monitoring"""
+        
+        related = live_index.search(question, top_k=3)
+        if related:
+            response += "\n\nMOST RELEVANT RECORDS:"
+            for i, match in enumerate(related, 1):
+                response += f"""
+{i}. {match['entity_type']} {match['entity_id'] or 'record'} (score {match['score']})"""
     
-    return {
+    result = {
         "question": question,
         "live_response": response,
         "data_timestamp": datetime.now().isoformat(),
-        "files_processed": len(driver_files),
+        "files_processed": files_processed,
         "drivers_analyzed": len(all_drivers),
+        "direct_matches": len(direct_matches),
+        **route.to_dict(),
+        "lookup_ms": round(lookup_ms, 3),
         "proof": "This answer changes when data files change!",
         "system_status": "✅ LIVE PROCESSING ACTIVE"
     }
+    live_answer_cache.put(question, result, version)
+    
+    return {**result, "cache": "miss"}
+
+@app.get("/cache-stats")
+async def cache_stats():
+    """Hit/miss metrics of the live answer cache"""
+    
+    return {
+        "answer_cache": live_answer_cache.stats(),
+        "data_version": live_stream_store.version,
+        "timestamp": datetime.now().isoformat()
+    }
 
 @app.get("/comprehensive-stats")
 async def get_comprehensive_stats():
     """Show comprehensive system statistics from all data sources"""
     
     try:
-        # Read all comprehensive data files
-        files_data = {}
-        file_mappings = {
-            'drivers': './data/streams/drivers_comprehensive.json',
-            'shipments': './data/streams/shipments_comprehensive.json', 
-            'invoices': './data/streams/invoices_comprehensive.json',
-            'fleet': './data/streams/fleet_optimization.json',
-            'summary': './data/streams/system_summary.json'
-        }
-        
-        # Also read individual emergency files
-        emergency_files = glob.glob('./data/streams/emergency_*.json')
-        emergency_drivers = []
-        for file_path in emergency_files:
-            try:
-                with open(file_path, 'r') as f:
-                    emergency_drivers.append(json.load(f))
-            except:
-                continue
-        
-        for key, file_path in file_mappings.items():
-            try:
-                with open(file_path, 'r') as f:
-                    files_data[key] = json.load(f)
-            except:
-                files_data[key] = []
+        # Stream files and API-ingested records, as kept current by the background refresher;
+        # an entity present in several files is counted once (latest file wins)
+        entities: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for record in live_stream_store.records():
+            entities.setdefault(entity_type(record), {})[entity_id(record)] = record
         
         # Calculate live statistics
-        drivers = files_data.get('drivers', [])
-        shipments = files_data.get('shipments', [])
-        invoices = files_data.get('invoices', [])
-        fleet = files_data.get('fleet', [])
+        all_drivers = list(entities.get('driver', {}).values())
+        shipments = list(entities.get('shipment', {}).values())
+        invoices = list(entities.get('invoice', {}).values())
+        fleet = list(entities.get('vehicle', {}).values())
+        emergency_drivers = [d for d in all_drivers if str(d.get('driver_id', '')).startswith('D-EMERGENCY')]
+        emergency_files = glob.glob('./data/streams/emergency_*.json')
         
-        # Include emergency drivers in total count
-        total_drivers = len(drivers) + len(emergency_drivers)
-        all_drivers = drivers + emergency_drivers
+        total_drivers = len(all_drivers)
+        overdue = alert_rules.filter("invoice_overdue", invoices)
         
         stats = {
             "system_overview": {
                 "total_drivers": total_drivers,
-                "high_risk_drivers": len([d for d in all_drivers if d.get('safety_score', 10) < 6.5]),
+                "high_risk_drivers": len(alert_rules.filter("driver_high_risk", all_drivers)),
                 "emergency_drivers": len(emergency_drivers),
                 "active_shipments": len(shipments),
-                "anomaly_shipments": len([s for s in shipments if s.get('deviation_km', 0) > 30]),
+                "anomaly_shipments": len(alert_rules.filter("shipment_route_deviation", shipments)),
                 "total_invoices": len(invoices),
-                "overdue_invoices": len([i for i in invoices if i.get('status') == 'overdue']),
+                "overdue_invoices": len(overdue),
                 "fleet_size": len(fleet),
                 "maintenance_due": len([f for f in fleet if f.get('maintenance_due', False)]),
                 "emergency_files_created": len(emergency_files)
             },
             "risk_analysis": {
-                "critical_drivers": [d for d in all_drivers if d.get('safety_score', 10) < 5.0][:5],
+                "critical_drivers": alert_rules.filter("driver_critical", all_drivers)[:5],
                 "recent_emergencies": emergency_drivers[-3:] if emergency_drivers else [],
                 "high_value_shipments": sorted([s for s in shipments if s.get('value', 0) > 200000], 
                                              key=lambda x: x.get('value', 0), reverse=True)[:5],
-                "urgent_invoices": [i for i in invoices if i.get('status') == 'overdue'][:5]
+                "urgent_invoices": overdue[:5]
             },
             "performance_metrics": {
                 "average_safety_score": round(sum(d.get('safety_score', 0) for d in all_drivers) / len(all_drivers), 2) if all_drivers else 0,
                 "total_shipment_value": sum(s.get('value', 0) for s in shipments),
                 "fleet_utilization": round(sum(f.get('utilization_rate', 0) for f in fleet) / len(fleet), 1) if fleet else 0,
-                "compliance_rate": round((len(invoices) - len([i for i in invoices if i.get('status') == 'overdue'])) / len(invoices) * 100, 1) if invoices else 100
+                "compliance_rate": round((len(invoices) - len(overdue)) / len(invoices) * 100, 1) if invoices else 100
             },
             "live_timestamp": datetime.now().isoformat(),
             "data_freshness": "LIVE - Updated in real-time via Pathway monitoring",
@@ -286,6 +452,143 @@ async def get_comprehensive_stats():
             }
         }
 
+@app.get("/drivers/{driver_id}/trends")
+async def get_driver_trends(driver_id: str):
+    """1h and 24h sliding-window min, mean and slope of a driver's safety score"""
+    
+    await refresh_store()
+    trends = driver_trends.trends(driver_id)
+    if trends is None:
+        raise HTTPException(status_code=404, detail=f"No safety score readings for driver {driver_id}")
+    return trends
+
+@app.get("/drivers/{driver_id}/history")
+async def get_driver_history(driver_id: str, start: Optional[str] = Query(None, alias="from"),
+                             end: Optional[str] = Query(None, alias="to"), step: Optional[str] = None):
+    """Safety score history; from/to as epoch ms or ISO time, step as ms or 1m/15m/1h/1d"""
+    
+    try:
+        end_ms = parse_time_ms(end) if end else int(time.time() * 1000)
+        start_ms = parse_time_ms(start) if start else end_ms - 24 * 3600 * 1000
+        step_ms = parse_step_ms(step) if step else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await refresh_store()
+    history = score_history.history(driver_id, start_ms, end_ms, step_ms)
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"No safety score history for driver {driver_id}")
+    return history
+
+@app.get("/trends/deteriorating")
+async def get_deteriorating_drivers(window: str = "24h", limit: int = 20):
+    """Drivers whose safety score is falling fastest over the window"""
+    
+    if window not in driver_trends.windows:
+        raise HTTPException(status_code=400, detail=f"window must be one of {', '.join(driver_trends.windows)}")
+    await refresh_store()
+    return {
+        "window": window,
+        "drivers": driver_trends.deteriorating(window, limit),
+        "stats": driver_trends.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/alerts")
+async def get_alerts(rule: Optional[str] = None, severity: Optional[str] = None, entity: Optional[str] = None):
+    """Active alerts, one per (rule, entity), maintained from record changes"""
+    
+    await refresh_store()
+    return {
+        "alerts": alert_engine.alerts(rule, severity, entity),
+        "rules": [r.to_dict() for r in alert_rules.rules],
+        "stats": alert_engine.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/notifications")
+async def get_notifications():
+    """Outbound webhook delivery state per destination (queued, delivered, retries, lag)"""
+    
+    return {
+        "destinations": notifier.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/aggregates")
+async def get_aggregates():
+    """Risk buckets, overdue invoices, anomalies and fleet utilization from Pathway"""
+    
+    snapshot = aggregate_snapshot.read()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="No aggregate snapshot yet - start: python -m backend.pathway.pipeline_runner --profile live_state"
+        )
+    
+    return {
+        **snapshot,
+        "snapshot_age_seconds": aggregate_snapshot.age_seconds(),
+        "data_source": "Pathway incremental groupby/reduce tables"
+    }
+
+@app.get("/metrics/freshness")
+async def freshness_metrics():
+    """Lag histograms: file write → Pathway commit → sink → API visibility"""
+    
+    await refresh_store()
+    aggregate_snapshot.read()
+    pipeline = pipeline_freshness.read() or {}
+    
+    return {
+        "pipeline_stages": pipeline.get("stages", {}),
+        "api_stages": {
+            "write_to_api": live_stream_store.visibility_lag.to_dict(),
+            "ingest_to_api": live_ingest.visibility_lag.to_dict(),
+            "sink_to_api": aggregate_snapshot.visibility_lag.to_dict()
+        },
+        "canary": {
+            "api": live_stream_store.canary,
+            "pipeline": pipeline.get("canary", {})
+        },
+        "pipeline_metrics_age_seconds": pipeline_freshness.age_seconds(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/live")
+async def liveness():
+    """Liveness: the process and its event loop respond (no dependency checks)"""
+    
+    return {
+        "alive": True,
+        "uptime_seconds": round(time.time() - started_at, 1),
+        "event_loop": loop_lag.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 while any check is over its limit (config/readiness.json)"""
+    
+    result = readiness.evaluate()
+    body = {
+        **result,
+        "embedding_warmup": live_index.warmup.status() if live_index.warmup is not None else None,
+        "stream_refresher": stream_refresher,
+        "event_loop": loop_lag.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+    return body if result["ready"] else JSONResponse(body, status_code=503)
+
+@app.get("/metrics/warmup")
+async def warmup_metrics():
+    """Model load and warm-up durations: this API's embedder and the RAG pipelines"""
+    
+    return {
+        "api_embedder": live_index.warmup.status() if live_index.warmup is not None else None,
+        "rag_pipelines": {profile: reader.read() for profile, reader in rag_warmups.items()},
+        "timestamp": datetime.now().isoformat()
+    }
+
 @app.post("/generate-demo-data")
 async def generate_demo_data():
     """Generate comprehensive demo data for professional presentation"""
@@ -345,15 +648,16 @@ async def hackathon_compliance():
 
 @app.get("/health")
 async def health_check():
-    """Comprehensive health check for judges"""
+    """Comprehensive health check for judges (maintained counters only, see /live and /ready)"""
     
-    files_count = len(glob.glob('./data/streams/*.json'))
+    result = readiness.evaluate()
     
     return {
-        "status": "✅ HEALTHY",
+        "status": "✅ HEALTHY" if result["ready"] else "⚠️ NOT READY",
         "api": "✅ OPERATIONAL", 
         "pathway_monitoring": "✅ ACTIVE",
-        "live_files": files_count,
+        "live_files": live_stream_store.file_count,
+        "failing_checks": [name for name, check in result["checks"].items() if not check["ok"]],
         "system_ready": "🏆 HACKATHON READY",
         "timestamp": datetime.now().isoformat()
     }
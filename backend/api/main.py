@@ -2,7 +2,9 @@ from fastapi import FastAPI, HTTPException
 import json
 import os
 from datetime import datetime
-import glob
+from typing import Optional
+
+from backend.utils.segment_log import discover_logs, merge_results
 
 app = FastAPI(title="IntelliFlow: REAL Pathway Integration")
 
@@ -48,26 +50,23 @@ async def pathway_live_demo():
     }
 
 @app.get("/pathway-results")
-async def get_pathway_results():
-    """Show results of Pathway processing"""
+async def get_pathway_results(since: Optional[int] = None, limit: int = 20, sink: Optional[str] = None):
+    """Show results of Pathway processing (newest rows, or rows after `since` in pipeline ms)"""
     
     try:
-        # Check what Pathway processed
-        processed_files = glob.glob('./data/processed/*.json')
+        # Segment logs written by the pipeline runner; only tail segments are read
+        logs = discover_logs('./data/processed')
+        if sink:
+            logs = {name: reader for name, reader in logs.items() if name == sink}
         
-        results = []
-        for file_path in processed_files[-3:]:  # Last 3 files
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    results.append(data)
-            except:
-                continue
+        limit = max(1, min(limit, 1000))
+        results, next_since = merge_results(logs, since, limit)
         
         return {
             "pathway_processing": "✅ ACTIVE",
-            "processed_files": len(processed_files),
+            "sinks": {name: len(reader.segments()) for name, reader in logs.items()},
             "results": results,
+            "next_since": next_since,
             "timestamp": datetime.now().isoformat(),
             "proof": "These results generated by REAL Pathway framework"
         }
@@ -1,127 +1,168 @@
 import pathway as pw
 from pathway.xpacks.llm.mcp_server import McpServable, McpServer, PathwayMcp
-import json
 import os
-import glob
 from datetime import datetime
+from typing import Any, Dict, Optional
+
+from backend.pathway.pipeline_runner import PipelineRunner, load_profile
+from backend.utils.alert_rules import alert_rules
+
+MCP_PROFILE = os.getenv("MCP_PIPELINE_PROFILE", "mcp")
+
+
+def driver_safety_result(count: Optional[int], drivers: Any) -> Dict[str, Any]:
+    return {
+        "analysis_type": "driver_safety",
+        "timestamp": datetime.now().isoformat(),
+        "high_risk_count": count or 0,
+        "high_risk_drivers": [driver.value for driver in drivers or ()],
+        "live_update": "✅ Maintained incrementally by Pathway"
+    }
+
+
+def logistics_data_result(drivers: Optional[int], shipments: Optional[int],
+                          invoices: Optional[int]) -> Dict[str, Any]:
+    return {
+        "data_sources": ["drivers", "shipments", "invoices"],
+        "total_drivers": drivers or 0,
+        "total_shipments": shipments or 0,
+        "total_invoices": invoices or 0,
+        "last_update": datetime.now().isoformat(),
+        "live_streaming": "✅ Active"
+    }
+
+
+def anomalies_result(count: Optional[int], shipments: Any) -> Dict[str, Any]:
+    rule = alert_rules["shipment_route_deviation"]
+    anomalies = [
+        {
+            "shipment_id": shipment_id or 'unknown',
+            "anomaly_type": "route_deviation",
+            "severity": rule.severity,
+            "details": f"Route deviation of {deviation} km detected"
+        }
+        for shipment_id, deviation in shipments or ()
+    ]
+    return {
+        "analysis_type": "anomaly_detection",
+        "timestamp": datetime.now().isoformat(),
+        "anomaly_count": count or 0,
+        "anomalies": anomalies,
+        "live_update": "✅ Maintained incrementally by Pathway"
+    }
+
+
+@pw.udf(deterministic=False)
+def driver_safety_response(count: Optional[int], drivers: Any) -> pw.Json:
+    return pw.Json(driver_safety_result(count, drivers))
+
+
+@pw.udf(deterministic=False)
+def logistics_data_response(drivers: Optional[int], shipments: Optional[int],
+                            invoices: Optional[int]) -> pw.Json:
+    return pw.Json(logistics_data_result(drivers, shipments, invoices))
+
+
+@pw.udf(deterministic=False)
+def anomalies_response(count: Optional[int], shipments: Any) -> pw.Json:
+    return pw.Json(anomalies_result(count, shipments))
+
+
+# Tools a batch call may name, evaluated from the row of joined views
+BATCH_TOOLS = {
+    "get_driver_safety_analysis": lambda row: driver_safety_result(row["high_risk_count"], row["high_risk"]),
+    "get_live_logistics_data": lambda row: logistics_data_result(row["drivers"], row["shipments"], row["invoices"]),
+    "detect_anomalies": lambda row: anomalies_result(row["anomaly_count"], row["anomalies"]),
+}
+
+
+@pw.udf(deterministic=False)
+def batch_response(tools: Any, high_risk_count: Optional[int], high_risk: Any,
+                   anomaly_count: Optional[int], anomalies: Any, drivers: Optional[int],
+                   shipments: Optional[int], invoices: Optional[int]) -> pw.Json:
+    row = {"high_risk_count": high_risk_count, "high_risk": high_risk, "anomaly_count": anomaly_count,
+           "anomalies": anomalies, "drivers": drivers, "shipments": shipments, "invoices": invoices}
+    results = []
+    for tool in tools or ():
+        if tool in BATCH_TOOLS:
+            results.append({"tool": tool, "result": BATCH_TOOLS[tool](row)})
+        else:
+            results.append({"tool": tool, "error": f"unknown tool '{tool}'"})
+    return pw.Json({"snapshot": {"loaded_at": datetime.now().isoformat()}, "results": results})
+
+
+def tool_views(tables: Dict[str, pw.Table]) -> Dict[str, pw.Table]:
+    """Single-row tables the tools answer from, updated as the streams change"""
+    high_risk = tables["drivers"].filter(pw.this.safety_score < alert_rules.threshold("driver_high_risk"))
+    deviations = tables["shipments"].filter(
+        pw.this.deviation_km > alert_rules.threshold("shipment_route_deviation")
+    )
+    views = {
+        "high_risk_drivers": high_risk.reduce(
+            count=pw.reducers.count(),
+            drivers=pw.reducers.tuple(pw.this.record),
+        ),
+        "route_anomalies": deviations.reduce(
+            count=pw.reducers.count(),
+            shipments=pw.reducers.tuple(pw.make_tuple(pw.this.shipment_id, pw.this.deviation_km)),
+        ),
+    }
+    for entity in ("drivers", "shipments", "invoices"):
+        views[f"{entity}_total"] = tables[entity].reduce(total=pw.reducers.count())
+    return views
+
 
 class LogisticsMCPServer(McpServable):
-    """Pathway MCP Server for Logistics Intelligence"""
+    """Pathway MCP Server for Logistics Intelligence
+
+    The entity tables are built once from a pipeline profile and kept
+    current by Pathway. Each tool joins its query table against a
+    single-row view (asof now: answered with the state at query time),
+    so a call costs O(answer size) and never touches the stream files.
+    """
     
-    def __init__(self):
-        self.live_data = {}
-        self.load_live_streams()
+    def __init__(self, profile: str = MCP_PROFILE):
+        self.runner = PipelineRunner(load_profile(profile), profile)
+        self.tables = self.runner.build()
+        self.views = tool_views(self.tables)
     
-    def load_live_streams(self):
-        """Load live streaming data from all available streams"""
-        try:
-            # Load drivers data
-            drivers_data = []
-            for file_path in glob.glob('data/streams/drivers*.json'):
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            drivers_data.extend(data)
-                        else:
-                            drivers_data.append(data)
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
-            self.live_data['drivers'] = drivers_data
-            
-            # Load shipments data
-            shipments_data = []
-            for file_path in glob.glob('data/streams/shipments*.json'):
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            shipments_data.extend(data)
-                        else:
-                            shipments_data.append(data)
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
-            self.live_data['shipments'] = shipments_data
-            
-            # Load invoices data
-            invoices_data = []
-            for file_path in glob.glob('data/streams/invoices*.json'):
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            invoices_data.extend(data)
-                        else:
-                            invoices_data.append(data)
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
-            self.live_data['invoices'] = invoices_data
-            
-            print(f"✅ Loaded {len(drivers_data)} drivers, {len(shipments_data)} shipments, {len(invoices_data)} invoices")
-        except Exception as e:
-            print(f"Error loading streams: {e}")
-            # Initialize with empty data if loading fails
-            self.live_data = {'drivers': [], 'shipments': [], 'invoices': []}
+    def _lookup(self, query_table: pw.Table, view: str, **columns) -> pw.Table:
+        """Attach the current row of `view` to every query (None while it is empty)"""
+        return query_table.asof_now_join_left(self.views[view], id=pw.left.id).select(
+            *pw.left, **{name: pw.right[column] for name, column in columns.items()}
+        )
     
     def get_driver_safety_analysis(self, query_table: pw.Table) -> pw.Table:
         """MCP Tool: Real-time driver safety analysis"""
-        self.load_live_streams()  # Always fresh data
-        
-        high_risk_drivers = [
-            d for d in self.live_data.get('drivers', []) 
-            if isinstance(d, dict) and d.get('safety_score', 10) < 8.0
-        ]
-        
-        result = {
-            "analysis_type": "driver_safety",
-            "timestamp": datetime.now().isoformat(),
-            "high_risk_count": len(high_risk_drivers),
-            "high_risk_drivers": high_risk_drivers,
-            "live_update": "✅ Data refreshed in real-time"
-        }
-        
-        return query_table.select(mcp_response=json.dumps(result))
+        answers = self._lookup(query_table, "high_risk_drivers", count="count", drivers="drivers")
+        return answers.select(result=driver_safety_response(pw.this.count, pw.this.drivers))
     
     def get_live_logistics_data(self, query_table: pw.Table) -> pw.Table:
         """MCP Tool: Get live logistics data"""
-        self.load_live_streams()  # Fresh data every call
-        
-        result = {
-            "data_sources": list(self.live_data.keys()),
-            "total_drivers": len(self.live_data.get('drivers', [])),
-            "total_shipments": len(self.live_data.get('shipments', [])),
-            "total_invoices": len(self.live_data.get('invoices', [])),
-            "last_update": datetime.now().isoformat(),
-            "live_streaming": "✅ Active"
-        }
-        
-        return query_table.select(mcp_response=json.dumps(result))
+        answers = self._lookup(query_table, "drivers_total", drivers="total")
+        answers = self._lookup(answers, "shipments_total", shipments="total")
+        answers = self._lookup(answers, "invoices_total", invoices="total")
+        return answers.select(
+            result=logistics_data_response(pw.this.drivers, pw.this.shipments, pw.this.invoices)
+        )
     
     def detect_anomalies(self, query_table: pw.Table) -> pw.Table:
         """MCP Tool: Detect anomalies in shipments"""
-        self.load_live_streams()  # Fresh data every call
-        
-        # Detect route deviations and value anomalies
-        anomalies = []
-        for shipment in self.live_data.get('shipments', []):
-            if isinstance(shipment, dict):
-                if shipment.get('deviation', 0) > 20:
-                    anomalies.append({
-                        "shipment_id": shipment.get('shipment_id', 'unknown'),
-                        "anomaly_type": "route_deviation",
-                        "severity": "high",
-                        "details": f"Route deviation of {shipment.get('deviation')} km detected"
-                    })
-        
-        result = {
-            "analysis_type": "anomaly_detection",
-            "timestamp": datetime.now().isoformat(),
-            "anomaly_count": len(anomalies),
-            "anomalies": anomalies,
-            "live_update": "✅ Data refreshed in real-time"
-        }
-        
-        return query_table.select(mcp_response=json.dumps(result))
+        answers = self._lookup(query_table, "route_anomalies", count="count", shipments="shipments")
+        return answers.select(result=anomalies_response(pw.this.count, pw.this.shipments))
+    
+    def batch_tools(self, query_table: pw.Table) -> pw.Table:
+        """MCP Tool: Run several tools in one call, all against the same Pathway state"""
+        # Every join sees the views as of the query's arrival time, so the results are consistent
+        answers = self._lookup(query_table, "high_risk_drivers", high_risk_count="count", high_risk="drivers")
+        answers = self._lookup(answers, "route_anomalies", anomaly_count="count", anomalies="shipments")
+        answers = self._lookup(answers, "drivers_total", drivers="total")
+        answers = self._lookup(answers, "shipments_total", shipments="total")
+        answers = self._lookup(answers, "invoices_total", invoices="total")
+        return answers.select(result=batch_response(
+            pw.this.tools, pw.this.high_risk_count, pw.this.high_risk, pw.this.anomaly_count,
+            pw.this.anomalies, pw.this.drivers, pw.this.shipments, pw.this.invoices
+        ))
     
     def register_mcp(self, server: McpServer):
         """Register MCP tools with the server"""
@@ -146,6 +187,15 @@ class LogisticsMCPServer(McpServable):
             request_handler=self.detect_anomalies,
             schema=EmptySchema
         )
+        
+        class BatchSchema(pw.Schema):
+            tools: list[str]
+        
+        server.tool(
+            "batch_tools",
+            request_handler=self.batch_tools,
+            schema=BatchSchema
+        )
 
 def start_mcp_server():
     """Start the Pathway MCP Server"""
@@ -167,7 +217,7 @@ def start_mcp_server():
         )
         
         print("✅ MCP Server running on port 8123")
-        pw.run()
+        logistics_tools.runner.run()
     except Exception as e:
         print(f"⚠️ Error starting MCP server: {e}")
         print("🔄 Attempting to restart with different configuration...")
@@ -181,7 +231,7 @@ def start_mcp_server():
         )
         
         print("✅ MCP Server running on port 8123 (localhost)")
-        pw.run()
+        logistics_tools.runner.run()
 
 if __name__ == "__main__":
     start_mcp_server()
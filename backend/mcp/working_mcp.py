@@ -1,27 +1,164 @@
-import json
 import os
+import threading
 from datetime import datetime
-from fastapi import FastAPI
+from typing import Any, Dict, List
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 import uvicorn
 
+from backend.pathway.live_ingest import INGEST_PUBLISH_PATH
+from backend.utils.alert_rules import alert_rules
+from backend.utils.file_cache import file_cache
+
+FALLBACK_DRIVERS = [
+    {"driver_id": "D-001", "name": "John Smith", "safety_score": 9.2, "incidents": 0},
+    {"driver_id": "D-002", "name": "Maria Garcia", "safety_score": 7.1, "incidents": 3}
+]
+
+# Shared default for missing files: the same object every call, so it never looks like a change
+NO_RECORDS = ()
+
+# Tool names used by the Pathway MCP server, so one batch payload works against both
+TOOL_ALIASES = {
+    "get_driver_safety_analysis": "driver_safety",
+    "get_live_logistics_data": "live_data",
+    "detect_anomalies": "anomalies",
+}
+
+
+class ToolCall(BaseModel):
+    tool: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    calls: List[ToolCall]
+
+
 class WorkingMCPServer:
     """Working MCP-style server for hackathon"""
     
     def __init__(self):
         self.app = FastAPI(title="Logistics MCP Server", version="1.0.0")
-        self.setup_routes()
+        self.tools = {
+            "driver_safety": self.driver_safety,
+            "live_data": self.live_data_summary,
+            "compliance_check": self.compliance_check,
+            "anomalies": self.anomalies,
+        }
         self.live_data = {}
+        self.sources = {}
+        self.snapshot_version = 0
+        self._lock = threading.Lock()
+        self.setup_routes()
+    
+    async def load_live_data(self) -> Dict[str, Any]:
+        """Current snapshot of the streams; a new one only when a file changed (data never mutated)"""
+        sources = {
+            "drivers": await file_cache.get('data/streams/drivers.json', FALLBACK_DRIVERS),
+            # Drivers added through the API's live ingest
+            "ingested_drivers": await file_cache.get(INGEST_PUBLISH_PATH, NO_RECORDS),
+            "shipments": await file_cache.get('data/streams/shipments.json', NO_RECORDS),
+            "invoices": await file_cache.get('data/streams/invoices.json', NO_RECORDS),
+        }
+        with self._lock:
+            if any(self.sources.get(name) is not value for name, value in sources.items()):
+                self.snapshot_version += 1
+                self.sources = sources
+                self.live_data = {
+                    "drivers": [*sources["drivers"], *sources["ingested_drivers"]],
+                    "shipments": sources["shipments"],
+                    "invoices": sources["invoices"],
+                    "version": self.snapshot_version,
+                    "loaded_at": datetime.now().isoformat(),
+                    # Tool results derived from this snapshot, computed once
+                    "derived": {},
+                }
+            return self.live_data
+    
+    def derive(self, snapshot: Dict[str, Any], name: str, compute):
+        derived = snapshot["derived"]
+        if name not in derived:
+            derived[name] = compute()
+        return derived[name]
+    
+    def driver_safety(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        high_risk_drivers = self.derive(
+            snapshot, "high_risk", lambda: alert_rules.filter("driver_high_risk", snapshot.get('drivers', []))
+        )
         
-    def load_live_data(self):
-        """Load live data from streams"""
-        try:
-            with open('data/streams/drivers.json', 'r') as f:
-                self.live_data['drivers'] = json.load(f)
-        except:
-            self.live_data['drivers'] = [
-                {"driver_id": "D-001", "name": "John Smith", "safety_score": 9.2, "incidents": 0},
-                {"driver_id": "D-002", "name": "Maria Garcia", "safety_score": 7.1, "incidents": 3}
-            ]
+        return {
+            "tool": "driver_safety_analysis",
+            "timestamp": datetime.now().isoformat(),
+            "high_risk_count": len(high_risk_drivers),
+            "high_risk_drivers": high_risk_drivers,
+            "live_data": "✅ Real-time updated"
+        }
+    
+    def live_data_summary(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "tool": "live_logistics_data",
+            "total_drivers": len(snapshot.get('drivers', [])),
+            "total_shipments": len(snapshot.get('shipments', [])),
+            "last_update": datetime.now().isoformat(),
+            "streaming_status": "✅ Active"
+        }
+    
+    def compliance_check(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        invoices = [i for i in snapshot.get('invoices', []) if isinstance(i, dict)]
+        overdue = self.derive(snapshot, "overdue", lambda: alert_rules.filter("invoice_overdue", invoices))
+        today = datetime.now().date().isoformat()
+        due_today = [i for i in invoices if str(i.get('due_date', '')).startswith(today)
+                     and not alert_rules.matches("invoice_overdue", i)]
+        return {
+            "tool": "compliance_analysis",
+            "total_invoices": len(invoices),
+            "overdue_invoices": len(overdue),
+            "due_today": len(due_today),
+            "compliance_rate": f"{(len(invoices) - len(overdue)) / len(invoices) * 100:.1f}%" if invoices else "100.0%",
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def anomalies(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        anomalies = self.derive(snapshot, "anomalies", lambda: self.route_anomalies(snapshot))
+        return {
+            "tool": "anomaly_detection",
+            "timestamp": datetime.now().isoformat(),
+            "anomaly_count": len(anomalies),
+            "anomalies": anomalies
+        }
+    
+    def route_anomalies(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rule = alert_rules["shipment_route_deviation"]
+        shipments = [s for s in snapshot.get('shipments', []) if isinstance(s, dict)]
+        return [
+            {
+                "shipment_id": shipment.get('shipment_id', 'unknown'),
+                "anomaly_type": "route_deviation",
+                "severity": rule.severity,
+                "details": f"Route deviation of {rule.value(shipment)} km detected"
+            }
+            for shipment in alert_rules.filter(rule.name, shipments)
+        ]
+    
+    async def run_batch(self, calls: List[ToolCall]) -> Dict[str, Any]:
+        """Evaluate several tool calls against one snapshot; results keep the call order"""
+        snapshot = await self.load_live_data()
+        results = []
+        for call in calls:
+            tool = self.tools.get(TOOL_ALIASES.get(call.tool, call.tool))
+            if tool is None:
+                results.append({"tool": call.tool, "error": f"unknown tool '{call.tool}'"})
+                continue
+            try:
+                results.append({"tool": call.tool, "result": tool(snapshot)})
+            except Exception as e:
+                results.append({"tool": call.tool, "error": str(e)})
+        return {
+            "snapshot": {"version": snapshot["version"], "loaded_at": snapshot["loaded_at"]},
+            "results": results
+        }
     
     def setup_routes(self):
         """Setup MCP-style API routes"""
@@ -31,46 +168,36 @@ class WorkingMCPServer:
             return {
                 "server": "IntelliFlow MCP Server",
                 "status": "✅ Working",
-                "tools": ["driver_safety", "live_data", "compliance_check"]
+                "tools": ["driver_safety", "live_data", "compliance_check", "anomalies", "batch"]
             }
         
+        @self.app.get("/cache")
+        async def cache_stats():
+            return file_cache.stats()
+        
         @self.app.get("/tools/driver_safety")
         async def driver_safety_tool():
-            self.load_live_data()
-            
-            high_risk_drivers = [
-                d for d in self.live_data.get('drivers', [])
-                if d.get('safety_score', 10) < 8.0
-            ]
-            
-            return {
-                "tool": "driver_safety_analysis",
-                "timestamp": datetime.now().isoformat(),
-                "high_risk_count": len(high_risk_drivers),
-                "high_risk_drivers": high_risk_drivers,
-                "live_data": "✅ Real-time updated"
-            }
+            # Plain JSON types already: skip FastAPI's per-field encoder on large answers
+            return JSONResponse(self.driver_safety(await self.load_live_data()))
         
         @self.app.get("/tools/live_data")
         async def live_data_tool():
-            self.load_live_data()
-            
-            return {
-                "tool": "live_logistics_data",
-                "total_drivers": len(self.live_data.get('drivers', [])),
-                "last_update": datetime.now().isoformat(),
-                "streaming_status": "✅ Active"
-            }
+            return self.live_data_summary(await self.load_live_data())
         
-        @self.app.get("/tools/compliance_check") 
+        @self.app.get("/tools/compliance_check")
         async def compliance_tool():
-            return {
-                "tool": "compliance_analysis",
-                "overdue_invoices": 2,
-                "due_today": 1,
-                "compliance_rate": "87.5%",
-                "timestamp": datetime.now().isoformat()
-            }
+            return self.compliance_check(await self.load_live_data())
+        
+        @self.app.get("/tools/anomalies")
+        async def anomalies_tool():
+            return JSONResponse(self.anomalies(await self.load_live_data()))
+        
+        @self.app.post("/tools/batch")
+        async def batch_tool(request: BatchRequest):
+            """Several tool calls in one round trip, all answered from the same data snapshot"""
+            if not request.calls:
+                raise HTTPException(status_code=400, detail="calls must not be empty")
+            return JSONResponse(await self.run_batch(request.calls))
     
     def start_server(self):
         """Start the MCP server"""
@@ -0,0 +1,202 @@
+import pathway as pw
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Any
+
+from backend.utils.state_snapshot import write_snapshot, DEFAULT_SNAPSHOT_PATH
+from backend.utils.alert_rules import alert_rules
+
+
+def driver_aggregates(drivers: pw.Table) -> Dict[str, pw.Table]:
+    """Risk-bucket counts and fleet-wide safety average"""
+    bucketed = drivers.with_columns(
+        risk_bucket=pw.if_else(
+            pw.this.safety_score < alert_rules.threshold("driver_emergency"), "emergency",
+            pw.if_else(
+                pw.this.safety_score < alert_rules.threshold("driver_critical"), "critical",
+                pw.if_else(pw.this.safety_score < alert_rules.threshold("driver_high_risk"), "high", "normal")
+            )
+        )
+    )
+    return {
+        "driver_buckets": bucketed.groupby(pw.this.risk_bucket).reduce(
+            pw.this.risk_bucket,
+            count=pw.reducers.count(),
+        ),
+        "driver_summary": drivers.reduce(
+            total=pw.reducers.count(),
+            average_safety_score=pw.reducers.avg(pw.this.safety_score),
+        ),
+    }
+
+
+def invoice_aggregates(invoices: pw.Table) -> Dict[str, pw.Table]:
+    """Invoice counts and amounts per (lower-cased) status"""
+    normalized = invoices.with_columns(status=pw.this.status.str.lower())
+    return {
+        "invoice_status": normalized.groupby(pw.this.status).reduce(
+            pw.this.status,
+            count=pw.reducers.count(),
+            amount=pw.reducers.sum(pw.this.amount),
+        ),
+    }
+
+
+def shipment_aggregates(shipments: pw.Table) -> Dict[str, pw.Table]:
+    """Shipments split by route-deviation anomaly flag"""
+    flagged = shipments.with_columns(
+        is_anomaly=pw.this.deviation_km > alert_rules.threshold("shipment_route_deviation")
+    )
+    return {
+        "shipment_anomalies": flagged.groupby(pw.this.is_anomaly).reduce(
+            pw.this.is_anomaly,
+            count=pw.reducers.count(),
+            value=pw.reducers.sum(pw.this.value),
+        ),
+    }
+
+
+def fleet_aggregates(fleet: pw.Table) -> Dict[str, pw.Table]:
+    """Fleet size, average utilization and vehicles due for maintenance"""
+    return {
+        "fleet_summary": fleet.reduce(
+            total=pw.reducers.count(),
+            average_utilization=pw.reducers.avg(pw.this.utilization_rate),
+            maintenance_due=pw.reducers.sum(pw.if_else(pw.this.maintenance_due, 1, 0)),
+        ),
+    }
+
+
+AGGREGATE_BUILDERS = {
+    "drivers": driver_aggregates,
+    "invoices": invoice_aggregates,
+    "shipments": shipment_aggregates,
+    "fleet": fleet_aggregates,
+}
+
+
+def build_aggregates(tables: Dict[str, pw.Table]) -> Dict[str, pw.Table]:
+    """Incremental groupby/reduce tables for every entity present"""
+    aggregates = {}
+    for entity, builder in AGGREGATE_BUILDERS.items():
+        if entity in tables:
+            aggregates.update(builder(tables[entity]))
+    return aggregates
+
+
+class StateSnapshotSink:
+    """Mirrors aggregate tables in memory and publishes a compact JSON snapshot
+
+    The snapshot is rewritten once per Pathway commit in which any aggregate
+    changed, so the API can serve it without touching the raw stream files.
+    With `resume`, the mirrored rows are checkpointed next to the snapshot:
+    a persisted Pathway run only emits changes after a restart.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, resume: bool = False):
+        self.path = path
+        self.rows_path = f"{path}.rows"
+        self.resume = resume
+        self.rows: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.pipeline_time = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        if resume:
+            self._load_rows()
+
+    def _load_rows(self):
+        try:
+            with open(self.rows_path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.rows = saved.get("rows", {})
+        self.pipeline_time = saved.get("pipeline_time", 0)
+
+    def attach(self, name: str, table: pw.Table):
+        self.rows.setdefault(name, {})
+
+        def on_change(key, row, time, is_addition):
+            with self._lock:
+                if is_addition:
+                    self.rows[name][str(key)] = row
+                else:
+                    self.rows[name].pop(str(key), None)
+                self.pipeline_time = max(self.pipeline_time, time)
+                self._dirty = True
+
+        pw.io.subscribe(table, on_change=on_change, on_time_end=self.flush,
+                        name=f"state_snapshot_{name}")
+
+    def flush(self, time=None):
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = self.render()
+            saved = {"pipeline_time": self.pipeline_time, "rows": self.rows} if self.resume else None
+            self._dirty = False
+            if saved:
+                write_snapshot(self.rows_path, saved)
+        write_snapshot(self.path, snapshot)
+
+    def render(self) -> Dict[str, Any]:
+        """Compact, API-ready view of the current aggregate rows"""
+        snapshot: Dict[str, Any] = {
+            "updated_at": datetime.now().isoformat(),
+            "pipeline_time": self.pipeline_time,
+        }
+
+        if "driver_buckets" in self.rows:
+            buckets = {row["risk_bucket"]: row["count"] for row in self.rows["driver_buckets"].values()}
+            summary = next(iter(self.rows["driver_summary"].values()), {})
+            average = summary.get("average_safety_score")
+            snapshot["drivers"] = {
+                "total": summary.get("total", 0),
+                "average_safety_score": round(average, 2) if average is not None else 0,
+                "risk_buckets": buckets,
+                "emergency_risk": buckets.get("emergency", 0),
+                "critical_risk": buckets.get("emergency", 0) + buckets.get("critical", 0),
+                "high_risk": sum(count for bucket, count in buckets.items() if bucket != "normal"),
+            }
+
+        if "invoice_status" in self.rows:
+            by_status = {row["status"]: row["count"] for row in self.rows["invoice_status"].values()}
+            total = sum(by_status.values())
+            overdue = by_status.get("overdue", 0)
+            snapshot["invoices"] = {
+                "total": total,
+                "by_status": by_status,
+                "overdue": overdue,
+                "overdue_amount": sum(row["amount"] for row in self.rows["invoice_status"].values()
+                                      if row["status"] == "overdue"),
+                "compliance_rate": round((total - overdue) / total * 100, 1) if total else 100,
+            }
+
+        if "shipment_anomalies" in self.rows:
+            flags = {row["is_anomaly"]: row for row in self.rows["shipment_anomalies"].values()}
+            snapshot["shipments"] = {
+                "total": sum(row["count"] for row in flags.values()),
+                "anomalies": flags[True]["count"] if True in flags else 0,
+                "total_value": sum(row["value"] for row in flags.values()),
+            }
+
+        if "fleet_summary" in self.rows:
+            fleet = next(iter(self.rows["fleet_summary"].values()), {})
+            utilization = fleet.get("average_utilization")
+            snapshot["fleet"] = {
+                "total": fleet.get("total", 0),
+                "average_utilization": round(utilization, 1) if utilization is not None else 0,
+                "maintenance_due": fleet.get("maintenance_due", 0),
+            }
+
+        return snapshot
+
+
+def publish_aggregates(tables: Dict[str, pw.Table], config: Dict[str, Any],
+                       resume: bool = False) -> StateSnapshotSink:
+    """Build the aggregate tables and attach them to a snapshot sink"""
+    sink = StateSnapshotSink(config.get("snapshot_path", DEFAULT_SNAPSHOT_PATH), resume=resume)
+    for name, table in build_aggregates(tables).items():
+        sink.attach(name, table)
+    return sink
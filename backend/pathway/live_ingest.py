@@ -0,0 +1,256 @@
+import os
+import queue
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+from backend.utils.latency import LagHistogram
+from backend.utils.segment_log import SegmentWriter, SegmentReader
+from backend.utils.state_snapshot import write_snapshot
+from backend.utils.stream_store import LiveStreamStore, live_stream_store
+
+INGEST_LOG_DIR = os.getenv("INGEST_LOG_DIR", "./data/ingest/drivers")
+INGEST_SOURCE = "ingest://drivers"
+# Committed ingest view, published as a stream file for readers outside this process
+INGEST_PUBLISH_PATH = os.getenv("INGEST_PUBLISH_PATH", "./data/streams/ingest_drivers.json")
+
+# Subscribe callbacks get a `time` argument that shadows the module
+clock = time.time
+
+
+class IngestBackpressure(Exception):
+    """The ingest queue is full; the caller should retry later"""
+
+
+@lru_cache(maxsize=None)
+def ingest_connector():
+    """(schema, subject class) of the ingest connector
+
+    Pathway is imported here rather than at module level: importing the API
+    does not pay for it, only starting live ingest does.
+    """
+    import pathway as pw
+
+    class DriverIngestSchema(pw.Schema):
+        driver_id: str = pw.column_definition(primary_key=True)
+        safety_score: float
+        record: pw.Json
+
+    class QueueSubject(pw.io.python.ConnectorSubject):
+        """Drains the bounded ingest queue into Pathway, one commit per drained batch"""
+
+        def __init__(self, records: "queue.Queue"):
+            super().__init__(datasource_name="live_ingest", session_type="upsert")
+            self.records = records
+
+        def run(self):
+            while True:
+                record = self.records.get()
+                if record is None:
+                    return
+                self._emit(record)
+                while True:
+                    try:
+                        record = self.records.get_nowait()
+                    except queue.Empty:
+                        break
+                    if record is None:
+                        self.commit()
+                        return
+                    self._emit(record)
+                self.commit()
+
+        def _emit(self, record: Dict[str, Any]):
+            self.next(driver_id=str(record["driver_id"]),
+                      safety_score=float(record.get("safety_score", 10.0)),
+                      record=pw.Json(record))
+
+    return DriverIngestSchema, QueueSubject
+
+
+class LiveIngest:
+    """Direct API -> Pathway ingestion without the file-drop round trip
+
+    Writes are appended to a segment log (the only thing kept on disk) and
+    pushed through a bounded queue into a Pathway Python connector running in
+    this process. The upserted, risk-labelled table is mirrored into the live
+    stream store, so queries see a new driver as soon as Pathway commits it.
+    The same view is rewritten to `publish_path` (at most every
+    `publish_interval` seconds) so the Pathway pipelines, the MCP servers and
+    other processes see ingested drivers as one more stream file.
+    """
+
+    def __init__(self, log_dir: str = INGEST_LOG_DIR, max_queue: int = 10000,
+                 autocommit_ms: int = 10, store: Optional[LiveStreamStore] = None,
+                 publish_path: Optional[str] = INGEST_PUBLISH_PATH, publish_interval: float = 0.25):
+        self.log_dir = log_dir
+        self.publish_path = publish_path
+        self.publish_interval = publish_interval
+        self.max_queue = max_queue
+        self.autocommit_ms = autocommit_ms
+        self.store = store if store is not None else live_stream_store
+        self.visibility_lag = LagHistogram()
+        self.accepted = 0
+        self.rejected = 0
+        self.visible = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._log: Optional[SegmentWriter] = None
+        self._submitted: Dict[str, float] = {}
+        self._changes: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._published: Dict[str, Dict[str, Any]] = {}
+        self._publish_due = threading.Event()
+        # Set once every record replayed from the durable log is visible in the store
+        self.replayed = threading.Event()
+        self._replay_pending: set = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Build the ingest graph, replay the durable log and run Pathway in a thread"""
+        if self._thread is not None:
+            return
+        import pathway as pw
+        from backend.pathway.pipeline_runner import driver_risk
+
+        schema, subject = ingest_connector()
+        if self.publish_path:
+            # This process gets the records from Pathway directly, not from the published file
+            self.store.exclude(self.publish_path)
+            threading.Thread(target=self._publish_loop, name="LiveIngestPublish", daemon=True).start()
+        # The log is the only copy of ingested drivers: no age/size retention, compacted instead
+        latest: Dict[str, Dict[str, Any]] = {}
+        for record in SegmentReader(self.log_dir).scan():
+            record.pop("time", None)
+            latest[str(record["driver_id"])] = record
+        replay = list(latest.values())
+        self._log = SegmentWriter(self.log_dir, retention_bytes=None, retention_seconds=None)
+        self._compact(replay)
+        self._replay_pending = {str(record["driver_id"]) for record in replay}
+        if not self._replay_pending:
+            self.replayed.set()
+
+        drivers = pw.io.python.read(subject(self._queue), schema=schema,
+                                    autocommit_duration_ms=self.autocommit_ms, name="live_ingest")
+        pw.io.subscribe(driver_risk(drivers), on_change=self._on_change,
+                        on_time_end=self._on_time_end, name="live_ingest_view")
+
+        self._thread = threading.Thread(
+            target=lambda: pw.run(monitoring_level=pw.MonitoringLevel.NONE),
+            name="LiveIngest", daemon=True
+        )
+        self._thread.start()
+
+        # Blocking puts: the connector is already draining the queue
+        for record in replay:
+            self._queue.put(record)
+        print(f"⚡ Live ingest running ({len(replay)} records replayed from {self.log_dir})")
+
+    def _compact(self, latest: List[Dict[str, Any]]):
+        """Rewrite the log as the latest record per driver, then drop the older segments"""
+        segments = self._log.manifest["segments"]
+        if sum(segment["count"] for segment in segments) <= len(latest):
+            return
+        first_offset = self._log.manifest["next_offset"]
+        now_ms = int(time.time() * 1000)
+        for record in latest:
+            self._log.append(record, now_ms)
+        # The compacted segment is in the manifest before anything is deleted
+        self._log.flush()
+        self._log.truncate_before(first_offset)
+
+    def submit(self, records: List[Dict[str, Any]]) -> int:
+        """Queue records for Pathway; raises IngestBackpressure once the queue is full
+
+        Records are only acknowledged after they are in the durable log.
+        Returns the number accepted before the queue filled up.
+        """
+        accepted = 0
+        for record in records:
+            if not record.get("driver_id"):
+                raise ValueError("every record needs a driver_id")
+            now = time.time()
+            with self._lock:
+                self._submitted[str(record["driver_id"])] = now
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                with self._lock:
+                    self._submitted.pop(str(record["driver_id"]), None)
+                self.rejected += len(records) - accepted
+                if accepted:
+                    break
+                raise IngestBackpressure(f"ingest queue full ({self.max_queue} records)")
+            self._log.append(record, int(now * 1000))
+            accepted += 1
+        self._log.flush()
+        self.accepted += accepted
+        return accepted
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "visible": self.visible,
+            "queue_depth": self.queue_depth(),
+            "queue_capacity": self.max_queue,
+            "write_to_visible": self.visibility_lag.to_dict(),
+        }
+
+    def _on_change(self, key, row, time, is_addition):
+        with self._lock:
+            if is_addition:
+                self._changes[row["driver_id"]] = {**row["record"].value, "risk_level": row["risk_level"]}
+            else:
+                self._changes.setdefault(row["driver_id"], None)
+
+    def _on_time_end(self, time):
+        visible_at = clock()
+        with self._lock:
+            changes, self._changes = self._changes, {}
+            if self._replay_pending:
+                self._replay_pending.difference_update(changes)
+                if not self._replay_pending:
+                    self.replayed.set()
+            for driver_id, record in changes.items():
+                submitted_at = self._submitted.pop(driver_id, None)
+                if record is not None and submitted_at is not None:
+                    self.visibility_lag.observe((visible_at - submitted_at) * 1000)
+        if not changes:
+            return
+        with self._lock:
+            for driver_id, record in changes.items():
+                if record is None:
+                    self._published.pop(driver_id, None)
+                else:
+                    self._published[driver_id] = record
+        self._publish_due.set()
+        upserts = [record for record in changes.values() if record is not None]
+        self.visible += len(upserts)
+        self.store.apply_external(INGEST_SOURCE, upserts,
+                                  [driver_id for driver_id, record in changes.items() if record is None])
+
+    def _publish_loop(self):
+        while True:
+            self._publish_due.wait()
+            # Coalesce the commits of one interval into a single rewrite
+            time.sleep(self.publish_interval)
+            self._publish_due.clear()
+            with self._lock:
+                records = list(self._published.values())
+            try:
+                write_snapshot(self.publish_path, records)
+            except OSError as e:
+                print(f"⚠️ Could not publish ingested drivers to {self.publish_path}: {e}")
+
+
+# Global instance
+live_ingest = LiveIngest()
@@ -1,8 +1,4 @@
-import pathway as pw
-import json
-import os
-import time
-from datetime import datetime
+from backend.pathway.pipeline_runner import PipelineRunner, load_profile
 
 class PerfectPathwayPipeline:
     """Perfect working Pathway pipeline for hackathon success"""
@@ -11,96 +7,13 @@ class PerfectPathwayPipeline:
         self.setup_perfect_pipeline()
     
     def setup_perfect_pipeline(self):
-        """Setup perfect Pathway streaming pipeline"""
-        print("🔥 Starting PERFECT Pathway Pipeline...")
-        
-        try:
-            # Define proper schema
-            class LogisticsSchema(pw.Schema):
-                driver_id: str
-                name: str
-                safety_score: float
-                timestamp: str = pw.column_definition(default_value="")
-            
-            # Create streaming data source
-            self.data_source = pw.io.fs.read(
-                "./data/streams",
-                format="json",
-                mode="streaming",
-                schema=LogisticsSchema,
-                autocommit_duration_ms=1000
-            )
-            
-            # Process the data with proper timestamp
-            self.processed_data = self.data_source.select(
-                driver_id=pw.this.driver_id,
-                name=pw.this.name,
-                safety_score=pw.this.safety_score,
-                processed_at=datetime.now().isoformat()
-            )
-            
-            # Output processed data
-            pw.io.fs.write(
-                self.processed_data,
-                pw.io.fs.write.JsonFormatter(),
-                "./data/processed/"
-            )
-            
-            print("✅ Perfect Pathway pipeline initialized!")
-            print("📡 Real-time streaming ACTIVE")
-            
-        except Exception as e:
-            print(f"🔄 Pathway API adjustment needed: {e}")
-            self.setup_fallback_pipeline()
-    
-    def setup_fallback_pipeline(self):
-        """Fallback working pipeline"""
-        print("🔄 Setting up working fallback pipeline...")
-        
-        # Simple file monitoring approach
-        import threading
-        
-        def monitor_files():
-            while True:
-                try:
-                    # Check for file changes
-                    if os.path.exists('./data/streams/drivers.json'):
-                        with open('./data/streams/drivers.json', 'r') as f:
-                            data = json.load(f)
-                        
-                        # Process and save
-                        processed = {
-                            'processed_at': datetime.now().isoformat(),
-                            'data_count': len(data),
-                            'status': 'processed'
-                        }
-                        
-                        os.makedirs('./data/processed', exist_ok=True)
-                        with open('./data/processed/latest.json', 'w') as f:
-                            json.dump(processed, f)
-                        
-                    time.sleep(5)  # Check every 5 seconds
-                    
-                except Exception as e:
-                    print(f"Monitor error: {e}")
-                    time.sleep(10)
-        
-        # Start monitoring thread
-        monitor_thread = threading.Thread(target=monitor_files, daemon=True)
-        monitor_thread.start()
-        print("✅ Fallback pipeline active!")
+        """Setup perfect Pathway streaming pipeline (profile 'perfect')"""
+        self.runner = PipelineRunner(load_profile("perfect"), "perfect")
+        self.processed_data = self.runner.build()["drivers"]
     
     def run_pipeline(self):
         """Start the pipeline"""
-        try:
-            print("🚀 Starting Pathway computation...")
-            pw.run(monitoring_level=pw.MonitoringLevel.NONE)
-        except Exception as e:
-            print(f"🔄 Running in fallback mode: {e}")
-            # Keep the process alive
-            while True:
-                time.sleep(10)
-                print("📡 Pipeline processing active...")
+        self.runner.run()
 
 if __name__ == "__main__":
     pipeline = PerfectPathwayPipeline()
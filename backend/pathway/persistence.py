@@ -0,0 +1,52 @@
+import pathway as pw
+import os
+from typing import Dict, Any, Optional
+
+PERSISTENCE_ROOT = os.getenv("PATHWAY_PERSISTENCE_ROOT", "./data/state/pathway")
+
+
+def persistence_enabled() -> bool:
+    return os.getenv("PATHWAY_PERSISTENCE", "1").lower() not in ("0", "false", "no")
+
+
+def persistence_path(name: str, settings: Optional[Dict[str, Any]] = None) -> str:
+    """Checkpoint directory of one pipeline"""
+    return (settings or {}).get("path") or os.path.join(PERSISTENCE_ROOT, name)
+
+
+def persistence_backend(name: str, settings: Optional[Dict[str, Any]] = None) -> Optional[pw.persistence.Backend]:
+    """Local filesystem backend for a pipeline, or None when persistence is off"""
+    if settings is None or not persistence_enabled():
+        return None
+    path = persistence_path(name, settings)
+    os.makedirs(path, exist_ok=True)
+    return pw.persistence.Backend.filesystem(path)
+
+
+def persistence_mode(settings: Dict[str, Any]) -> pw.PersistenceMode:
+    """`operator` restores operator state without recomputation (needs
+    PATHWAY_LICENSE_KEY); `input` replays the persisted input log instead of
+    re-reading the stream folder; `auto` picks operator when a key is set."""
+    mode = settings.get("mode", "auto")
+    if mode == "auto":
+        mode = "operator" if os.getenv("PATHWAY_LICENSE_KEY") else "input"
+    return pw.PersistenceMode.OPERATOR_PERSISTING if mode == "operator" else pw.PersistenceMode.PERSISTING
+
+
+def persistence_config(name: str, settings: Optional[Dict[str, Any]] = None) -> Optional[pw.persistence.Config]:
+    """pw.run() persistence config so restarts resume from the last checkpoint
+
+    Input connectors must be named (the runner names them after the profile
+    and entity); only files changed since the checkpoint are read again.
+    """
+    backend = persistence_backend(name, settings)
+    if backend is None:
+        return None
+    mode = persistence_mode(settings)
+    label = "operator state" if mode == pw.PersistenceMode.OPERATOR_PERSISTING else "input log"
+    print(f"💾 Pathway persistence ({label}): {persistence_path(name, settings)}")
+    return pw.persistence.Config(
+        backend,
+        snapshot_interval_ms=settings.get("snapshot_interval_ms", 1000),
+        persistence_mode=mode,
+    )
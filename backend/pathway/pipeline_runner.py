@@ -0,0 +1,556 @@
+import pathway as pw
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from backend.pathway.persistence import persistence_config, persistence_backend, persistence_enabled
+from backend.utils.alert_rules import alert_rules
+
+PROFILES_PATH = os.getenv("PIPELINE_PROFILES", "./config/pipeline_profiles.json")
+
+FIELD_TYPES = {"str": str, "float": float, "int": int, "bool": bool}
+
+MONITORING_LEVELS = {
+    "none": pw.MonitoringLevel.NONE,
+    "in_out": pw.MonitoringLevel.IN_OUT,
+    "all": pw.MonitoringLevel.ALL,
+}
+
+
+def load_profiles(path: str = PROFILES_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load every declarative pipeline profile"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_profile(name: str, path: str = PROFILES_PATH) -> Dict[str, Any]:
+    """Load one pipeline profile by name"""
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise KeyError(f"Unknown pipeline profile '{name}' (available: {', '.join(profiles)})")
+    return profiles[name]
+
+
+@pw.udf
+def parse_records(text: str) -> list[pw.Json]:
+    """Split a JSON file (single object or array) into records"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        # Half-written or JSON-lines file: keep whatever lines parse
+        data = []
+        for line in text.splitlines():
+            try:
+                data.append(json.loads(line))
+            except ValueError:
+                continue
+    items = data if isinstance(data, list) else [data]
+    return [pw.Json(record) for record in items if isinstance(record, dict)]
+
+
+@pw.udf(deterministic=False)
+def file_written_at(path: str) -> float:
+    """Modification time of the source file (when the producer wrote it)"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return time.time()
+
+
+@pw.udf(deterministic=False)
+def ingest_clock(path: str) -> float:
+    """Wall-clock time at which Pathway parsed the file"""
+    return time.time()
+
+
+def _field(name: str, spec: Dict[str, Any]):
+    """Typed, defaulted column extracted from the `record` Json column"""
+    cast = FIELD_TYPES[spec.get("type", "str")]
+    default = spec.get("default")
+    names = [name] + spec.get("aliases", [])
+
+    def extract(record: pw.Json):
+        fields = record.value if isinstance(record.value, dict) else {}
+        value = next((fields[n] for n in names if fields.get(n) is not None), None)
+        if value is None:
+            return default
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            return default
+
+    dtype = cast if default is not None else Optional[cast]
+    return pw.apply_with_type(extract, dtype, pw.this.record)
+
+
+def driver_risk(table: pw.Table) -> pw.Table:
+    """Label drivers below the high-risk safety threshold (alert rule driver_high_risk)"""
+    return table.with_columns(
+        risk_level=pw.if_else(pw.this.safety_score < alert_rules.threshold("driver_high_risk"), "HIGH_RISK", "NORMAL")
+    )
+
+
+TRANSFORMS = {
+    "driver_risk": driver_risk,
+}
+
+
+class PipelineRunner:
+    """Builds and runs one Pathway pipeline from a declarative profile"""
+
+    def __init__(self, profile: Dict[str, Any], name: str = "pipeline"):
+        self.profile = profile
+        self.name = name
+        self.tables: Dict[str, pw.Table] = {}
+        self.snapshot_sink = None
+        self._documents: Dict[tuple, pw.Table] = {}
+        self.freshness = None
+        if profile.get("freshness"):
+            from backend.pathway.freshness import FreshnessTracker
+            self.freshness = FreshnessTracker(
+                profile["freshness"].get("metrics_path", f"./data/state/freshness_{name}.json")
+            )
+
+    def build(self) -> Dict[str, pw.Table]:
+        """Create source tables, apply transforms and attach sinks"""
+        print(f"🔥 Building Pathway pipeline profile '{self.name}'...")
+
+        for source in self.profile.get("sources", []):
+            self.tables[source["entity"]] = self._read_source(source)
+
+        for entity, transform in self.profile.get("transforms", {}).items():
+            self.tables[entity] = TRANSFORMS[transform](self.tables[entity])
+
+        for sink in self.profile.get("sinks", []):
+            self._write_sink(sink)
+
+        if self.profile.get("aggregates"):
+            from backend.pathway.aggregates import publish_aggregates
+            resume = self.profile.get("persistence") is not None and persistence_enabled()
+            self.snapshot_sink = publish_aggregates(self.tables, self.profile["aggregates"], resume)
+
+        print(f"✅ Pipeline '{self.name}' ready: {', '.join(self.tables)}")
+        return self.tables
+
+    def run(self):
+        """Start the Pathway computation (blocks in streaming mode)"""
+        workers = self.profile.get("workers", 1)
+        processes = self.profile.get("processes", 1)
+        if processes > 1 and "PATHWAY_PROCESS_ID" not in os.environ:
+            self._spawn(processes, workers)
+            return
+
+        os.environ["PATHWAY_THREADS"] = str(workers)
+        run_kwargs = {
+            "monitoring_level": MONITORING_LEVELS[self.profile.get("monitoring", "none")],
+        }
+
+        rag = self.profile.get("rag")
+        if rag:
+            self._run_rag_server(rag)
+        else:
+            run_kwargs["persistence_config"] = persistence_config(self.name, self.profile.get("persistence"))
+            print(f"🚀 Starting Pathway computation ({processes} process(es) x {workers} worker(s))...")
+            started = time.time()
+            pw.run(**run_kwargs)
+            print(f"⏱️ Pipeline '{self.name}' finished in {time.time() - started:.3f}s")
+
+    def _spawn(self, processes: int, workers: int):
+        """Re-launch this command under `pathway spawn`
+
+        Python UDFs (JSON parsing, field extraction) hold the GIL, so worker
+        threads alone cannot use more than one core; processes can.
+        """
+        print(f"🚀 Spawning {processes} Pathway processes x {workers} worker(s)...")
+        command = [sys.executable, "-m", "pathway", "spawn", "--processes", str(processes),
+                   "--threads", str(workers), sys.executable, *sys.orig_argv[1:]]
+        returncode = subprocess.call(command)
+        if returncode:
+            sys.exit(returncode)
+
+    def _read_source(self, source: Dict[str, Any]) -> pw.Table:
+        entity = source["entity"]
+        source_format = source.get("format", "json_documents")
+        read_kwargs = {
+            "mode": self.profile.get("mode", "streaming"),
+            "object_pattern": source.get("pattern", "*"),
+            "name": f"{self.name}_{entity}",
+        }
+        if self.profile.get("autocommit_duration_ms") is not None:
+            read_kwargs["autocommit_duration_ms"] = self.profile["autocommit_duration_ms"]
+
+        if source_format == "raw":
+            # Whole files with metadata, as expected by the RAG document store
+            return pw.io.fs.read(source["path"], format="binary", with_metadata=True, **read_kwargs)
+
+        schema = self.profile["schemas"][entity]
+        if source_format == "json":
+            # JSON lines, one record per line
+            columns = {
+                field: {
+                    "dtype": FIELD_TYPES[spec.get("type", "str")],
+                    "default_value": spec.get("default"),
+                }
+                for field, spec in schema.items()
+            }
+            return pw.io.fs.read(source["path"], format="json",
+                                 schema=pw.schema_from_dict(columns, name=f"{entity}_schema"),
+                                 **read_kwargs)
+
+        # Entities stored in the same folder (or socket) share a single connector and parse
+        if source_format == "ndjson_socket":
+            location = (source["address"], None)
+        else:
+            location = (source["path"], read_kwargs["object_pattern"])
+        if location not in self._documents:
+            if source_format == "ndjson_socket":
+                from backend.pathway.socket_source import read_socket
+                documents = read_socket(source["address"], f"{self.name}_socket",
+                                        read_kwargs.get("autocommit_duration_ms"))
+            else:
+                raw = pw.io.fs.read(source["path"], format="plaintext_by_file", with_metadata=True, **read_kwargs)
+                documents = raw.select(
+                    record=parse_records(pw.this.data),
+                    source=pw.this._metadata["path"].as_str(),
+                    written_at=file_written_at(pw.this._metadata["path"].as_str()),
+                    ingested_at=ingest_clock(pw.this._metadata["path"].as_str()),
+                ).flatten(pw.this.record)
+            self._documents[location] = documents
+            self._attach_canary(documents)
+        records = self._documents[location].filter(pw.this.record.get("canary").is_none())
+
+        key = source.get("key")
+        if key:
+            records = records.filter(pw.this.record.get(key).is_not_none())
+
+        columns = {field: _field(field, spec) for field, spec in schema.items()}
+        if source.get("keep_record"):
+            # The whole parsed document, for consumers that return full records
+            columns["record"] = pw.this.record
+        table = records.select(
+            **columns,
+            source=pw.this.source,
+            written_at=pw.this.written_at,
+            ingested_at=pw.this.ingested_at,
+        )
+        if key:
+            # Rows are sharded by their id: the entity id as instance pins every
+            # row of an entity to one worker (ids stay unique per source file)
+            table = table.with_id_from(pw.this[key], pw.this.source, instance=pw.this[key])
+        if self.freshness:
+            self.freshness.attach(entity, table)
+        return table
+
+    def _attach_canary(self, documents: pw.Table):
+        """Route freshness-probe canary records to the tracker only"""
+        if not self.freshness:
+            return
+        canaries = documents.filter(pw.this.record.get("canary").is_not_none()).select(
+            canary_seq=_field("canary_seq", {"type": "int", "default": -1}),
+            written_at=pw.this.written_at,
+        )
+        self.freshness.attach_canary(canaries)
+
+    def _write_sink(self, sink: Dict[str, Any]):
+        table = self.tables[sink["entity"]]
+        if "data" in table.column_names() and "_metadata" in table.column_names():
+            table = table.select(source=pw.this._metadata["path"].as_str(),
+                                 size=pw.this._metadata["size"].as_int())
+
+        sink_path = sink["path"]
+        if sink.get("format") == "segments":
+            self._write_segments(table, sink_path, sink.get("retention", {}), sink["entity"])
+            return
+        os.makedirs(os.path.dirname(sink_path) or ".", exist_ok=True)
+        pw.io.fs.write(table, sink_path, format=sink.get("format", "json"),
+                       name=f"{self.name}_{sink['entity']}_sink")
+
+    def _write_segments(self, table: pw.Table, directory: str, retention: Dict[str, Any], entity: str):
+        """Rolling segment log with a manifest, in pw.io.fs.write's row format"""
+        from backend.utils.segment_log import SegmentWriter
+
+        writer = SegmentWriter(directory, **retention)
+        columns = [column for column in table.column_names() if column != "_metadata"]
+
+        def on_change(key, row, time, is_addition):
+            record = {column: row[column] for column in columns}
+            record["diff"] = 1 if is_addition else -1
+            writer.append(record, time)
+
+        pw.io.subscribe(table, on_change=on_change, on_time_end=lambda time: writer.flush(),
+                        on_end=writer.close, name=f"{self.name}_{entity}_segments")
+
+    def _run_rag_server(self, rag: Dict[str, Any]):
+        from pathway.xpacks.llm import embedders, parsers
+        from pathway.xpacks.llm.vector_store import VectorStoreServer
+        from backend.utils.model_warmup import ModelWarmup, resolve_model, warmup_status_path
+
+        # Local model copy (EMBEDDING_MODEL_PATH overrides the profile), loaded and primed
+        # before the server listens: the first query does not pay for either
+        model, source = resolve_model(rag.get("model", "sentence-transformers/all-MiniLM-L6-v2"),
+                                      os.getenv("EMBEDDING_MODEL_PATH", rag.get("model_path")))
+        warmup_spec = rag.get("warmup", {})
+        warmup = ModelWarmup(
+            f"{self.name}_embedder",
+            load=lambda: embedders.SentenceTransformerEmbedder(model=model, device=rag.get("device", "cpu")),
+            encode=lambda embedder, texts: embedder.model.encode(texts),
+            batches=warmup_spec.get("batches", 3),
+            batch_size=warmup_spec.get("batch_size", 16),
+            source=source,
+            status_path=warmup_status_path(self.name),
+        )
+        embedder = warmup.run()
+        parser = parsers.ParseUnstructured() if rag.get("parser") == "unstructured" else None
+        vector_server = VectorStoreServer(self.tables[rag["entity"]], embedder=embedder, parser=parser)
+
+        print(f"🚀 Starting Pathway RAG server on {rag.get('host', '0.0.0.0')}:{rag.get('port', 8765)}...")
+        vector_server.run_server(
+            host=rag.get("host", "0.0.0.0"),
+            port=rag.get("port", 8765),
+            threaded=False,
+            with_cache=True,
+            # Embeddings are cached next to the pipeline checkpoint, so a restart
+            # only embeds documents that changed
+            cache_backend=persistence_backend(self.name, self.profile.get("persistence"))
+            or pw.persistence.Backend.filesystem("./Cache"),
+        )
+
+
+def apply_overrides(profile: Dict[str, Any], autocommit_ms: Optional[int] = None,
+                    workers: Optional[int] = None, processes: Optional[int] = None) -> Dict[str, Any]:
+    """Copy of a profile with command-line overrides applied"""
+    profile = copy.deepcopy(profile)
+    if autocommit_ms is not None:
+        profile["autocommit_duration_ms"] = autocommit_ms
+    if workers is not None:
+        profile["workers"] = workers
+    if processes is not None:
+        profile["processes"] = processes
+    return profile
+
+
+def run_profile(name: str, autocommit_ms: Optional[int] = None, workers: Optional[int] = None,
+                processes: Optional[int] = None):
+    """Build and run a named profile"""
+    runner = PipelineRunner(apply_overrides(load_profile(name), autocommit_ms, workers, processes), name)
+    runner.build()
+    runner.run()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _fixture_record(schema: Dict[str, Any], key: str, seq: int) -> Dict[str, Any]:
+    samples = {"str": "bench", "float": 6.5, "int": 1, "bool": False}
+    record = {field: samples[spec.get("type", "str")] for field, spec in schema.items()}
+    record[key] = f"BENCH-{seq}"
+    return record
+
+
+def run_report(name: str, profile: Dict[str, Any], records: int = 2000, rate: float = 500.0,
+               timeout: float = 60.0, producers: int = 4) -> Dict[str, Any]:
+    """Measure write to Pathway-output latency and throughput for a profile
+
+    Sources are redirected to a temporary folder (or socket), sinks,
+    aggregates, freshness tracking, persistence and the RAG stage are
+    skipped, and fixture records are produced at `rate` records/sec: one
+    file each, or one NDJSON line each spread over `producers` connections.
+    """
+    bench_dir = tempfile.mkdtemp(prefix="intelliflow_bench_")
+    profile = copy.deepcopy(profile)
+    # The producer thread lives in this process, so the report runs as one process
+    profile.update(mode="streaming", sinks=[], rag=None, aggregates=None, freshness=None,
+                   persistence=None, processes=1)
+    socket_address = None
+    for source in profile["sources"]:
+        if source.get("format") == "ndjson_socket":
+            socket_address = source["address"] = f"unix://{os.path.join(bench_dir, 'bench.sock')}"
+        else:
+            source["path"] = bench_dir
+    source = profile["sources"][0]
+    entity = source["entity"]
+    schema = profile.get("schemas", {}).get(entity, {})
+    key_field = source.get("key", "driver_id")
+
+    runner = PipelineRunner(profile, name)
+    tables = runner.build()
+
+    written_at: Dict[int, float] = {}
+    latencies: List[float] = []
+    engine_ready = threading.Event()
+    done = threading.Event()
+
+    def write_fixture(seq: int):
+        path = os.path.join(bench_dir, f"bench_{seq:07d}.json")
+        with open(path + ".tmp", 'w') as f:
+            json.dump(_fixture_record(schema, key_field, seq), f)
+        written_at[seq] = time.time()
+        os.replace(path + ".tmp", path)
+
+    def connect():
+        import socket
+        from backend.pathway.socket_source import parse_address
+        scheme, host, port = parse_address(socket_address)
+        deadline = time.time() + timeout
+        while True:
+            try:
+                if scheme == "unix":
+                    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    conn.connect(host)
+                    return conn
+                return socket.create_connection((host, port))
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def send_records(conn, seqs, start: float):
+        for seq in seqs:
+            written_at[seq] = time.time()
+            conn.sendall((json.dumps(_fixture_record(schema, key_field, seq)) + "\n").encode())
+            delay = start + (seq + 1) / rate - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+    clock = time.time
+
+    def on_change(key, row, time, is_addition):
+        if not is_addition:
+            return
+        try:
+            if key_field in row:
+                # Fixture ids are BENCH-<seq>
+                seq = int(str(row[key_field])[6:])
+            else:
+                path = row["_metadata"].value.get("path", "")
+                seq = int(os.path.basename(path)[6:13])
+        except ValueError:
+            return
+        if seq < 0:
+            engine_ready.set()
+        elif seq in written_at:
+            latencies.append((clock() - written_at[seq]) * 1000)
+            if len(latencies) >= records:
+                done.set()
+
+    pw.io.subscribe(tables[entity], on_change=on_change)
+
+    def produce():
+        if socket_address:
+            # The socket only exists once pw.run() has started the connector
+            warmup = connect()
+            send_records(warmup, [-1], time.time())
+        engine_ready.wait(timeout)
+        start = time.time()
+        if socket_address:
+            threads = [
+                threading.Thread(target=lambda i=i: send_records(connect(), range(i, records, producers), start))
+                for i in range(producers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            for seq in range(records):
+                write_fixture(seq)
+                delay = start + (seq + 1) / rate - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+        done.wait(timeout)
+
+        elapsed = time.time() - start
+        report = {
+            "profile": name,
+            "source": "socket" if socket_address else "files",
+            "producers": producers if socket_address else 1,
+            "autocommit_duration_ms": profile.get("autocommit_duration_ms"),
+            "workers": profile.get("workers", 1),
+            "records_written": records,
+            "records_seen": len(latencies),
+            "target_rate": rate,
+            "throughput_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50), 1),
+                "p95": round(_percentile(latencies, 95), 1),
+                "p99": round(_percentile(latencies, 99), 1),
+                "max": round(max(latencies), 1) if latencies else 0.0,
+            },
+        }
+        print(json.dumps(report), flush=True)
+        # pw.run() has no stop hook in streaming mode
+        os._exit(0)
+
+    if not socket_address:
+        # Negative sequence number marks the warm-up file
+        write_fixture(-1)
+    threading.Thread(target=produce, daemon=True).start()
+    runner.run()
+
+
+def run_sweep(name: str, intervals: List[int], records: int, rate: float,
+              workers: Optional[int] = None):
+    """Run the report once per commit interval, each in a fresh process"""
+    results = []
+    for interval in intervals:
+        command = [sys.executable, "-m", "backend.pathway.pipeline_runner", "--profile", name,
+                   "--report", "--records", str(records), "--rate", str(rate),
+                   "--autocommit-ms", str(interval)]
+        if workers is not None:
+            command += ["--workers", str(workers)]
+        output = subprocess.run(command, capture_output=True, text=True).stdout
+        lines = [line for line in output.splitlines() if line.startswith('{"profile"')]
+        if lines:
+            results.append(json.loads(lines[-1]))
+
+    print(f"\n📊 Commit interval report for profile '{name}' ({records} records @ {rate}/s)")
+    print(f"{'commit_ms':>10} {'rec/s':>10} {'p50_ms':>10} {'p95_ms':>10} {'p99_ms':>10}")
+    for result in results:
+        latency = result["latency_ms"]
+        print(f"{result['autocommit_duration_ms']:>10} {result['throughput_per_sec']:>10} "
+              f"{latency['p50']:>10} {latency['p95']:>10} {latency['p99']:>10}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an IntelliFlow Pathway pipeline profile")
+    parser.add_argument("--profile", default="simple", help="profile name from config/pipeline_profiles.json")
+    parser.add_argument("--list", action="store_true", help="list available profiles")
+    parser.add_argument("--autocommit-ms", type=int, help="override autocommit_duration_ms")
+    parser.add_argument("--workers", type=int, help="override the worker thread count")
+    parser.add_argument("--processes", type=int, help="override the process count (pathway spawn)")
+    parser.add_argument("--report", action="store_true", help="print a latency/throughput report")
+    parser.add_argument("--sweep", help="comma-separated commit intervals to compare, e.g. 50,200,1000")
+    parser.add_argument("--records", type=int, default=2000, help="fixture records for --report")
+    parser.add_argument("--rate", type=float, default=500.0, help="fixture records/sec for --report")
+    parser.add_argument("--producers", type=int, default=4, help="concurrent connections for socket sources")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, profile in load_profiles().items():
+            print(f"{name:18} {profile.get('description', '')}")
+        return
+
+    if args.sweep:
+        intervals = [int(value) for value in args.sweep.split(",")]
+        run_sweep(args.profile, intervals, args.records, args.rate, args.workers)
+    elif args.report:
+        profile = apply_overrides(load_profile(args.profile), args.autocommit_ms, args.workers)
+        run_report(args.profile, profile, args.records, args.rate, producers=args.producers)
+    else:
+        run_profile(args.profile, args.autocommit_ms, args.workers, args.processes)
+
+
+if __name__ == "__main__":
+    main()
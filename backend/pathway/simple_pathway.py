@@ -1,7 +1,7 @@
-import pathway as pw
 import json
 import os
-from datetime import datetime
+
+from backend.pathway.pipeline_runner import run_profile
 
 # Simple working Pathway implementation
 def create_simple_pathway():
@@ -22,49 +22,8 @@ def create_simple_pathway():
     with open('./data/streams/drivers_data.json', 'w') as f:
         json.dump(sample_data, f, indent=2)
     
-    try:
-        # Define simple schema
-        class DriverSchema(pw.Schema):
-            driver_id: str
-            safety_score: float
-            status: str
-        
-        # Read data with Pathway (REAL Pathway usage)
-        table = pw.io.json.read(
-            './data/streams/',
-            schema=DriverSchema,
-            mode="static"  # Start with static, then streaming
-        )
-        
-        # Process data with Pathway
-        processed = table.select(
-            driver_id=pw.this.driver_id,
-            safety_score=pw.this.safety_score,
-            risk_level=pw.if_else(
-                pw.this.safety_score < 7.0,
-                "HIGH_RISK",
-                "NORMAL"
-            ),
-            processed_time=datetime.now().isoformat()
-        )
-        
-        # Output results
-        pw.io.json.write(processed, './data/processed/')
-        
-        print("✅ Pathway processing setup complete!")
-        
-        # Run Pathway computation
-        pw.run(monitoring_level=pw.MonitoringLevel.NONE)
-        
-    except Exception as e:
-        print(f"🔄 Pathway info: {e}")
-        print("✅ Pathway framework is working - using basic mode")
-        
-        # Fallback that still uses Pathway concepts
-        while True:
-            import time
-            time.sleep(10)
-            print(f"📡 Pathway processing active at {datetime.now().strftime('%H:%M:%S')}")
+    # Schema, commit interval, workers and sinks live in config/pipeline_profiles.json
+    run_profile("simple")
 
 if __name__ == "__main__":
     create_simple_pathway()
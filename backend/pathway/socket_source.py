@@ -0,0 +1,95 @@
+import pathway as pw
+import asyncio
+import json
+import os
+import time
+from typing import Tuple
+from urllib.parse import urlparse
+
+from backend.utils.stream_store import entity_id
+
+DEFAULT_SOCKET_ADDRESS = os.getenv("STREAM_SOCKET_ADDRESS", "tcp://127.0.0.1:9911")
+
+
+class SocketDocumentSchema(pw.Schema):
+    entity_key: str = pw.column_definition(primary_key=True)
+    record: pw.Json
+    source: str
+    written_at: float
+    ingested_at: float
+
+
+def parse_address(address: str) -> Tuple[str, str, int]:
+    """`tcp://host:port` or `unix:///path/to.sock` -> (scheme, host or path, port)"""
+    parsed = urlparse(address)
+    if parsed.scheme == "unix":
+        return "unix", parsed.path, 0
+    if parsed.scheme == "tcp":
+        return "tcp", parsed.hostname or "127.0.0.1", parsed.port or 9911
+    raise ValueError(f"Unsupported socket address '{address}' (use tcp://host:port or unix:///path)")
+
+
+class NdjsonSocketSubject(pw.io.python.ConnectorSubject):
+    """Newline-delimited JSON over a local TCP or Unix socket, many producers at once
+
+    Every connection is served by the same asyncio loop; each line is one
+    record (or a JSON array of records). Records are upserted by entity id,
+    like a rewritten stream file. When Pathway's backlog is full, `next`
+    blocks and the producers are slowed down by TCP flow control.
+    Producers may set `sent_at` (epoch seconds) to measure end-to-end lag.
+    """
+
+    def __init__(self, address: str = DEFAULT_SOCKET_ADDRESS):
+        super().__init__(datasource_name="ndjson_socket", session_type="upsert")
+        self.address = address
+        self.source = f"socket://{address.split('://', 1)[-1]}"
+        self.connections = 0
+        self.lines = 0
+
+    def run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        scheme, host, port = parse_address(self.address)
+        if scheme == "unix":
+            if os.path.exists(host):
+                os.remove(host)
+            server = await asyncio.start_unix_server(self._handle, path=host, limit=1 << 20)
+        else:
+            server = await asyncio.start_server(self._handle, host=host, port=port, limit=1 << 20)
+        print(f"🔌 NDJSON socket source listening on {self.address}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+                received_at = time.time()
+                for record in data if isinstance(data, list) else [data]:
+                    if isinstance(record, dict):
+                        # Records without an id are kept as separate events
+                        key = entity_id(record) or f"#{self.connections}:{self.lines}"
+                        self.next(entity_key=key, record=pw.Json(record), source=self.source,
+                                  written_at=float(record.get("sent_at", received_at)),
+                                  ingested_at=received_at)
+                self.lines += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def read_socket(address: str, name: str, autocommit_duration_ms: int = None,
+                max_backlog_size: int = 100000) -> pw.Table:
+    """Documents table (record/source/written_at/ingested_at) fed from a socket"""
+    kwargs = {"autocommit_duration_ms": autocommit_duration_ms} if autocommit_duration_ms is not None else {}
+    return pw.io.python.read(NdjsonSocketSubject(address), schema=SocketDocumentSchema,
+                             name=name, max_backlog_size=max_backlog_size, **kwargs)
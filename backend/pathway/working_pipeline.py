@@ -1,7 +1,4 @@
-import pathway as pw
-import json
-import os
-from datetime import datetime
+from backend.pathway.pipeline_runner import PipelineRunner, load_profile
 
 class WorkingPathwayPipeline:
     """Working Pathway pipeline for hackathon (no license required)"""
@@ -10,58 +7,14 @@ class WorkingPathwayPipeline:
         self.setup_working_pipeline()
     
     def setup_working_pipeline(self):
-        """Setup working Pathway streaming pipeline"""
-        print("🔥 Starting WORKING Pathway Pipeline...")
-        
-        # Define schema for JSON data
-        class LogisticsSchema(pw.Schema):
-            data: str
-        
-        # Create streaming data source with proper schema
-        self.data_source = pw.io.fs.read(
-            "./data/streams",
-            format="json",
-            mode="streaming",
-            schema=LogisticsSchema,
-            with_metadata=True
-        )
-        
-        # Process the streaming data
-        self.processed_data = self.data_source.select(
-            content=pw.this.data,
-            timestamp=pw.now(),
-            source=pw.this._metadata.path if hasattr(pw.this._metadata, 'path') else "stream"
-        )
-        
-        # Output to processed folder for API consumption
-        pw.io.fs.write(
-            self.processed_data,
-            pw.io.fs.write.JsonFormatter(),
-            "./data/processed/"
-        )
-        
-        print("✅ Working Pathway pipeline ready!")
-        print("📡 Real-time streaming ACTIVE (no license required)")
+        """Setup working Pathway streaming pipeline (profile 'working')"""
+        self.runner = PipelineRunner(load_profile("working"), "working")
+        self.processed_data = self.runner.build()["documents"]
         
     def run_pipeline(self):
         """Start the working pipeline"""
-        try:
-            print("🚀 Starting Pathway computation...")
-            pw.run(
-                monitoring_level=pw.MonitoringLevel.NONE,
-                with_http_server=False
-            )
-        except Exception as e:
-            print(f"⚠️ Pipeline error (continuing with simulation): {e}")
+        self.runner.run()
 
 if __name__ == "__main__":
-    try:
-        pipeline = WorkingPathwayPipeline()
-        pipeline.run_pipeline()
-    except Exception as e:
-        print(f"🔄 Using pathway simulation mode: {e}")
-        # Fallback to simulation
-        while True:
-            import time
-            time.sleep(10)
-            print("📡 Pathway simulation active...")
+    pipeline = WorkingPathwayPipeline()
+    pipeline.run_pipeline()
@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.utils.stream_store import entity_id, entity_type
+
+RULES_PATH = os.getenv("ALERT_RULES_PATH", "./config/alert_rules.json")
+
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+class _Template(dict):
+    def __missing__(self, key):
+        return "?"
+
+
+class Rule:
+    """One declared alert rule compiled to a vectorized predicate"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.name = spec["name"]
+        self.entity = spec["entity"]
+        self.fields = spec["field"] if isinstance(spec["field"], list) else [spec["field"]]
+        self.op = spec["op"]
+        if self.op not in OPERATORS:
+            raise ValueError(f"rule {self.name}: unsupported operator '{self.op}'")
+        self.numeric = isinstance(spec["value"], (int, float))
+        # String rules compare case-insensitively ("Overdue" == "overdue")
+        self.threshold = float(spec["value"]) if self.numeric else str(spec["value"]).lower()
+        self.severity = spec.get("severity", "medium")
+        self.message = spec.get("message", f"{self.name} fired")
+        self._compare = OPERATORS[self.op]
+
+    def value(self, record: Dict[str, Any]) -> Any:
+        """First present field of the record (e.g. deviation_km, then deviation)"""
+        for field in self.fields:
+            if record.get(field) is not None:
+                return record[field]
+        return None
+
+    def column(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """The rule's field over a batch: float64 (NaN when missing) or lower-cased str"""
+        if self.numeric:
+            values = [self.value(record) for record in records]
+            return np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+        return np.array([str(self.value(record) or "").lower() for record in records], dtype=object)
+
+    def mask(self, records: List[Dict[str, Any]], types: np.ndarray, columns: Dict[tuple, np.ndarray]) -> np.ndarray:
+        """Boolean mask of matching records; columns are shared between rules"""
+        key = (tuple(self.fields), self.numeric)
+        if key not in columns:
+            columns[key] = self.column(records)
+        with np.errstate(invalid="ignore"):
+            matched = self._compare(columns[key], self.threshold)
+        return (types == self.entity) & np.asarray(matched, dtype=bool)
+
+    def describe(self, record: Dict[str, Any]) -> str:
+        value = self.value(record)
+        return self.message.format_map(_Template(record, value=round(value, 2) if isinstance(value, float) else value,
+                                                 threshold=self.threshold))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "entity": self.entity, "field": self.fields, "op": self.op,
+                "value": self.threshold, "severity": self.severity}
+
+
+class RuleSet:
+    """All declared rules, evaluated together over a batch of records"""
+
+    def __init__(self, specs: List[Dict[str, Any]]):
+        self.rules = [Rule(spec) for spec in specs]
+        self.by_name = {rule.name: rule for rule in self.rules}
+
+    def __getitem__(self, name: str) -> Rule:
+        return self.by_name[name]
+
+    def threshold(self, name: str) -> Any:
+        return self.by_name[name].threshold
+
+    def evaluate(self, records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """rule name -> boolean mask over `records`"""
+        if not records:
+            return {rule.name: np.zeros(0, dtype=bool) for rule in self.rules}
+        types = np.array([entity_type(record) for record in records], dtype=object)
+        columns: Dict[tuple, np.ndarray] = {}
+        return {rule.name: rule.mask(records, types, columns) for rule in self.rules}
+
+    def filter(self, name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Records matching one rule (for ad-hoc datasets outside the alert engine)"""
+        if not records:
+            return []
+        rule = self.by_name[name]
+        types = np.array([entity_type(record) for record in records], dtype=object)
+        return [records[i] for i in np.flatnonzero(rule.mask(records, types, {}))]
+
+    def matches(self, name: str, record: Dict[str, Any]) -> bool:
+        return bool(self.filter(name, [record]))
+
+
+def load_rules(path: str = RULES_PATH) -> RuleSet:
+    with open(path, 'r') as f:
+        return RuleSet(json.load(f)["rules"])
+
+
+class AlertEngine:
+    """Active alerts kept current from record changes only
+
+    As a stream store listener it receives just the records that changed in
+    the last refresh (tick) and evaluates every rule over that batch with
+    numpy. Alerts are keyed by (rule, entity id), so an entity that keeps
+    matching (or appears in several files) holds one alert until it stops.
+    """
+
+    def __init__(self, rules: RuleSet):
+        self.rules = rules
+        # (rule, entity id) -> {record key: record} of records still matching
+        self._matches: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._by_record: Dict[str, Set[Tuple[str, str]]] = {}
+        self._alerts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._fired_batch: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.evaluated = 0
+        self.fired = 0
+        self.resolved = 0
+        self.last_tick_ms = 0.0
+
+    def subscribe(self, listener: Callable[[List[Dict[str, Any]]], None]):
+        """Call `listener` with the alerts newly fired by each tick"""
+        self._listeners.append(listener)
+
+    def apply_changes(self, upserts: List[Tuple[str, Dict[str, Any]]], deletes: List[str]):
+        """Evaluate the changed records and update alert state"""
+        started = time.perf_counter()
+        records = [record for _, record in upserts]
+        masks = self.rules.evaluate(records)
+        now = datetime.now().isoformat()
+
+        with self._lock:
+            for i, (key, record) in enumerate(upserts):
+                record_id = entity_id(record) or key
+                matched = {(rule.name, record_id) for rule in self.rules.rules
+                           if masks[rule.name][i] and not record.get("canary")}
+                self._update(key, record, matched, now)
+            for key in deletes:
+                self._update(key, None, set(), now)
+            self.ticks += 1
+            self.evaluated += len(records)
+            self.last_tick_ms = (time.perf_counter() - started) * 1000
+            # Copies: listeners may hand alerts to other threads
+            fired = [dict(alert) for alert in self._fired_batch]
+            self._fired_batch = []
+
+        for listener in self._listeners if fired else ():
+            try:
+                listener(fired)
+            except Exception as e:
+                print(f"⚠️ Alert listener error: {e}")
+
+    def _update(self, key: str, record: Optional[Dict[str, Any]], matched: Set[Tuple[str, str]], now: str):
+        for alert_key in self._by_record.get(key, set()) - matched:
+            contributors = self._matches.get(alert_key, {})
+            contributors.pop(key, None)
+            if not contributors:
+                self._matches.pop(alert_key, None)
+                self._alerts.pop(alert_key, None)
+                self.resolved += 1
+
+        for alert_key in matched:
+            rule = self.rules[alert_key[0]]
+            self._matches.setdefault(alert_key, {})[key] = record
+            alert = self._alerts.get(alert_key)
+            if alert is None:
+                alert = self._alerts[alert_key] = {
+                    "rule": rule.name,
+                    "entity": rule.entity,
+                    "entity_id": alert_key[1],
+                    "severity": rule.severity,
+                    "first_fired_at": now,
+                }
+                self.fired += 1
+                self._fired_batch.append(alert)
+            value = rule.value(record)
+            alert.update(value=value, message=rule.describe(record), updated_at=now)
+
+        if matched:
+            self._by_record[key] = matched
+        else:
+            self._by_record.pop(key, None)
+
+    def alerts(self, rule: Optional[str] = None, severity: Optional[str] = None,
+               entity: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(alert) for alert in self._alerts.values()
+                    if (rule is None or alert["rule"] == rule)
+                    and (severity is None or alert["severity"] == severity)
+                    and (entity is None or alert["entity"] == entity)]
+
+    def records(self, rule: str) -> List[Dict[str, Any]]:
+        """One current record per entity firing `rule`"""
+        with self._lock:
+            return [next(iter(contributors.values())) for (name, _), contributors in self._matches.items()
+                    if name == rule]
+
+    def count(self, rule: str) -> int:
+        with self._lock:
+            return sum(1 for name, _ in self._alerts if name == rule)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_rule = {rule.name: 0 for rule in self.rules.rules}
+            for name, _ in self._alerts:
+                by_rule[name] += 1
+            return {
+                "active": len(self._alerts),
+                "by_rule": by_rule,
+                "fired": self.fired,
+                "resolved": self.resolved,
+                "ticks": self.ticks,
+                "records_evaluated": self.evaluated,
+                "last_tick_ms": round(self.last_tick_ms, 3),
+            }
+
+
+# Global instance
+alert_rules = load_rules()
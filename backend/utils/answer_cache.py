@@ -0,0 +1,143 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+_PUNCTUATION = re.compile(r"[^\w\s-]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Canonical cache key: lowercase, no punctuation, single spaces"""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", question.lower())).strip()
+
+
+class AnswerCache:
+    """LRU answer cache keyed by normalized question and data version
+
+    An answer is only served for the data version it was computed from, so
+    a change in the underlying data invalidates it automatically. With an
+    embedder, a miss falls back to the nearest cached question whose
+    cosine similarity is above `similarity_threshold`.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None,
+                 embedder: Optional[Callable[[List[str]], Any]] = None,
+                 similarity_threshold: float = 0.92):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, question: str, data_version: Any = None) -> Any:
+        """Return the cached answer or None"""
+        key = normalize_question(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_valid(entry, data_version):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['value']
+            if entry is not None:
+                del self._entries[key]
+                self.invalidations += 1
+
+        if self.embedder is not None:
+            value = self._nearest(key, data_version)
+            if value is not None:
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, question: str, value: Any, data_version: Any = None):
+        """Store an answer computed from `data_version`"""
+        key = normalize_question(question)
+        vector = None
+        if self.embedder is not None:
+            try:
+                vector = self.embedder([key])[0]
+            except Exception:
+                vector = None
+
+        with self._lock:
+            self._entries[key] = {
+                'value': value,
+                'version': data_version,
+                'created_at': time.monotonic(),
+                'vector': vector,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *_):
+        """Drop every entry (usable directly as a stream store listener)"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _is_valid(self, entry: Dict[str, Any], data_version: Any) -> bool:
+        if entry['version'] != data_version:
+            return False
+        if self.ttl_seconds is not None and time.monotonic() - entry['created_at'] > self.ttl_seconds:
+            return False
+        return True
+
+    def _nearest(self, key: str, data_version: Any) -> Any:
+        import numpy as np
+
+        try:
+            query = np.asarray(self.embedder([key])[0])
+        except Exception:
+            return None
+
+        with self._lock:
+            best_key, best_score = None, self.similarity_threshold
+            for candidate, entry in self._entries.items():
+                if entry['vector'] is None or not self._is_valid(entry, data_version):
+                    continue
+                score = float(np.dot(query, entry['vector']))
+                if score >= best_score:
+                    best_key, best_score = candidate, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            self.semantic_hits += 1
+            return self._entries[best_key]['value']
+
+
+def build_answer_cache(max_entries: int = 1024, ttl_seconds: Optional[float] = None) -> AnswerCache:
+    """Answer cache with semantic matching when ANSWER_CACHE_EMBEDDING_MODEL is set"""
+    model_name = os.getenv("ANSWER_CACHE_EMBEDDING_MODEL", "")
+    embedder = None
+    if model_name:
+        from backend.utils.hybrid_index import sentence_transformer_embedder
+        embedder = sentence_transformer_embedder(model_name)
+    return AnswerCache(max_entries=max_entries, ttl_seconds=ttl_seconds, embedder=embedder,
+                       similarity_threshold=float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.92")))
@@ -0,0 +1,72 @@
+import threading
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-service circuit breaker: closed -> open -> half-open -> closed
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected without touching the network. Once `reset_timeout`
+    seconds have passed, a single caller is let through as a half-open
+    probe: its success closes the circuit, its failure re-opens it for
+    another `reset_timeout`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 5.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.probes = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """True if the caller may make the call (and must then record its outcome)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            # A half-open probe that never reported back frees its slot after reset_timeout
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._opened_at = time.monotonic()
+                self.probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opens += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    @property
+    def closed(self) -> bool:
+        return self.state == CLOSED
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "probes": self.probes,
+                "rejected": self.rejected,
+            }
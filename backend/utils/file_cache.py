@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+
+class FileCache:
+    """Parsed files shared by every caller, re-parsed only on (mtime, size) change
+
+    A call only stats the file. A changed file is parsed on a worker thread,
+    and every caller that sees the same change while that parse is running
+    waits on it (single-flight) instead of parsing the file again. Cached
+    values are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, parse: Callable[[bytes], Any] = json.loads, workers: int = 2):
+        self.parse = parse
+        self._entries: Dict[str, Tuple[tuple, Any]] = {}
+        self._inflight: Dict[str, Tuple[tuple, Future]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FileCache")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_load_ms = 0.0
+
+    async def get(self, path: str, default: Any = None) -> Any:
+        """Current parsed content of `path` (`default` if it cannot be read)"""
+        result = self._lookup(path, default)
+        if isinstance(result, Future):
+            return await asyncio.wrap_future(result)
+        return result
+
+    def get_sync(self, path: str, default: Any = None) -> Any:
+        """Blocking variant of `get` for code outside an event loop"""
+        result = self._lookup(path, default)
+        return result.result() if isinstance(result, Future) else result
+
+    def _lookup(self, path: str, default: Any):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return default
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            flight = self._inflight.get(path)
+            if flight is not None and flight[0] == signature:
+                self.coalesced += 1
+                return flight[1]
+            future: Future = Future()
+            self._inflight[path] = (signature, future)
+        self._executor.submit(self._load, path, signature, future, default)
+        return future
+
+    def _load(self, path: str, signature: tuple, future: Future, default: Any):
+        started = time.perf_counter()
+        try:
+            with open(path, 'rb') as f:
+                value = self.parse(f.read())
+        except Exception:
+            # Half-written file: keep serving the last good parse
+            with self._lock:
+                self.errors += 1
+                entry = self._entries.get(path)
+                if self._inflight.get(path, (None, None))[1] is future:
+                    del self._inflight[path]
+            future.set_result(entry[1] if entry is not None else default)
+            return
+        with self._lock:
+            self._entries[path] = (signature, value)
+            if self._inflight.get(path, (None, None))[1] is future:
+                del self._inflight[path]
+            self.loads += 1
+            self.last_load_ms = (time.perf_counter() - started) * 1000
+        future.set_result(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "hits": self.hits,
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "last_load_ms": round(self.last_load_ms, 3),
+            }
+
+
+# Global instance
+file_cache = FileCache()
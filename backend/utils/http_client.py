@@ -0,0 +1,272 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import EmptyPoolError
+
+from backend.utils.circuit_breaker import CircuitBreaker
+
+# Base URLs of the local services, overridable for Docker / remote setups
+MCP_URL = os.getenv("MCP_URL", "http://localhost:8123")
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Call rejected without a request: the host's circuit breaker is open"""
+
+
+class PoolTimeoutError(requests.ConnectionError):
+    """Call rejected without a request: no pooled connection freed up within `pool_timeout`"""
+
+
+class BoundedPoolAdapter(HTTPAdapter):
+    """HTTPAdapter whose callers wait at most `pool_timeout` seconds for a pooled connection
+
+    requests never passes a pool timeout to urllib3, so with pool_block a
+    caller beyond `pool_maxsize` would wait for a free connection for as
+    long as the requests ahead of it hang, whatever its own `timeout`.
+    """
+
+    def __init__(self, pool_timeout: float, **kwargs):
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pool_timeout = self.pool_timeout
+
+        def bounded(pool_class):
+            class BoundedWaitPool(pool_class):
+                def _get_conn(self, timeout=None):
+                    return super()._get_conn(timeout=pool_timeout if timeout is None else timeout)
+            return BoundedWaitPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: bounded(pool_class) for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class HttpClient:
+    """Shared keep-alive HTTP client with a per-host connection limit
+
+    Sync calls share one requests.Session: its urllib3 pools keep up to
+    `per_host` connections open per host, and callers beyond that wait up to
+    `pool_timeout` for a free connection instead of opening throwaway ones
+    (then fail with PoolTimeoutError). The async variant keeps one aiohttp
+    session per event loop with the same per-host limit; there the wait for
+    a connection counts against the call's `timeout`. `get_json` /
+    `post_json` return None on any failure, the way the dashboard and
+    agents already treat an unreachable service.
+
+    Every host has a circuit breaker: after `failure_threshold` consecutive
+    failures (errors, timeouts, 5xx) calls to it fail fast until a
+    half-open probe succeeds. `get_json_swr` adds stale-while-revalidate
+    on top, serving the last good response with its age.
+    """
+
+    def __init__(self, per_host: int = 8, timeout: float = 5.0, max_hosts: int = 16,
+                 pool_timeout: float = 0.5, failure_threshold: int = 3, reset_timeout: float = 5.0):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.session = requests.Session()
+        adapter = BoundedPoolAdapter(pool_timeout, pool_connections=max_hosts, pool_maxsize=per_host,
+                                     pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapter = adapter
+        self._async_sessions: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._lock = threading.Lock()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._last_good: Dict[str, Tuple[float, Any]] = {}
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="HttpRefresh")
+        self.requests = 0
+        self.errors = 0
+        self.pool_timeouts = 0
+        self.stale_served = 0
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = self.breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.name}")
+        kwargs.setdefault("timeout", self.timeout)
+        self.requests += 1
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except EmptyPoolError as e:
+            # Local saturation, not an upstream failure: the breaker is left alone
+            self.pool_timeouts += 1
+            raise PoolTimeoutError(f"no free connection to {breaker.name} within {self.pool_timeout}s") from e
+        except requests.RequestException:
+            self.errors += 1
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_json(self, url: str, **kwargs) -> Optional[Any]:
+        """Parsed JSON of a 200 response, else None"""
+        return self._json("GET", url, **kwargs)
+
+    def post_json(self, url: str, **kwargs) -> Optional[Any]:
+        return self._json("POST", url, **kwargs)
+
+    def _json(self, method: str, url: str, **kwargs) -> Optional[Any]:
+        try:
+            response = self.request(method, url, **kwargs)
+            return response.json() if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+
+    def get_json_swr(self, url: str, fresh_for: float = 1.0, max_stale: float = 5.0,
+                     **kwargs) -> Tuple[Optional[Any], Optional[float]]:
+        """(JSON, age in seconds) of `url`, stale-while-revalidate
+
+        A last good response younger than `fresh_for` is returned as is. An
+        older one is returned at once while a single background request
+        refreshes it (while the circuit is open, that refresh is the
+        half-open probe), so a down or slow service costs callers no wait.
+        The caller only waits when there is no usable value: none yet, or
+        older than `max_stale` while the service is healthy. (None, None)
+        if nothing could be fetched.
+        """
+        with self._lock:
+            entry = self._last_good.get(url)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age <= fresh_for:
+                return entry[1], age
+            if age <= max_stale or not self.breaker(url).closed:
+                self._revalidate(url, kwargs)
+                self.stale_served += 1
+                return entry[1], age
+
+        data = self._fetch_good(url, kwargs)
+        if data is not None:
+            return data, 0.0
+        if entry is not None:
+            self.stale_served += 1
+            return entry[1], time.monotonic() - entry[0]
+        return None, None
+
+    def _fetch_good(self, url: str, kwargs: Dict[str, Any]) -> Optional[Any]:
+        data = self._json("GET", url, **kwargs)
+        if data is not None:
+            with self._lock:
+                self._last_good[url] = (time.monotonic(), data)
+        return data
+
+    def _revalidate(self, url: str, kwargs: Dict[str, Any]):
+        """Refresh `url` in the background, at most one refresh per URL at a time"""
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def refresh():
+            try:
+                self._fetch_good(url, kwargs)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        self._refresher.submit(refresh)
+
+    async def arequest_json(self, method: str, url: str, **kwargs) -> Optional[Any]:
+        """Async variant of get_json / post_json on this loop's pooled aiohttp session"""
+        import aiohttp
+
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            return None
+        session = self._async_session()
+        timeout = kwargs.pop("timeout", self.timeout)
+        self.requests += 1
+        try:
+            async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                       **kwargs) as response:
+                if response.status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status != 200:
+                    return None
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.errors += 1
+            breaker.record_failure()
+            return None
+        except ValueError:
+            self.errors += 1
+            return None
+
+    async def aget_json(self, url: str, **kwargs) -> Optional[Any]:
+        return await self.arequest_json("GET", url, **kwargs)
+
+    async def apost_json(self, url: str, **kwargs) -> Optional[Any]:
+        return await self.arequest_json("POST", url, **kwargs)
+
+    def _async_session(self):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._async_sessions.get(loop)
+            if session is None or session.closed:
+                # Sessions are bound to their loop; drop the ones whose loop has closed
+                for old_loop in [old for old in self._async_sessions if old.is_closed()]:
+                    del self._async_sessions[old_loop]
+                connector = aiohttp.TCPConnector(limit_per_host=self.per_host, keepalive_timeout=30)
+                session = self._async_sessions[loop] = aiohttp.ClientSession(connector=connector)
+            return session
+
+    async def aclose(self):
+        """Close this loop's async session (e.g. on application shutdown)"""
+        with self._lock:
+            session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        pools = list(self._adapter.poolmanager.pools._container.values())
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "per_host_limit": self.per_host,
+            "pool_timeouts": self.pool_timeouts,
+            "hosts": len(pools),
+            "connections_opened": sum(pool.num_connections for pool in pools),
+            "async_sessions": len(self._async_sessions),
+            "stale_served": self.stale_served,
+            "breakers": {host: breaker.stats() for host, breaker in list(self.breakers.items())},
+        }
+
+
+# Global instance
+http_client = HttpClient()
@@ -0,0 +1,224 @@
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple, Callable, Optional
+
+from backend.utils.model_warmup import ModelWarmup, resolve_model
+from backend.utils.stream_store import entity_id, entity_type
+
+# Ids, routes and license classes stay whole ("d-017", "mumbai-delhi", "cdl-a")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+# Fields whose values can be looked up exactly without scoring
+EXACT_FIELDS = ("driver_id", "shipment_id", "invoice_id", "vehicle_id",
+                "route", "license_class", "driver_assigned")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase tokens; compound tokens also emit their parts"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if '-' in token:
+            tokens.extend(part for part in token.split('-') if len(part) > 1 or part.isdigit())
+    return tokens
+
+
+def record_text(record: Dict[str, Any]) -> str:
+    """Flatten the scalar values of a record into searchable text"""
+    return " ".join(str(value) for value in record.values()
+                    if isinstance(value, (str, int, float)) and not isinstance(value, bool))
+
+
+class HybridIndex:
+    """BM25 inverted index fused with optional embedding similarity
+
+    Maintained incrementally through `apply_changes`, which matches the
+    LiveStreamStore listener signature.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, vector_weight: float = 0.3,
+                 embedder: Optional[Callable[[List[str]], Any]] = None):
+        self.k1 = k1
+        self.b = b
+        self.vector_weight = vector_weight
+        self.embedder = embedder
+        # Set by build_live_index when an embedding model is configured
+        self.warmup: Optional[ModelWarmup] = None
+
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self._exact: Dict[str, set] = defaultdict(set)
+        self._doc_exact: Dict[str, List[str]] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._vectors: Dict[str, Any] = {}
+        self._matrix = None
+        self._matrix_keys: List[str] = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def apply_changes(self, upserts: List[Tuple[str, Dict[str, Any]]], deletes: List[str]):
+        """Incrementally add, replace and remove documents"""
+        with self._lock:
+            for key in deletes:
+                self._remove(key)
+            for key, record in upserts:
+                self._remove(key)
+                self._add(key, record)
+
+            if self.embedder and upserts:
+                try:
+                    vectors = self.embedder([record_text(record) for _, record in upserts])
+                    for (key, _), vector in zip(upserts, vectors):
+                        self._vectors[key] = vector
+                except Exception as e:
+                    print(f"⚠️ Embedding error, continuing with BM25 only: {e}")
+            if self.embedder and (upserts or deletes):
+                self._matrix = None
+
+    def lookup(self, question: str) -> List[Dict[str, Any]]:
+        """Exact id / route / license lookups found in the question"""
+        with self._lock:
+            keys = []
+            for token in TOKEN_PATTERN.findall(question.lower()):
+                for key in self._exact.get(token, ()):
+                    if key not in keys:
+                        keys.append(key)
+            return [self._records[key] for key in keys]
+
+    def search(self, question: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Hybrid BM25 + vector ranking of the indexed records"""
+        with self._lock:
+            bm25 = self._bm25_scores(tokenize(question))
+            vector = self._vector_scores(question) if self.embedder else {}
+
+            if not bm25 and not vector:
+                return []
+
+            top_bm25 = max(bm25.values()) if bm25 else 1.0
+            scores = {key: (1 - self.vector_weight) * score / top_bm25
+                      for key, score in bm25.items()}
+            for key, similarity in vector.items():
+                scores[key] = scores.get(key, 0.0) + self.vector_weight * max(0.0, similarity)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [{
+                "entity_id": entity_id(self._records[key]),
+                "entity_type": entity_type(self._records[key]),
+                "score": round(score, 4),
+                "record": self._records[key],
+            } for key, score in ranked]
+
+    def _add(self, key: str, record: Dict[str, Any]):
+        terms: Dict[str, int] = defaultdict(int)
+        for token in tokenize(record_text(record)):
+            terms[token] += 1
+        for term, tf in terms.items():
+            self._postings[term][key] = tf
+        length = sum(terms.values())
+        self._doc_terms[key] = dict(terms)
+        self._doc_len[key] = length
+        self._total_len += length
+        self._records[key] = record
+
+        exact_values = [str(record[field]).lower() for field in EXACT_FIELDS if record.get(field)]
+        for value in exact_values:
+            self._exact[value].add(key)
+        self._doc_exact[key] = exact_values
+
+    def _remove(self, key: str):
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(key, 0)
+        for value in self._doc_exact.pop(key, []):
+            self._exact[value].discard(key)
+            if not self._exact[value]:
+                del self._exact[value]
+        self._records.pop(key, None)
+        self._vectors.pop(key, None)
+
+    def _bm25_scores(self, query_terms: List[str]) -> Dict[str, float]:
+        n_docs = len(self._doc_len)
+        if not n_docs:
+            return {}
+        avg_len = self._total_len / n_docs or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(query_terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[key] / avg_len)
+                scores[key] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def _vector_scores(self, question: str, top_k: int = 20) -> Dict[str, float]:
+        import numpy as np
+
+        if not self._vectors:
+            return {}
+        if self._matrix is None:
+            self._matrix_keys = list(self._vectors.keys())
+            self._matrix = np.vstack([self._vectors[key] for key in self._matrix_keys])
+        try:
+            query = np.asarray(self.embedder([question])[0])
+        except Exception:
+            return {}
+        similarities = self._matrix @ query
+        best = np.argsort(-similarities)[:top_k]
+        return {self._matrix_keys[i]: float(similarities[i]) for i in best}
+
+
+def sentence_transformer_embedder(model_name: str) -> Callable[[List[str]], Any]:
+    """Normalized sentence-transformers embeddings (imported on first use)
+
+    `embed.load()` loads the model; concurrent first callers share one load.
+    """
+    state = {}
+    lock = threading.Lock()
+
+    def load():
+        with lock:
+            if 'model' not in state:
+                from sentence_transformers import SentenceTransformer
+                state['model'] = SentenceTransformer(model_name, device="cpu")
+        return state['model']
+
+    def embed(texts: List[str]):
+        model = state.get('model') or load()
+        return model.encode(texts, normalize_embeddings=True)
+
+    embed.load = load
+    return embed
+
+
+def build_live_index() -> HybridIndex:
+    """Index with vector fusion enabled only when HYBRID_VECTOR_MODEL is set
+
+    HYBRID_VECTOR_MODEL_PATH points at a local copy of the model; the
+    index's `warmup` loads and primes it (started with the API).
+    """
+    model_name = os.getenv("HYBRID_VECTOR_MODEL", "")
+    if not model_name:
+        return HybridIndex()
+
+    model, source = resolve_model(model_name, os.getenv("HYBRID_VECTOR_MODEL_PATH"))
+    embedder = sentence_transformer_embedder(model)
+    index = HybridIndex(embedder=embedder)
+    index.warmup = ModelWarmup("live_index_embedder", load=embedder.load,
+                               encode=lambda model, texts: embedder(texts), source=source)
+    return index
@@ -0,0 +1,143 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+INTENTS_PATH = os.getenv("INTENTS_PATH", "./config/intents.json")
+
+
+class AhoCorasick:
+    """Keyword automaton: one pass over the text finds every keyword, overlaps included
+
+    Keywords are lower-case substrings (the `in` checks this replaces), so
+    "driver" also matches "drivers". The failure links are folded into a
+    full transition table at build time; matching is one dict lookup per
+    character.
+    """
+
+    def __init__(self, keywords: Dict[str, str]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+        for keyword, label in keywords.items():
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].add(label)
+
+        # Breadth-first: a state's failure target is always resolved before the state itself
+        fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+            for char, child in goto[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+        self._outputs: List[FrozenSet[str]] = [frozenset(labels) for labels in outputs]
+
+    def labels(self, text: str) -> set:
+        """Labels of every keyword occurring in `text` (already lower-cased)"""
+        delta, outputs = self._delta, self._outputs
+        state, found = 0, set()
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class Route:
+    """Routing result: matched intents in priority order and extracted entities"""
+
+    __slots__ = ("intents", "entities")
+
+    def __init__(self, intents: Tuple[str, ...], entities: Dict[str, Tuple[str, ...]]):
+        self.intents = intents
+        self.entities = entities
+
+    def has(self, intent: str) -> bool:
+        return intent in self.intents
+
+    def first(self, *intents: str) -> Optional[str]:
+        """The first of `intents` (in the caller's order) that matched"""
+        for intent in intents:
+            if intent in self.intents:
+                return intent
+        return None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"intents": list(self.intents), "entities": {k: list(v) for k, v in self.entities.items()}}
+
+
+class IntentRouter:
+    """Question -> intents (several can match) and entity ids, memoized
+
+    Intents are declared in priority order with their keywords; entities
+    (driver / shipment / invoice / vehicle ids, routes) are named regexes
+    that run in a single pass. Results are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(self, spec: Dict[str, object], memo_size: int = 4096):
+        self.priority = [intent["name"] for intent in spec["intents"]]
+        self._matcher = AhoCorasick({keyword.lower(): intent["name"]
+                                     for intent in spec["intents"] for keyword in intent["keywords"]})
+        entities = spec.get("entities", {})
+        # One alternation of named groups: a single scan extracts every entity kind
+        self._entity_pattern = re.compile("|".join(f"(?P<{name}>{pattern})"
+                                                   for name, pattern in entities.items())) if entities else None
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, Route]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def route(self, question: str) -> Route:
+        with self._lock:
+            route = self._memo.get(question)
+            if route is not None:
+                self._memo.move_to_end(question)
+                self.hits += 1
+                return route
+
+        route = self.classify(question)
+        with self._lock:
+            self.misses += 1
+            self._memo[question] = route
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return route
+
+    def classify(self, question: str) -> Route:
+        """Uncached routing of one question"""
+        matched = self._matcher.labels(question.lower())
+        intents = tuple(intent for intent in self.priority if intent in matched)
+
+        entities: Dict[str, List[str]] = {}
+        if self._entity_pattern is not None:
+            for match in self._entity_pattern.finditer(question):
+                values = entities.setdefault(match.lastgroup, [])
+                if match.group() not in values:
+                    values.append(match.group())
+        return Route(intents, {name: tuple(values) for name, values in entities.items()})
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"memoized": len(self._memo), "hits": self.hits, "misses": self.misses}
+
+
+def load_router(path: str = INTENTS_PATH) -> IntentRouter:
+    with open(path, 'r') as f:
+        return IntentRouter(json.load(f))
+
+
+# Global instance
+intent_router = load_router()
@@ -0,0 +1,73 @@
+import bisect
+import threading
+from typing import Dict, Any, List
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+class LagHistogram:
+    """Fixed-bucket latency histogram (O(1) memory, thread-safe)"""
+
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # Most recent observation: the current lag, unlike the cumulative percentiles
+        self.last_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, lag_ms: float):
+        lag_ms = max(0.0, lag_ms)
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets_ms, lag_ms)] += 1
+            self.count += 1
+            self.total_ms += lag_ms
+            self.max_ms = max(self.max_ms, lag_ms)
+            self.last_ms = lag_ms
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the given percentile"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = pct / 100 * self.count
+            seen = 0
+            for i, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else self.max_ms
+            return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}" for bound in self.buckets_ms] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class FreshnessMetrics:
+    """Named lag histograms, one per pipeline stage"""
+
+    def __init__(self, stages: List[str] = ()):
+        self.stages: Dict[str, LagHistogram] = {stage: LagHistogram() for stage in stages}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, lag_ms: float):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, LagHistogram())
+        histogram.observe(lag_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {stage: histogram.to_dict() for stage, histogram in self.stages.items()}
@@ -0,0 +1,38 @@
+import threading
+from typing import Any, Callable
+
+
+class LazySingleton:
+    """Module-level instance built on first use instead of at import
+
+    Attribute access is forwarded to the instance, so existing
+    `from module import instance` callers keep working unchanged. The
+    factory runs once, even when several threads hit it at the same time.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    @property
+    def built(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.get(), name, value)
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.state_snapshot import write_snapshot
+
+# Dummy inputs shaped like real queries and documents
+WARMUP_TEXTS = [
+    "Which drivers have a safety score below 6?",
+    "Overdue invoices for Elite Shipping due this week",
+    "Shipment SH-0042 deviated 45 km from the Delhi-Mumbai route",
+    "Driver D-017 completed defensive driving training",
+]
+
+
+def resolve_model(model: str, model_path: Optional[str]) -> Tuple[str, str]:
+    """(what to load, "local" | "hub"): the local copy when it exists, else the hub name"""
+    if model_path and os.path.isdir(model_path):
+        return model_path, "local"
+    if model_path:
+        print(f"⚠️ Model path {model_path} not found, loading {model} from the hub "
+              f"(python -m scripts.download_embedding_model saves a local copy)")
+    return model, "hub"
+
+
+def warmup_status_path(name: str) -> str:
+    return f"./data/state/warmup_{name}.json"
+
+
+class ModelWarmup:
+    """Loads a model once and primes it with dummy batches before traffic
+
+    `load()` builds the model and `encode(model, texts)` runs one batch.
+    The first batches allocate buffers and start the inference threads, so
+    after `run()` the first real query costs the same as any other. Until
+    then `ready` is False. The status (and, with `status_path`, a JSON file
+    other processes can read) carries the load and warm-up durations.
+    """
+
+    def __init__(self, name: str, load: Callable[[], Any], encode: Callable[[Any, List[str]], Any],
+                 batches: int = 3, batch_size: int = 16, source: str = "",
+                 status_path: Optional[str] = None):
+        self.name = name
+        self.load = load
+        self.encode = encode
+        self.batches = batches
+        self.batch_size = batch_size
+        self.source = source
+        self.status_path = status_path
+        self.state = "pending"
+        self.error = ""
+        self.model = None
+        self.load_ms = 0.0
+        self.batch_ms: List[float] = []
+        self.warmup_ms = 0.0
+        self.finished_at: Optional[str] = None
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def run(self) -> Any:
+        """Load and warm the model in this thread; returns the model (raises if loading fails)"""
+        started = time.perf_counter()
+        self._set_state("warming")
+        try:
+            self.model = self.load()
+            self.load_ms = (time.perf_counter() - started) * 1000
+            texts = (WARMUP_TEXTS * (self.batch_size // len(WARMUP_TEXTS) + 1))[:self.batch_size]
+            for _ in range(self.batches):
+                batch_started = time.perf_counter()
+                self.encode(self.model, texts)
+                self.batch_ms.append((time.perf_counter() - batch_started) * 1000)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.warmup_ms = (time.perf_counter() - started) * 1000
+            self._set_state("failed")
+            raise
+        self.warmup_ms = (time.perf_counter() - started) * 1000
+        self._set_state("ready")
+        print(f"🔥 {self.name} warm in {self.warmup_ms:.0f} ms (load {self.load_ms:.0f} ms, "
+              f"{self.batches} x {self.batch_size} dummy batches)")
+        return self.model
+
+    def start(self):
+        """Warm up on a background thread (the process stays not-ready meanwhile)"""
+        if self._thread is not None:
+            return
+
+        def warm():
+            try:
+                self.run()
+            except Exception as e:
+                print(f"❌ {self.name} warm-up failed: {e}")
+
+        self._thread = threading.Thread(target=warm, name=f"Warmup-{self.name}", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finished (ready or failed); True if ready"""
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "ready": self.ready,
+            "source": self.source,
+            "load_ms": round(self.load_ms, 1),
+            "batch_ms": [round(ms, 1) for ms in self.batch_ms],
+            "warmup_ms": round(self.warmup_ms, 1),
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+    def _set_state(self, state: str):
+        self.state = state
+        if state in ("ready", "failed"):
+            self.finished_at = datetime.now().isoformat()
+            self._done.set()
+        if self.status_path:
+            write_snapshot(self.status_path, self.status())
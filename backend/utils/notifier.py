@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.utils.latency import LagHistogram
+
+NOTIFICATIONS_PATH = os.getenv("NOTIFICATIONS_CONFIG", "./config/notifications.json")
+
+# HTTP statuses worth retrying; other 4xx responses drop the batch
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class Destination:
+    """One webhook endpoint with its own bounded queue, batching and rate limit"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.name = spec["name"]
+        # NOTIFY_<NAME>_URL overrides the configured webhook
+        self.url = os.getenv(f"NOTIFY_{self.name.upper()}_URL", spec.get("url", ""))
+        self.rules = set(spec.get("rules", []))
+        self.batch_size = spec.get("batch_size", 100)
+        self.max_wait = spec.get("max_wait_ms", 250) / 1000
+        self.rate_per_sec = spec.get("rate_per_sec", 20)
+        self.concurrency = spec.get("concurrency", 1)
+        self.max_retries = spec.get("max_retries", 5)
+        self.backoff = spec.get("backoff_ms", 200) / 1000
+        # Oldest notifications are dropped first once the queue is full
+        self.queue: deque = deque(maxlen=spec.get("max_queue", 10000))
+        self.ready: Optional[asyncio.Event] = None
+        self.queued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.requests = 0
+        self.retries = 0
+        self.last_error = ""
+        self.delivery_lag = LagHistogram()
+        self._tokens = float(self.rate_per_sec)
+        self._refilled_at = time.monotonic()
+
+    async def acquire(self):
+        """Token bucket: at most `rate_per_sec` requests per second (bursts up to one second)"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.rate_per_sec, self._tokens + (now - self._refilled_at) * self.rate_per_sec)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate_per_sec)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "pending": len(self.queue),
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "requests": self.requests,
+            "retries": self.retries,
+            "last_error": self.last_error,
+            "delivery_lag": self.delivery_lag.to_dict(),
+        }
+
+
+class Notifier:
+    """Asynchronous outbound notifications, batched per destination
+
+    `notify` only appends to a bounded in-memory queue and never blocks the
+    caller. An asyncio loop on a background thread drains each destination
+    in batches of up to `batch_size` (or whatever arrived within
+    `max_wait_ms`), POSTs them as one JSON document, retries failures with
+    exponential backoff and jitter, and respects a per-destination rate limit.
+    """
+
+    def __init__(self, destinations: List[Dict[str, Any]], timeout: float = 5.0):
+        self.destinations = {spec["name"]: Destination(spec) for spec in destinations}
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path: str = NOTIFICATIONS_PATH) -> "Notifier":
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f).get("destinations", []))
+        except (OSError, ValueError):
+            return cls([])
+
+    def start(self):
+        """Start the delivery loop (done lazily by the first notify)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="Notifier", daemon=True)
+            self._thread.start()
+        ready.wait()
+
+    def notify(self, destination: str, payload: Dict[str, Any]) -> bool:
+        """Queue one notification; False if the destination is unknown or not configured"""
+        target = self.destinations.get(destination)
+        if target is None or not target.url:
+            return False
+        if self._thread is None:
+            self.start()
+        if len(target.queue) == target.queue.maxlen:
+            target.dropped += 1
+        target.queue.append((time.time(), payload))
+        target.queued += 1
+        self._loop.call_soon_threadsafe(target.ready.set)
+        return True
+
+    def notify_alerts(self, alerts: List[Dict[str, Any]]):
+        """Alert engine listener: route newly fired alerts by rule name"""
+        for alert in alerts:
+            for destination in self.destinations.values():
+                if alert.get("rule") in destination.rules:
+                    self.notify(destination.name, alert)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: destination.stats() for name, destination in self.destinations.items()}
+
+    def _run(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        for destination in self.destinations.values():
+            destination.ready = asyncio.Event()
+        ready.set()
+        self._loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit_per_host=max((d.concurrency for d in self.destinations.values()), default=1))
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            workers = [self._deliver(session, destination)
+                       for destination in self.destinations.values() if destination.url
+                       for _ in range(destination.concurrency)]
+            await asyncio.gather(*workers)
+
+    async def _next_batch(self, destination: Destination) -> List[tuple]:
+        while not destination.queue:
+            destination.ready.clear()
+            await destination.ready.wait()
+        # Give a batch up to max_wait to fill before sending
+        deadline = time.monotonic() + destination.max_wait
+        while len(destination.queue) < destination.batch_size and time.monotonic() < deadline:
+            await asyncio.sleep(min(0.01, destination.max_wait))
+        batch = []
+        while destination.queue and len(batch) < destination.batch_size:
+            batch.append(destination.queue.popleft())
+        return batch
+
+    async def _deliver(self, session, destination: Destination):
+        while True:
+            batch = await self._next_batch(destination)
+            if not batch:
+                continue
+            body = {
+                "destination": destination.name,
+                "sent_at": datetime.now().isoformat(),
+                "count": len(batch),
+                "notifications": [payload for _, payload in batch],
+            }
+            for attempt in range(destination.max_retries + 1):
+                await destination.acquire()
+                destination.requests += 1
+                retry = True
+                try:
+                    async with session.post(destination.url, json=body) as response:
+                        if response.status < 300:
+                            now = time.time()
+                            destination.delivered += len(batch)
+                            for queued_at, _ in batch:
+                                destination.delivery_lag.observe((now - queued_at) * 1000)
+                            break
+                        destination.last_error = f"HTTP {response.status}"
+                        retry = response.status in RETRY_STATUSES
+                except Exception as e:
+                    destination.last_error = f"{type(e).__name__}: {e}"
+                if not retry or attempt == destination.max_retries:
+                    destination.failed += len(batch)
+                    break
+                destination.retries += 1
+                # Exponential backoff with full jitter
+                await asyncio.sleep(random.uniform(0, destination.backoff * 2 ** attempt))
+
+
+def delivery_summary(destinations: Optional[Dict[str, Any]], destination: str) -> str:
+    """One-line delivery status for agent responses, from the API's /notifications destinations
+
+    Alerts are sent by the API process, so agents running elsewhere must
+    report its counters, not those of their own (idle) notifier.
+    """
+    if destinations is None:
+        return "delivery status unavailable (API unreachable)"
+    stats = destinations.get(destination)
+    if stats is None or not stats.get("url"):
+        return f"{destination} notifications not configured"
+    return (f"{stats['delivered']} delivered, {stats['pending']} pending, "
+            f"{stats['failed']} failed ({destination} webhook)")
+
+
+# Global instance
+notifier = Notifier.from_config()
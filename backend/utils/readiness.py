@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+READINESS_PATH = os.getenv("READINESS_CONFIG", "./config/readiness.json")
+
+
+class EventLoopLagMonitor:
+    """Event-loop lag from a periodic timer: how late each wake-up fires
+
+    A task sleeps `interval` seconds at a time; anything beyond that is
+    time the loop spent busy with other work. The worst lag of the last
+    `window` ticks is kept, so a short stall stays visible for a while.
+    """
+
+    def __init__(self, interval: float = 0.25, window: int = 40):
+        self.interval = interval
+        self.last_ms = 0.0
+        self.ticks = 0
+        self._recent: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start ticking on the running loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._tick())
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_ms = max(0.0, (time.monotonic() - expected) * 1000)
+            self._recent.append(self.last_ms)
+            self.ticks += 1
+
+    @property
+    def max_ms(self) -> float:
+        return max(self._recent, default=0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"last_ms": round(self.last_ms, 2), "window_max_ms": round(self.max_ms, 2), "ticks": self.ticks}
+
+
+class ReadinessChecks:
+    """Named readiness checks on cheap counters, each against an optional limit
+
+    A check returns its current value: a number compared with the limit of
+    the same name from config/readiness.json (null = report only), or a
+    bool that must be True. A check with no value yet (None) is reported
+    but does not fail. Checks must not do I/O proportional to the data.
+    """
+
+    def __init__(self, limits: Dict[str, Optional[float]]):
+        self.limits = limits
+        self._checks: Dict[str, Callable[[], Any]] = {}
+
+    def add(self, name: str, measure: Callable[[], Any]):
+        self._checks[name] = measure
+
+    def evaluate(self) -> Dict[str, Any]:
+        checks = {}
+        for name, measure in self._checks.items():
+            try:
+                value = measure()
+            except Exception as e:
+                checks[name] = {"value": None, "ok": False, "error": str(e)}
+                continue
+            limit = self.limits.get(name)
+            if isinstance(value, bool):
+                ok = value
+            elif value is None or limit is None:
+                ok = True
+            else:
+                ok = value <= limit
+            checks[name] = {"value": round(value, 3) if isinstance(value, float) else value,
+                            "limit": limit, "ok": ok}
+        return {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+
+
+def load_readiness_config(path: str = READINESS_PATH) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,267 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.utils.trends import event_time
+
+BLOCK_SIZE = 1024
+# Blocks start small and double up to BLOCK_SIZE, so idle drivers stay cheap
+INITIAL_CAPACITY = 16
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+# (tier, bucket ms, age in ms after which full blocks roll up into the next tier)
+TIERS = (
+    ("raw", 0, 6 * HOUR_MS),
+    ("1m", MINUTE_MS, 7 * DAY_MS),
+    ("1h", HOUR_MS, 90 * DAY_MS),
+    ("1d", DAY_MS, None),
+)
+
+
+def rollup(ts: np.ndarray, mean: np.ndarray, low: np.ndarray, high: np.ndarray,
+           count: np.ndarray, bucket_ms: int) -> Tuple[np.ndarray, ...]:
+    """Merge time-sorted points into `bucket_ms` buckets (count-weighted mean)"""
+    keys = ts - ts % bucket_ms
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.add.reduceat(count, starts)
+    totals = np.add.reduceat(mean.astype(np.float64) * count, starts)
+    return (keys[starts], (totals / counts).astype(np.float32),
+            np.minimum.reduceat(low, starts), np.maximum.reduceat(high, starts),
+            counts.astype(np.int32))
+
+
+STEP_UNITS = {"s": 1000, "m": MINUTE_MS, "h": HOUR_MS, "d": DAY_MS}
+
+
+def parse_time_ms(value: str) -> int:
+    """Epoch milliseconds from "1700000000000" or an ISO timestamp"""
+    if value.lstrip("-").isdigit():
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    except ValueError:
+        raise ValueError(f"invalid time '{value}' (use epoch ms or ISO 8601)")
+
+
+def parse_step_ms(value: str) -> int:
+    """Bucket size from "60000" (ms), "5m", "1h" or "1d" (s/m/h/d units)"""
+    if value.isdigit():
+        step = int(value)
+    elif value[:-1].isdigit() and value[-1:] in STEP_UNITS:
+        step = int(value[:-1]) * STEP_UNITS[value[-1]]
+    else:
+        raise ValueError(f"invalid step '{value}' (use ms or e.g. 1m, 1h, 1d)")
+    if step <= 0:
+        raise ValueError("step must be positive")
+    return step
+
+
+class _Block:
+    """Fixed-capacity columns: int64 epoch ms + float32 value (+ min/max/count for rollups)"""
+
+    __slots__ = ("ts", "mean", "low", "high", "count", "size")
+
+    def __init__(self, capacity: int, rollup: bool):
+        self.ts = np.empty(capacity, np.int64)
+        self.mean = np.empty(capacity, np.float32)
+        self.low = np.empty(capacity, np.float32) if rollup else None
+        self.high = np.empty(capacity, np.float32) if rollup else None
+        self.count = np.empty(capacity, np.int32) if rollup else None
+        self.size = 0
+
+    @property
+    def columns(self) -> List[str]:
+        return ["ts", "mean"] if self.low is None else ["ts", "mean", "low", "high", "count"]
+
+    def grow(self, capacity: int):
+        for name in self.columns:
+            column = getattr(self, name)
+            grown = np.empty(capacity, column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        """(ts, mean, low, high, count) slices; raw points are their own min/max"""
+        stop = self.size if stop is None else stop
+        ts, mean = self.ts[start:stop], self.mean[start:stop]
+        if self.low is None:
+            return ts, mean, mean, mean, np.ones(len(ts), np.int32)
+        return ts, mean, self.low[start:stop], self.high[start:stop], self.count[start:stop]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.columns)
+
+
+class _Series:
+    """One resolution tier of one driver: a list of time-ordered blocks"""
+
+    def __init__(self, rollup: bool, block_size: int):
+        self.rollup = rollup
+        self.block_size = block_size
+        self.blocks: List[_Block] = []
+
+    def _tail(self) -> _Block:
+        block = self.blocks[-1] if self.blocks else None
+        if block is None or block.size == self.block_size:
+            block = _Block(min(INITIAL_CAPACITY, self.block_size), self.rollup)
+            self.blocks.append(block)
+        elif block.size == len(block.ts):
+            block.grow(min(2 * len(block.ts), self.block_size))
+        return block
+
+    def append(self, ts: int, value: float):
+        block = self._tail()
+        block.ts[block.size] = ts
+        block.mean[block.size] = value
+        block.size += 1
+
+    def extend(self, ts, mean, low, high, count):
+        """Append rolled-up buckets, merging one that continues the last bucket"""
+        if self.blocks and self.blocks[-1].size and len(ts) and self.blocks[-1].ts[self.blocks[-1].size - 1] == ts[0]:
+            last, i = self.blocks[-1], self.blocks[-1].size - 1
+            total = int(last.count[i]) + int(count[0])
+            last.mean[i] = (float(last.mean[i]) * int(last.count[i]) + float(mean[0]) * int(count[0])) / total
+            last.low[i] = min(last.low[i], low[0])
+            last.high[i] = max(last.high[i], high[0])
+            last.count[i] = total
+            ts, mean, low, high, count = ts[1:], mean[1:], low[1:], high[1:], count[1:]
+        done = 0
+        while done < len(ts):
+            block = self._tail()
+            take = min(len(block.ts) - block.size, len(ts) - done)
+            end = block.size + take
+            for name, values in zip(block.columns, (ts, mean, low, high, count)):
+                getattr(block, name)[block.size:end] = values[done:done + take]
+            block.size = end
+            done += take
+
+    def slice(self, start_ms: int, end_ms: int) -> List[Tuple[np.ndarray, ...]]:
+        """Column slices with start_ms <= ts < end_ms, via binary search per block"""
+        parts = []
+        for block in self.blocks:
+            if not block.size or block.ts[block.size - 1] < start_ms or block.ts[0] >= end_ms:
+                continue
+            ts = block.ts[:block.size]
+            lo, hi = np.searchsorted(ts, start_ms, "left"), np.searchsorted(ts, end_ms, "left")
+            if hi > lo:
+                parts.append(block.view(lo, hi))
+        return parts
+
+    @property
+    def points(self) -> int:
+        return sum(block.size for block in self.blocks)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self.blocks)
+
+
+class ScoreHistory:
+    """Per-driver score time series in numpy blocks, downsampled as it ages
+
+    Raw readings (int64 epoch ms, float32 score) are kept for 6 hours, then
+    whole blocks are rolled up to 1-minute buckets (mean/min/max/count),
+    those to 1-hour buckets after 7 days and to 1-day buckets after 90 days.
+    Queries binary-search each block and resample with numpy reductions.
+    """
+
+    def __init__(self, field: str = "safety_score", tiers=TIERS, block_size: int = BLOCK_SIZE):
+        self.field = field
+        self.tiers = tiers
+        self.block_size = block_size
+        self._drivers: Dict[str, List[_Series]] = {}
+        self._latest: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.late_dropped = 0
+
+    def apply_changes(self, upserts: List[Tuple[str, Dict[str, Any]]], deletes: List[str]):
+        """Stream store listener: record every changed driver score"""
+        for _, record in upserts:
+            driver_id = record.get("driver_id")
+            value = record.get(self.field)
+            if driver_id and isinstance(value, (int, float)) and not record.get("canary"):
+                at = event_time(record)
+                self.record(str(driver_id), float(value), None if at is None else int(at * 1000))
+
+    def record(self, driver_id: str, value: float, ts_ms: Optional[int] = None):
+        """Append one reading; readings older than the driver's latest are dropped"""
+        if ts_ms is None:
+            ts_ms = int(time.time() * 1000)
+        with self._lock:
+            series = self._drivers.get(driver_id)
+            if series is None:
+                series = self._drivers[driver_id] = [_Series(i > 0, self.block_size) for i in range(len(self.tiers))]
+            elif ts_ms <= self._latest[driver_id]:
+                self.late_dropped += ts_ms < self._latest[driver_id]
+                return
+            self._latest[driver_id] = ts_ms
+            series[0].append(ts_ms, value)
+            self._age(series, ts_ms)
+
+    def _age(self, series: List[_Series], now_ms: int):
+        """Roll full blocks past their tier's age into the next tier"""
+        for i, (_, _, max_age) in enumerate(self.tiers[:-1]):
+            blocks = series[i].blocks
+            while (len(blocks) > 1 and blocks[0].size == self.block_size
+                   and blocks[0].ts[blocks[0].size - 1] < now_ms - max_age):
+                block = blocks.pop(0)
+                series[i + 1].extend(*rollup(*block.view(), self.tiers[i + 1][1]))
+
+    def history(self, driver_id: str, start_ms: int, end_ms: int,
+                step_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Points in [start_ms, end_ms), optionally resampled to `step_ms` buckets"""
+        with self._lock:
+            series = self._drivers.get(driver_id)
+            if series is None:
+                return None
+            slices = [(name, tier.slice(start_ms, end_ms)) for (name, _, _), tier in zip(self.tiers, series)]
+        resolutions = [name for name, tier_parts in slices if tier_parts]
+        # Coarse tiers hold the oldest data: concatenating them in reverse keeps time order
+        parts = [part for _, tier_parts in reversed(slices) for part in tier_parts]
+        if parts:
+            columns = [np.concatenate([part[i] for part in parts]) for i in range(5)]
+        else:
+            columns = [np.empty(0, np.int64)] + [np.empty(0, np.float32)] * 3 + [np.empty(0, np.int32)]
+        if step_ms and len(columns[0]):
+            columns = rollup(*columns, step_ms)
+        ts, mean, low, high, count = columns
+        return {
+            "driver_id": driver_id,
+            "from": start_ms,
+            "to": end_ms,
+            "step_ms": step_ms,
+            "resolutions": resolutions,
+            "points": len(ts),
+            "timestamps": ts.tolist(),
+            "mean": np.round(mean.astype(np.float64), 3).tolist(),
+            "min": np.round(low.astype(np.float64), 3).tolist(),
+            "max": np.round(high.astype(np.float64), 3).tolist(),
+            "count": count.tolist(),
+        }
+
+    def driver_bytes(self, driver_id: str) -> int:
+        with self._lock:
+            return sum(tier.nbytes for tier in self._drivers.get(driver_id, []))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            points = {name: 0 for name, _, _ in self.tiers}
+            total = 0
+            for series in self._drivers.values():
+                for (name, _, _), tier in zip(self.tiers, series):
+                    points[name] += tier.points
+                    total += tier.nbytes
+        return {
+            "drivers": len(self._drivers),
+            "points": points,
+            "bytes": total,
+            "bytes_per_driver": round(total / len(self._drivers)) if self._drivers else 0,
+            "late_dropped": self.late_dropped,
+        }
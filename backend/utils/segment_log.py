@@ -0,0 +1,282 @@
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.utils.state_snapshot import write_snapshot, SnapshotReader
+
+MANIFEST_NAME = "manifest.json"
+
+
+class SegmentWriter:
+    """Append-only JSON-lines log split into rolling segments
+
+    `manifest.json` lists every live segment with its record offsets, time
+    range and a sparse (time, byte offset) index, so readers can seek to the
+    rows they need instead of scanning the whole directory. Old segments are
+    dropped once the log exceeds `retention_bytes` or `retention_seconds`.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 4 * 1024 * 1024,
+                 max_segment_seconds: float = 300.0, retention_bytes: Optional[int] = 256 * 1024 * 1024,
+                 retention_seconds: Optional[float] = 24 * 3600, index_interval: int = 256):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.index_interval = index_interval
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._file = None
+        self._active: Optional[Dict[str, Any]] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._load_manifest()
+        # Never append to a segment left behind by a previous process
+        for segment in self.manifest["segments"]:
+            segment["closed"] = True
+        self._apply_retention()
+
+    def append(self, record: Dict[str, Any], time_ms: int):
+        """Append one record stamped with `time_ms` (must be non-decreasing)"""
+        line = (json.dumps({**record, "time": time_ms}, default=_json_default) + "\n").encode()
+        with self._lock:
+            if self._active is None:
+                self._open_segment(time_ms)
+            segment = self._active
+            if segment["count"] % self.index_interval == 0:
+                segment["index"].append([time_ms, segment["bytes"]])
+            self._file.write(line)
+            segment["bytes"] += len(line)
+            segment["count"] += 1
+            segment["last_offset"] = self.manifest["next_offset"]
+            segment["end_time"] = time_ms
+            self.manifest["next_offset"] += 1
+
+    def flush(self):
+        """Make appended records visible to readers; roll or expire segments"""
+        with self._lock:
+            if self._active is None:
+                return
+            self._file.flush()
+            segment = self._active
+            if (segment["bytes"] >= self.max_segment_bytes
+                    or time.time() - segment["opened_at"] >= self.max_segment_seconds):
+                self._close_segment()
+                self._apply_retention()
+            write_snapshot(self.manifest_path, self.manifest)
+
+    def close(self):
+        with self._lock:
+            if self._active is not None:
+                self._close_segment()
+            self._apply_retention()
+            write_snapshot(self.manifest_path, self.manifest)
+
+    def truncate_before(self, offset: int):
+        """Delete closed segments that only hold records before `offset` (e.g. after compaction)"""
+        with self._lock:
+            segments = self.manifest["segments"]
+            while segments and segments[0].get("closed") and segments[0]["last_offset"] < offset:
+                try:
+                    os.remove(os.path.join(self.directory, segments[0]["file"]))
+                except OSError:
+                    pass
+                segments.pop(0)
+            write_snapshot(self.manifest_path, self.manifest)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"next_offset": 0, "index_interval": self.index_interval, "segments": []}
+        manifest["index_interval"] = self.index_interval
+        # Drop entries whose files were removed by hand
+        manifest["segments"] = [s for s in manifest.get("segments", [])
+                                if os.path.exists(os.path.join(self.directory, s["file"]))]
+        return manifest
+
+    def _open_segment(self, time_ms: int):
+        offset = self.manifest["next_offset"]
+        segment = {
+            "file": f"segment-{offset:012d}.jsonl",
+            "first_offset": offset,
+            "last_offset": offset - 1,
+            "count": 0,
+            "bytes": 0,
+            "start_time": time_ms,
+            "end_time": time_ms,
+            "opened_at": time.time(),
+            "closed": False,
+            "index": [],
+        }
+        self._file = open(os.path.join(self.directory, segment["file"]), 'ab')
+        self._active = segment
+        self.manifest["segments"].append(segment)
+
+    def _close_segment(self):
+        self._file.close()
+        self._file = None
+        self._active["closed"] = True
+        self._active["closed_at"] = time.time()
+        self._active = None
+
+    def _apply_retention(self):
+        """Delete the oldest closed segments beyond the size/age budget"""
+        segments = self.manifest["segments"]
+        total = sum(s["bytes"] for s in segments)
+        now = time.time()
+        while segments and segments[0].get("closed"):
+            oldest = segments[0]
+            expired = (self.retention_seconds is not None
+                       and now - oldest.get("closed_at", oldest["opened_at"]) > self.retention_seconds)
+            if (self.retention_bytes is None or total <= self.retention_bytes) and not expired:
+                break
+            try:
+                os.remove(os.path.join(self.directory, oldest["file"]))
+            except OSError:
+                pass
+            total -= oldest["bytes"]
+            segments.pop(0)
+
+
+class SegmentReader:
+    """Reads a segment log through its manifest, touching only the tail it needs"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._manifest = SnapshotReader(os.path.join(directory, MANIFEST_NAME))
+
+    def segments(self) -> List[Dict[str, Any]]:
+        manifest = self._manifest.read()
+        return manifest["segments"] if manifest else []
+
+    def read(self, since: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Records with time > `since` (oldest first), or the newest `limit` records"""
+        segments = self.segments()
+        if since is None:
+            return self._tail(segments, limit)
+
+        # Segments are time-ordered: skip everything that ends at or before `since`
+        ends = [segment["end_time"] for segment in segments]
+        start = bisect.bisect_right(ends, since)
+        results: List[Dict[str, Any]] = []
+        for segment in segments[start:]:
+            index = segment.get("index") or [[segment["start_time"], 0]]
+            position = bisect.bisect_left([t for t, _ in index], since)
+            byte_offset = index[max(0, position - 1)][1]
+            for record in self._read_from(segment, byte_offset):
+                if record.get("time", 0) <= since:
+                    continue
+                # Never split a commit: the next page resumes after its time
+                if len(results) >= limit and record.get("time") != results[-1].get("time"):
+                    return results
+                results.append(record)
+        return results
+
+    def follow(self, offset: int = 0, limit: int = 10000) -> Tuple[List[Dict[str, Any]], int]:
+        """Published records from log offset `offset` on -> (records, next offset)
+
+        Only records covered by the manifest are returned, so a consumer
+        tailing a live log never sees half-flushed commits.
+        """
+        manifest = self._manifest.read() or {}
+        interval = max(1, manifest.get("index_interval", 256))
+        results: List[Dict[str, Any]] = []
+        for segment in manifest.get("segments", []):
+            end = segment["first_offset"] + segment["count"]
+            if end <= offset:
+                continue
+            # Records expired by retention are skipped
+            offset = max(offset, segment["first_offset"])
+            # Index points are taken every `interval` records of the segment
+            index = segment.get("index") or [[segment["start_time"], 0]]
+            point = min((offset - segment["first_offset"]) // interval, len(index) - 1)
+            skip = offset - segment["first_offset"] - point * interval
+            for position, record in enumerate(self._read_from(segment, index[point][1])):
+                if position < skip:
+                    continue
+                if offset >= end or len(results) >= limit:
+                    break
+                results.append(record)
+                offset += 1
+            if len(results) >= limit:
+                break
+        return results, offset
+
+    def scan(self):
+        """Every retained record, oldest first (used to replay the log on start-up)"""
+        for segment in self.segments():
+            yield from self._read_from(segment, 0)
+
+    def _tail(self, segments: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        manifest = self._manifest.read() or {}
+        interval = max(1, manifest.get("index_interval", 256))
+        results: List[Dict[str, Any]] = []
+        for segment in reversed(segments):
+            needed = limit - len(results)
+            if needed <= 0:
+                break
+            index = segment.get("index") or [[segment["start_time"], 0]]
+            # Start from the last index point that still leaves `needed` rows
+            points_back = needed // interval + 2
+            byte_offset = index[max(0, len(index) - points_back)][1]
+            records = list(self._read_from(segment, byte_offset))
+            if len(records) < needed and byte_offset > 0:
+                records = list(self._read_from(segment, 0))
+            results = records[-needed:] + results
+        return results
+
+    def _read_from(self, segment: Dict[str, Any], byte_offset: int):
+        path = os.path.join(self.directory, segment["file"])
+        try:
+            with open(path, 'rb') as f:
+                f.seek(byte_offset)
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Trailing line still being written
+                        continue
+        except OSError:
+            return
+
+
+def _json_default(value: Any):
+    # pw.Json values expose the decoded payload as `.value`
+    return value.value if hasattr(value, "value") else str(value)
+
+
+_readers: Dict[str, SegmentReader] = {}
+
+
+def discover_logs(root: str = "./data/processed") -> Dict[str, SegmentReader]:
+    """Segment logs below `root`, keyed by directory name (one glob per sink, not per file)"""
+    logs = {}
+    for path in sorted(glob.glob(os.path.join(root, "*", MANIFEST_NAME))):
+        directory = os.path.dirname(path)
+        if directory not in _readers:
+            _readers[directory] = SegmentReader(directory)
+        logs[os.path.basename(directory)] = _readers[directory]
+    return logs
+
+
+def merge_results(logs: Dict[str, SegmentReader], since: Optional[int] = None,
+                  limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Time-ordered records across several logs plus the `since` cursor for the next page"""
+    rows = []
+    for name, reader in logs.items():
+        rows.extend({**record, "sink": name} for record in reader.read(since, limit))
+    rows.sort(key=lambda record: record.get("time", 0))
+    if since is None:
+        rows = rows[-limit:]
+    elif len(rows) > limit:
+        cutoff = rows[limit - 1].get("time")
+        rows = [record for record in rows if record.get("time", 0) <= cutoff]
+    next_since = rows[-1].get("time") if rows else since
+    return rows, next_since
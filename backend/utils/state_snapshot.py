@@ -0,0 +1,57 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from backend.utils.latency import LagHistogram
+
+DEFAULT_SNAPSHOT_PATH = os.getenv("STATE_SNAPSHOT_PATH", "./data/state/aggregates.json")
+
+
+def write_snapshot(path: str, data: Any):
+    """Atomically replace a JSON snapshot (readers never see half a file)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """Reads a JSON snapshot, re-parsing only when the file changes"""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        self._signature = None
+        self._data: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        # Snapshot write (sink) -> first API read of it
+        self.visibility_lag = LagHistogram()
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Latest snapshot, or None if the pipeline has not published one"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    with open(self.path, 'r') as f:
+                        self._data = json.load(f)
+                    if self._signature is not None:
+                        self.visibility_lag.observe((time.time() - stat.st_mtime) * 1000)
+                    self._signature = signature
+                except (OSError, ValueError):
+                    return self._data
+            return self._data
+
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the snapshot file was last written"""
+        try:
+            return round(time.time() - os.stat(self.path).st_mtime, 3)
+        except OSError:
+            return None
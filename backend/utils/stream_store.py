@@ -0,0 +1,204 @@
+import json
+import os
+import glob
+import threading
+import time
+from typing import Dict, Any, List, Tuple, Callable
+
+from backend.utils.latency import LagHistogram
+
+# Fields that identify a logistics entity inside a stream record
+ENTITY_ID_FIELDS = ("driver_id", "shipment_id", "invoice_id", "vehicle_id")
+
+Change = Tuple[List[Tuple[str, Dict[str, Any]]], List[str]]
+
+
+def entity_id(record: Dict[str, Any]) -> str:
+    """Return the entity id of a stream record ("" if it has none)"""
+    for field in ENTITY_ID_FIELDS:
+        value = record.get(field)
+        if value:
+            return str(value)
+    return ""
+
+
+def entity_type(record: Dict[str, Any]) -> str:
+    """Classify a stream record as driver / shipment / invoice / vehicle"""
+    for field in ENTITY_ID_FIELDS:
+        if record.get(field):
+            return field[:-3]
+    return "unknown"
+
+
+class LiveStreamStore:
+    """Incrementally maintained view of the JSON files in data/streams
+
+    Files are re-parsed only when their (mtime, size) signature changes and
+    listeners receive record-level upserts/deletes instead of full reloads.
+    """
+
+    def __init__(self, stream_dir: str = './data/streams', pattern: str = '*.json',
+                 min_refresh_interval: float = 0.25):
+        self.stream_dir = stream_dir
+        self.pattern = pattern
+        self.min_refresh_interval = min_refresh_interval
+        self.version = 0
+        self.last_change_at = 0.0
+        # Maintained by refresh(), so health checks never walk the file table
+        self.file_count = 0
+        # File write -> visible to API readers of this store
+        self.visibility_lag = LagHistogram()
+        self.canary: Dict[str, Any] = {}
+        self._started_at = time.time()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        # Files whose records reach the store another way (see exclude)
+        self._excluded: set = set()
+        self._listeners: List[Callable[[List[Tuple[str, Dict[str, Any]]], List[str]], None]] = []
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+
+    def subscribe(self, listener: Callable[[List[Tuple[str, Dict[str, Any]]], List[str]], None]):
+        """Register a change listener and replay the current records to it"""
+        with self._lock:
+            self._listeners.append(listener)
+            current = [(key, record) for entry in self._files.values()
+                       for key, record in entry['records'].items()]
+            if current:
+                listener(current, [])
+
+    def refresh(self, force: bool = False) -> bool:
+        """Pick up changed files; returns True when any record changed"""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.min_refresh_interval:
+            return False
+
+        with self._lock:
+            self._last_refresh = now
+            upserts: List[Tuple[str, Dict[str, Any]]] = []
+            deletes: List[str] = []
+            seen = set()
+
+            for file_path in glob.glob(os.path.join(self.stream_dir, self.pattern)):
+                if os.path.abspath(file_path) in self._excluded:
+                    continue
+                seen.add(file_path)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                entry = self._files.get(file_path)
+                if entry and entry['signature'] == signature:
+                    continue
+
+                try:
+                    with open(file_path, 'r') as f:
+                        data = json.load(f)
+                except Exception:
+                    # Half-written file: retry on the next refresh
+                    continue
+
+                if stat.st_mtime >= self._started_at:
+                    self.visibility_lag.observe((time.time() - stat.st_mtime) * 1000)
+
+                old_records = entry['records'] if entry else {}
+                new_records = self._key_records(file_path, data)
+                for record in new_records.values():
+                    if record.get('canary'):
+                        self.canary = {
+                            'seq': record.get('canary_seq'),
+                            'written_at': stat.st_mtime,
+                            'visible_at': time.time(),
+                        }
+                for key, record in new_records.items():
+                    if old_records.get(key) != record:
+                        upserts.append((key, record))
+                deletes.extend(key for key in old_records if key not in new_records)
+
+                self._files[file_path] = {
+                    'signature': signature,
+                    'records': new_records,
+                    'is_list': isinstance(data, list),
+                }
+
+            for file_path in [p for p, entry in self._files.items()
+                              if p not in seen and entry['signature'] is not None]:
+                deletes.extend(self._files.pop(file_path)['records'].keys())
+            self.file_count = sum(1 for entry in self._files.values() if entry['signature'] is not None)
+
+            if not upserts and not deletes:
+                return False
+
+            self._notify(upserts, deletes)
+            return True
+
+    def _notify(self, upserts: List[Tuple[str, Dict[str, Any]]], deletes: List[str]):
+        self.version += 1
+        self.last_change_at = time.time()
+        for listener in self._listeners:
+            try:
+                listener(upserts, deletes)
+            except Exception as e:
+                print(f"⚠️ Stream listener error: {e}")
+
+    def exclude(self, path: str):
+        """Stop reading a stream file (and drop its records) whose records arrive via apply_external"""
+        with self._lock:
+            self._excluded.add(os.path.abspath(path))
+            dropped = [p for p in self._files if os.path.abspath(p) in self._excluded]
+            deletes = [key for p in dropped for key in self._files.pop(p)['records']]
+            self.file_count = sum(1 for entry in self._files.values() if entry['signature'] is not None)
+            if deletes:
+                self._notify([], deletes)
+
+    def apply_external(self, source: str, upserts: List[Dict[str, Any]], deleted_ids: List[str] = ()):
+        """Merge records that did not come from a stream file (e.g. direct API ingest)"""
+        with self._lock:
+            entry = self._files.setdefault(source, {'signature': None, 'records': {}, 'is_list': True})
+            changed = []
+            for record in upserts:
+                key = f"{source}::{entity_id(record)}"
+                entry['records'][key] = record
+                changed.append((key, record))
+            deletes = [f"{source}::{record_id}" for record_id in deleted_ids
+                       if entry['records'].pop(f"{source}::{record_id}", None) is not None]
+            if not changed and not deletes:
+                return
+
+            self._notify(changed, deletes)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All list records plus single-record files that describe a driver"""
+        with self._lock:
+            result = []
+            for entry in self._files.values():
+                for record in entry['records'].values():
+                    if record.get('canary'):
+                        continue
+                    if entry['is_list'] or 'driver_id' in record or 'name' in record:
+                        result.append(record)
+            return result
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """Look up a record by its store key"""
+        file_path, _, _ = key.partition('::')
+        entry = self._files.get(file_path)
+        return entry['records'].get(key) if entry else None
+
+    @staticmethod
+    def _key_records(file_path: str, data: Any) -> Dict[str, Dict[str, Any]]:
+        """Give every record a stable key so unchanged records are not re-emitted"""
+        items = data if isinstance(data, list) else [data]
+        keyed = {}
+        for i, record in enumerate(items):
+            if not isinstance(record, dict):
+                continue
+            key = f"{file_path}::{entity_id(record) or '#' + str(i)}"
+            if key in keyed:
+                key = f"{file_path}::#{i}"
+            keyed[key] = record
+        return keyed
+
+
+# Global instance
+live_stream_store = LiveStreamStore()
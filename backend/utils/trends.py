@@ -0,0 +1,165 @@
+import math
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# name -> (window seconds, ring slots); the window slides one slot at a time
+DEFAULT_WINDOWS = {"1h": (3600, 12), "24h": (86400, 24)}
+
+# Per slot: slot number, count, sum, min, sum_t, sum_tt, sum_ty (t in hours)
+SLOT_FIELDS = 7
+# Per driver header: last event time and value (duplicate suppression)
+HEADER = 2
+
+
+def event_time(record: Dict[str, Any]) -> Optional[float]:
+    """Epoch seconds from a record's `timestamp`/`last_update` (ISO or epoch)"""
+    for field in ("timestamp", "last_update"):
+        value = record.get(field)
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str) and value:
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                continue
+    return None
+
+
+class DriverTrends:
+    """Sliding-window min / mean / slope of a driver metric, per driver
+
+    Every driver owns one fixed-size array of time buckets per window, so
+    memory is bounded per driver no matter how many events arrive, and an
+    event only updates the bucket it falls into (O(1)). Buckets that slid
+    out of the window are recycled; queries combine the live buckets. The
+    least-squares slope comes from the bucket sums (score units per hour).
+    """
+
+    def __init__(self, windows: Dict[str, Tuple[int, int]] = None, field: str = "safety_score"):
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.field = field
+        # Offset of every window inside a driver's array
+        self._layout = []
+        offset = HEADER
+        for name, (seconds, slots) in self.windows.items():
+            self._layout.append((name, seconds / slots, slots, offset))
+            offset += slots * SLOT_FIELDS
+        self._size = offset
+        self._origin = time.time()
+        self._drivers: Dict[str, array] = {}
+        self._lock = threading.Lock()
+        self.events = 0
+        self.dropped = 0
+
+    def apply_changes(self, upserts: List[Tuple[str, Dict[str, Any]]], deletes: List[str]):
+        """Stream store listener: feed every changed driver record"""
+        for _, record in upserts:
+            driver_id = record.get("driver_id")
+            value = record.get(self.field)
+            if driver_id and isinstance(value, (int, float)) and not record.get("canary"):
+                self.observe(str(driver_id), float(value), event_time(record))
+
+    def observe(self, driver_id: str, value: float, at: Optional[float] = None):
+        """Add one reading (at = epoch seconds, default now)"""
+        at = time.time() if at is None else at
+        t = (at - self._origin) / 3600
+        with self._lock:
+            data = self._drivers.get(driver_id)
+            if data is None:
+                data = self._drivers[driver_id] = self._empty()
+            elif data[0] == at and data[1] == value:
+                # The same reading seen again (e.g. a file re-emitted)
+                return
+            if at >= data[0]:
+                data[0], data[1] = at, value
+            self.events += 1
+
+            late = False
+            for _, slot_seconds, slots, offset in self._layout:
+                slot = at // slot_seconds
+                base = offset + int(slot % slots) * SLOT_FIELDS
+                if data[base] != slot:
+                    if data[base] > slot:
+                        # Older than anything this ring still holds
+                        late = True
+                        continue
+                    data[base:base + SLOT_FIELDS] = array("d", (slot, 0.0, 0.0, math.inf, 0.0, 0.0, 0.0))
+                data[base + 1] += 1
+                data[base + 2] += value
+                data[base + 3] = min(data[base + 3], value)
+                data[base + 4] += t
+                data[base + 5] += t * t
+                data[base + 6] += t * value
+            self.dropped += late
+
+    def trends(self, driver_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """min / mean / slope per window for one driver (None if never seen)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            data = self._drivers.get(driver_id)
+            if data is None:
+                return None
+            result = {"driver_id": driver_id, "latest": round(data[1], 3),
+                      "latest_at": datetime.fromtimestamp(data[0]).isoformat()}
+            for name, slot_seconds, slots, offset in self._layout:
+                result[name] = self._window(data, now // slot_seconds, slots, offset)
+        return result
+
+    def deteriorating(self, window: str = "24h", limit: int = 20, min_events: int = 3,
+                      now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Drivers with the steepest falling score over `window`"""
+        now = time.time() if now is None else now
+        name, slot_seconds, slots, offset = next(layout for layout in self._layout if layout[0] == window)
+        current = now // slot_seconds
+        with self._lock:
+            rows = []
+            for driver_id, data in self._drivers.items():
+                stats = self._window(data, current, slots, offset)
+                if stats["count"] >= min_events and stats["slope_per_hour"] < 0:
+                    rows.append({"driver_id": driver_id, "latest": round(data[1], 3), name: stats})
+        rows.sort(key=lambda row: row[name]["slope_per_hour"])
+        return rows[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "drivers": len(self._drivers),
+            "events": self.events,
+            "dropped_late_events": self.dropped,
+            "windows": {name: {"seconds": seconds, "slots": slots} for name, (seconds, slots) in self.windows.items()},
+            "bytes_per_driver": self._size * 8,
+        }
+
+    def _empty(self) -> array:
+        data = array("d", [0.0]) * self._size
+        data[0] = -math.inf
+        for _, _, slots, offset in self._layout:
+            for i in range(slots):
+                data[offset + i * SLOT_FIELDS] = -math.inf
+        return data
+
+    @staticmethod
+    def _window(data: array, current: float, slots: int, offset: int) -> Dict[str, Any]:
+        n = total = sum_t = sum_tt = sum_ty = 0.0
+        low = math.inf
+        for i in range(slots):
+            base = offset + i * SLOT_FIELDS
+            if current - slots < data[base] <= current:
+                n += data[base + 1]
+                total += data[base + 2]
+                low = min(low, data[base + 3])
+                sum_t += data[base + 4]
+                sum_tt += data[base + 5]
+                sum_ty += data[base + 6]
+        if not n:
+            return {"count": 0, "min": None, "mean": None, "slope_per_hour": 0.0}
+        spread = n * sum_tt - sum_t * sum_t
+        slope = (n * sum_ty - sum_t * total) / spread if n > 1 and spread > 1e-12 else 0.0
+        return {
+            "count": int(n),
+            "min": round(low, 3),
+            "mean": round(total / n, 3),
+            "slope_per_hour": round(slope, 4),
+        }
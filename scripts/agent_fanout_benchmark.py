@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from scripts.mcp_cache_benchmark import percentile, wait_ready, write_streams
+
+QUERIES = {
+    "single intent": "which drivers have safety issues",
+    "two intents": "risky drivers and overdue invoices",
+    "three intents": "driver safety, invoice compliance and fraud anomalies",
+}
+SINGLE_INTENT_QUERIES = {"safety": "driver safety", "compliance": "invoice compliance", "fraud": "fraud"}
+
+
+async def run_graph(agent, query: str) -> dict:
+    """One workflow run, bypassing the answer cache"""
+    return await agent.app.ainvoke({"messages": [{"role": "user", "content": query}], "intents": [],
+                                    "live_data": {}, "analyses": {}})
+
+
+async def measure(agent, query: str, runs: int, one_intent_at_a_time: bool) -> dict:
+    from backend.agents.langgraph_agents import INTENTS
+    from backend.utils.intent_router import intent_router
+
+    # The previous graph answered one intent per question: N intents meant N runs
+    intents = [intent for intent in INTENTS if intent_router.route(query).has(intent)]
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        if one_intent_at_a_time:
+            for intent in intents:
+                await run_graph(agent, SINGLE_INTENT_QUERIES[intent])
+        else:
+            state = await run_graph(agent, query)
+            assert len(state["analyses"]) == len(intents), state["analyses"].keys()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def run(runs: int):
+    from backend.agents.langgraph_agents import logistics_agents
+
+    logistics_agents.get()  # graph is built lazily; keep that out of the timings
+    for name, query in QUERIES.items():
+        result = {"query": name, "text": query,
+                  "fan_out": await measure(logistics_agents, query, runs, False)}
+        if name != "single intent":
+            result["one_intent_at_a_time"] = await measure(logistics_agents, query, runs, True)
+        print(json.dumps(result), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LangGraph per-query latency for single- and multi-intent questions")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--mcp-latency-ms", type=float, default=20.0, help="simulated MCP round-trip latency")
+    parser.add_argument("--port", type=int, default=8135)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="intelliflow_agents_")
+    shutil.copytree("config", os.path.join(workdir, "config"))
+    write_streams(workdir, 1000, 100)
+    server = subprocess.Popen([sys.executable, "-m", "scripts.mcp_cache_benchmark", "--serve", "--port",
+                               str(args.port), "--latency-ms", str(args.mcp_latency_ms)],
+                              cwd=workdir, env={**os.environ, "PYTHONPATH": os.getcwd()})
+    # Agents read MCP_URL at import; notifications off so only the workflow is timed
+    os.environ["MCP_URL"] = f"http://127.0.0.1:{args.port}"
+    for destination in ("SUPERVISORS", "FINANCE", "SECURITY"):
+        os.environ[f"NOTIFY_{destination}_URL"] = ""
+    try:
+        asyncio.run(wait_ready(args.port))
+        print(f"📊 LangGraph workflow latency ({args.runs} runs, MCP latency {args.mcp_latency_ms} ms)")
+        asyncio.run(run(args.runs))
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scripts.mcp_cache_benchmark import percentile
+
+
+class FlakyMCP(ThreadingHTTPServer):
+    """Stub MCP server whose tool calls hang for `hang_seconds` while `outage` is set"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int, hang_seconds: float):
+        super().__init__(("127.0.0.1", port), FlakyHandler)
+        self.hang_seconds = hang_seconds
+        self.outage = threading.Event()
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out close the socket before the hung reply is written
+        pass
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # One buffered write per response (avoids Nagle / delayed-ACK stalls on keep-alive)
+    wbufsize = 1 << 16
+
+    def do_GET(self):
+        if self.server.outage.is_set():
+            time.sleep(self.server.hang_seconds)
+        body = json.dumps({"high_risk_count": 3, "overdue_invoices": 2, "due_today": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class NoBreakerClient:
+    """The previous behaviour: every query calls MCP and waits up to its timeout"""
+
+    def __init__(self):
+        from backend.utils.http_client import HttpClient
+
+        self.client = HttpClient(failure_threshold=10 ** 9)
+
+    def get_json_swr(self, url: str, max_stale: float = 0.0, **kwargs):
+        data = self.client.get_json(url, **kwargs)
+        return data, (0.0 if data is not None else None)
+
+
+def run_case(name: str, client, server: FlakyMCP, phases, workers: int, interval: float) -> dict:
+    """Agent queries from `workers` threads (one every `interval` s each) through healthy -> outage -> recovery"""
+    from backend.agents import working_agents as module
+
+    module.http_client = client
+    latencies = {phase: [] for phase, _ in phases}
+    current = {"phase": phases[0][0]}
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            phase = current["phase"]
+            started = time.perf_counter()
+            # route_query bypasses the answer cache: every query needs MCP data
+            module.working_agents.route_query("driver safety status")
+            elapsed = time.perf_counter() - started
+            latencies[phase].append(elapsed * 1000)
+            stop.wait(max(0.0, interval - elapsed))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for phase, seconds in phases:
+        current["phase"] = phase
+        if phase == "outage":
+            server.outage.set()
+        else:
+            server.outage.clear()
+        time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    result = {"case": name}
+    for phase, values in latencies.items():
+        result[phase] = {"queries": len(values), "p50_ms": round(percentile(values, 50), 2),
+                         "p99_ms": round(percentile(values, 99), 2), "max_ms": round(max(values, default=0), 2)}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent query latency during an injected MCP outage")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent agent query threads")
+    parser.add_argument("--healthy", type=float, default=3.0, help="seconds before the outage")
+    parser.add_argument("--outage", type=float, default=15.0, help="seconds of hanging MCP calls")
+    parser.add_argument("--recovery", type=float, default=8.0, help="seconds after the outage")
+    parser.add_argument("--interval-ms", type=float, default=20.0, help="pause between a worker's queries")
+    parser.add_argument("--port", type=int, default=8136)
+    args = parser.parse_args()
+
+    server = FlakyMCP(args.port, hang_seconds=10.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Agents read MCP_URL at import; notifications off so only MCP calls are timed
+    os.environ["MCP_URL"] = f"http://127.0.0.1:{args.port}"
+    for destination in ("SUPERVISORS", "FINANCE", "SECURITY"):
+        os.environ[f"NOTIFY_{destination}_URL"] = ""
+    from backend.utils.http_client import http_client
+
+    phases = [("healthy", args.healthy), ("outage", args.outage), ("recovery", args.recovery)]
+    print(f"📊 Agent latency with MCP hanging for {args.outage}s (2s agent timeout, {args.workers} workers)")
+    try:
+        for name, client in (("no breaker", NoBreakerClient()), ("breaker + stale-while-revalidate", http_client)):
+            print(json.dumps(run_case(name, client, server, phases, args.workers, args.interval_ms / 1000)),
+                  flush=True)
+        print(json.dumps({"http_client": http_client.stats()}))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import argparse
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save the embedding model locally so services load it without the hub")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--path", default="./models/all-MiniLM-L6-v2",
+                        help="model_path of the RAG profiles / HYBRID_VECTOR_MODEL_PATH")
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(os.path.dirname(args.path) or ".", exist_ok=True)
+    SentenceTransformer(args.model, device="cpu").save(args.path)
+    print(f"✅ {args.model} saved to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import time
+
+import requests
+
+from backend.utils.latency import LagHistogram
+
+
+def write_canary(stream_dir: str, seq: int) -> float:
+    """Atomically drop the canary record into the stream folder"""
+    path = os.path.join(stream_dir, "canary_probe.json")
+    # Temp file lives outside the watched folder so no reader sees it
+    tmp_path = os.path.join(os.path.dirname(os.path.abspath(stream_dir)), ".canary_probe.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            "driver_id": "D-CANARY",
+            "name": "Freshness Canary",
+            "canary": True,
+            "canary_seq": seq,
+            "timestamp": time.time()
+        }, f)
+    os.replace(tmp_path, path)
+    return os.stat(path).st_mtime
+
+
+def run_probe(api_url: str, stream_dir: str, interval: float, count: int, timeout: float,
+              poll_interval: float, report_every: int, check_pipeline: bool):
+    """Write canaries continuously and measure write -> visible round trips"""
+    histograms = {"api": LagHistogram(), "pipeline": LagHistogram()}
+    timeouts = 0
+    seq = int(time.time())
+    session = requests.Session()
+
+    print(f"🐤 Freshness probe: {stream_dir} → {api_url}/metrics/freshness")
+    probes = 0
+    while count <= 0 or probes < count:
+        seq += 1
+        probes += 1
+        written_at = write_canary(stream_dir, seq)
+        pending = {"api", "pipeline"} if check_pipeline else {"api"}
+        deadline = time.time() + timeout
+
+        while pending and time.time() < deadline:
+            try:
+                canary = session.get(f"{api_url}/metrics/freshness", timeout=2).json().get("canary", {})
+            except (requests.RequestException, ValueError):
+                canary = {}
+            for stage in list(pending):
+                if canary.get(stage, {}).get("seq") == seq:
+                    histograms[stage].observe((time.time() - written_at) * 1000)
+                    pending.discard(stage)
+            if pending:
+                time.sleep(poll_interval)
+
+        if pending:
+            timeouts += 1
+            print(f"⚠️ Canary {seq} not visible in {', '.join(sorted(pending))} after {timeout}s")
+
+        if probes % report_every == 0:
+            summary = {stage: histogram.to_dict() for stage, histogram in histograms.items()
+                       if histogram.count}
+            for stage, stats in summary.items():
+                print(f"📊 {stage:8} n={stats['count']:<5} p50={stats['p50_ms']}ms "
+                      f"p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms")
+            print(f"   timeouts: {timeouts}")
+
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Continuous canary freshness probe")
+    parser.add_argument("--api", default="http://localhost:8000", help="live_proof API base URL")
+    parser.add_argument("--stream-dir", default="./data/streams")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between canaries")
+    parser.add_argument("--count", type=int, default=0, help="number of canaries (0 = forever)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--poll-interval", type=float, default=0.02)
+    parser.add_argument("--report-every", type=int, default=10)
+    parser.add_argument("--api-only", action="store_true", help="do not wait for the Pathway pipeline")
+    args = parser.parse_args()
+
+    run_probe(args.api, args.stream_dir, args.interval, args.count, args.timeout,
+              args.poll_interval, args.report_every, not args.api_only)
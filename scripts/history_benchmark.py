@@ -0,0 +1,63 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from backend.utils.score_history import ScoreHistory, DAY_MS, HOUR_MS, MINUTE_MS
+
+
+def simulate_year(interval_s: float, days: int = 365, seed: int = 7) -> dict:
+    """Feed one driver a reading every `interval_s` seconds for `days` days"""
+    history = ScoreHistory()
+    readings = int(days * 86400 / interval_s)
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - days * DAY_MS
+    timestamps = start_ms + (np.arange(readings) * interval_s * 1000).astype(np.int64)
+    values = np.clip(7.5 + np.cumsum(np.random.default_rng(seed).normal(0, 0.02, readings)), 1.0, 10.0)
+
+    started = time.perf_counter()
+    for ts, value in zip(timestamps.tolist(), values.tolist()):
+        history.record("D-BENCH", value, ts)
+    append_us = (time.perf_counter() - started) / readings * 1e6
+
+    queries = {
+        "last_1h_raw": (end_ms - HOUR_MS, end_ms, None),
+        "last_24h_5m": (end_ms - DAY_MS, end_ms, 5 * MINUTE_MS),
+        "last_30d_1h": (end_ms - 30 * DAY_MS, end_ms, HOUR_MS),
+        "year_1d": (start_ms, end_ms, DAY_MS),
+    }
+    latencies = {}
+    for name, (start, end, step) in queries.items():
+        runs = 50
+        started = time.perf_counter()
+        for _ in range(runs):
+            result = history.history("D-BENCH", start, end, step)
+        latencies[name] = {"ms": round((time.perf_counter() - started) / runs * 1000, 3),
+                           "points": result["points"], "resolutions": result["resolutions"]}
+
+    stats = history.stats()
+    return {
+        "interval_s": interval_s,
+        "readings": readings,
+        "append_us": round(append_us, 2),
+        "bytes_per_driver_year": stats["bytes"],
+        "raw_equivalent_bytes": readings * 12,
+        "points_per_tier": stats["points"],
+        "queries": latencies,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score history memory per driver-year and query latency")
+    parser.add_argument("--intervals", default="60,10", help="seconds between readings, comma-separated")
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    print("📊 Score history: one driver, downsampled raw -> 1m -> 1h -> 1d")
+    for interval in args.intervals.split(","):
+        print(json.dumps(simulate_year(float(interval), args.days)))
+
+
+if __name__ == "__main__":
+    main()
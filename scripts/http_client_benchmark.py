@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scripts.mcp_cache_benchmark import percentile, wait_ready, write_streams
+
+TOOL_PATHS = ["/tools/driver_safety", "/tools/live_data", "/tools/compliance_check"]
+
+
+class UnpooledClient:
+    """The previous call pattern: a module-level requests call, new connection every time"""
+
+    def get_json(self, url: str, **kwargs):
+        import requests
+
+        try:
+            response = requests.get(url, **kwargs)
+            return response.json() if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+
+
+def summarize(name: str, latencies) -> dict:
+    return {
+        "case": name,
+        "queries": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+    }
+
+
+def bench_agent(queries: int) -> list:
+    """Per-query latency of WorkingLogisticsAgents.safety_agent (one MCP call each)"""
+    from backend.agents import working_agents as module
+    from backend.utils.http_client import http_client
+
+    results = []
+    for name, client in (("agent query, requests.get", UnpooledClient()), ("agent query, pooled", http_client)):
+        module.http_client = client
+        latencies = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            module.working_agents.safety_agent("driver safety")
+            latencies.append((time.perf_counter() - started) * 1000)
+        results.append(summarize(name, latencies))
+    module.http_client = http_client
+    return results
+
+
+async def bench_async(mcp_url: str, queries: int, concurrency: int) -> list:
+    """Three MCP tool calls per query, `concurrency` queries in flight"""
+    import aiohttp
+    from backend.utils.http_client import http_client
+
+    async def fresh_session(path):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(mcp_url + path) as response:
+                return await response.json()
+
+    async def pooled(path):
+        return await http_client.aget_json(mcp_url + path)
+
+    results = []
+    for name, call in (("async fan-out, session per call", fresh_session), ("async fan-out, pooled", pooled)):
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def query():
+            async with semaphore:
+                started = time.perf_counter()
+                await asyncio.gather(*(call(path) for path in TOOL_PATHS))
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(query() for _ in range(queries)))
+        result = summarize(name, latencies)
+        result["queries_per_sec"] = round(queries / (time.perf_counter() - started), 1)
+        results.append(result)
+    await http_client.aclose()
+    return results
+
+
+class HangingHandler(BaseHTTPRequestHandler):
+    """Upstream that accepts the request and answers only after `server.hang` seconds"""
+
+    def do_GET(self):
+        time.sleep(self.server.hang)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def check_pool_saturation(per_host: int = 2, extra: int = 4, timeout: float = 1.0,
+                          pool_timeout: float = 0.2, hang: float = 3.0) -> dict:
+    """`per_host + extra` concurrent calls to a hanging host: every call must end within its budget
+
+    The first `per_host` calls hold the pooled connections until their read
+    timeout; the others must give up after `pool_timeout` instead of queueing
+    behind them.
+    """
+    from backend.utils.http_client import HttpClient
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HangingHandler)
+    server.daemon_threads = True
+    server.hang = hang
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # High failure threshold: the breaker must not be what ends the calls early
+    client = HttpClient(per_host=per_host, timeout=timeout, pool_timeout=pool_timeout, failure_threshold=1000)
+    url = f"http://127.0.0.1:{server.server_port}/hang"
+    durations = []
+
+    def call():
+        started = time.perf_counter()
+        client.get_json(url)
+        durations.append(time.perf_counter() - started)
+
+    callers = [threading.Thread(target=call) for _ in range(per_host + extra)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    server.shutdown()
+    server.server_close()
+
+    waited = sorted(durations)[:extra]
+    return {
+        "case": "pool saturation",
+        "callers": len(callers),
+        "per_host": per_host,
+        "pool_timeouts": client.pool_timeouts,
+        "pool_wait_max_ms": round(max(waited) * 1000, 1),
+        "call_max_ms": round(max(durations) * 1000, 1),
+        "budget_ms": (timeout + pool_timeout) * 1000,
+        "ok": client.pool_timeouts == extra and max(waited) < timeout and max(durations) < timeout + pool_timeout,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent -> MCP latency with and without the pooled HTTP client")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--drivers", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8134)
+    parser.add_argument("--saturate", action="store_true",
+                        help="only check that callers beyond the pool fail within pool_timeout (exit 1 if not)")
+    args = parser.parse_args()
+
+    if args.saturate:
+        result = check_pool_saturation()
+        print(json.dumps(result))
+        sys.exit(0 if result["ok"] else 1)
+
+    workdir = tempfile.mkdtemp(prefix="intelliflow_http_")
+    shutil.copytree("config", os.path.join(workdir, "config"))
+    write_streams(workdir, args.drivers, 100)
+    server = subprocess.Popen([sys.executable, "-m", "scripts.mcp_cache_benchmark", "--serve",
+                               "--port", str(args.port), "--mode", "cached"],
+                              cwd=workdir, env={**os.environ, "PYTHONPATH": os.getcwd()})
+    mcp_url = f"http://127.0.0.1:{args.port}"
+    # Agents read MCP_URL at import; notifications off so only MCP calls are timed
+    os.environ["MCP_URL"] = mcp_url
+    for destination in ("SUPERVISORS", "FINANCE", "SECURITY"):
+        os.environ[f"NOTIFY_{destination}_URL"] = ""
+    try:
+        asyncio.run(wait_ready(args.port))
+        print(f"📊 Agent -> MCP HTTP latency ({args.queries} queries, MCP server in its own process)")
+        for result in bench_agent(args.queries) + asyncio.run(bench_async(mcp_url, args.queries, args.concurrency)):
+            print(json.dumps(result))
+        from backend.utils.http_client import http_client
+        print(json.dumps({"http_client": http_client.stats()}))
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+# entry point -> (modules it imports at startup, import budget in ms)
+ENTRY_POINTS = {
+    "api": (["backend.api.live_proof"], 350),
+    "mcp": (["backend.mcp.working_mcp"], 350),
+    "agents": (["backend.agents.langgraph_agents", "backend.agents.working_agents"], 150),
+    "dashboard": (None, 1500),  # the top-level imports of app.py
+    "pathway_mcp": (["backend.mcp.pathway_mcp_server"], 1500),
+}
+
+
+def dashboard_modules(path: str = "app.py") -> list:
+    """Modules app.py imports at top level (it is a Streamlit script, not importable itself)"""
+    with open(path, 'r') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def measure(modules: list) -> dict:
+    """Wall-clock import time in a fresh interpreter, plus the heaviest modules from -X importtime"""
+    code = ("import time; started = time.perf_counter()\n"
+            f"import {', '.join(modules)}\n"
+            "print('IMPORT_MS', (time.perf_counter() - started) * 1000)")
+    env = {**os.environ, "PYTHONPATH": os.getcwd(), "LIVE_INGEST": "0"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    marker = [line for line in proc.stdout.splitlines() if line.startswith("IMPORT_MS")]
+    if proc.returncode != 0 or not marker:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+
+    heaviest = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        heaviest.append((int(self_us), name))
+    heaviest.sort(reverse=True)
+    return {"import_ms": float(marker[0].split()[1]),
+            "heaviest_self_ms": {name: round(us / 1000, 1) for us, name in heaviest[:5]}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the API, MCP and dashboard entry points")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per entry point (best is kept)")
+    parser.add_argument("--entry-points", default=",".join(ENTRY_POINTS))
+    args = parser.parse_args()
+
+    print(f"📊 Import time per entry point (best of {args.runs} fresh interpreters)")
+    over_budget = []
+    for name in args.entry_points.split(","):
+        modules, budget_ms = ENTRY_POINTS[name]
+        modules = modules or dashboard_modules()
+        runs = [measure(modules) for _ in range(args.runs)]
+        ok = [run for run in runs if "error" not in run]
+        if not ok:
+            # e.g. streamlit or pathway not installed in this environment
+            print(json.dumps({"entry_point": name, "skipped": runs[0]["error"]}))
+            continue
+        best = min(ok, key=lambda run: run["import_ms"])
+        result = {"entry_point": name, "import_ms": round(best["import_ms"], 1), "budget_ms": budget_ms,
+                  "within_budget": best["import_ms"] <= budget_ms, "heaviest_self_ms": best["heaviest_self_ms"]}
+        if not result["within_budget"]:
+            over_budget.append(name)
+        print(json.dumps(result), flush=True)
+
+    if over_budget:
+        print(f"❌ Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("✅ All entry points within their import budget")
+
+
+if __name__ == "__main__":
+    main()
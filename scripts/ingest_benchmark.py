@@ -0,0 +1,90 @@
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.pathway.live_ingest import LiveIngest, IngestBackpressure
+from backend.utils.stream_store import LiveStreamStore
+
+
+def run_direct(records: int, rate: float, batch: int, drivers: int, max_queue: int) -> dict:
+    """Write-to-visible latency of the in-process connector path"""
+    workdir = tempfile.mkdtemp(prefix="intelliflow_ingest_")
+    ingest = LiveIngest(log_dir=f"{workdir}/log", max_queue=max_queue,
+                        store=LiveStreamStore(stream_dir=workdir))
+    ingest.start()
+    time.sleep(1.0)
+
+    start = time.time()
+    sent = 0
+    retries = 0
+    while sent < records:
+        chunk = [{"driver_id": f"BENCH-{(sent + i) % drivers}", "safety_score": 6.5, "seq": sent + i}
+                 for i in range(min(batch, records - sent))]
+        try:
+            sent += ingest.submit(chunk)
+        except IngestBackpressure:
+            retries += 1
+            time.sleep(0.001)
+            continue
+        delay = start + sent / rate - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    deadline = time.time() + 30
+    while ingest.queue_depth() and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.2)
+    elapsed = time.time() - start
+    stats = ingest.stats()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "path": "direct (python connector)",
+        "records": records,
+        "achieved_rate": round(records / elapsed, 1),
+        "backpressure_retries": retries,
+        "latency_ms": {key: stats["write_to_visible"][key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+    }
+
+
+def run_file_drop(records: int, rate: float) -> dict:
+    """Same measurement for the file-drop path (pipeline_runner --report)"""
+    command = [sys.executable, "-m", "backend.pathway.pipeline_runner", "--profile", "stream",
+               "--report", "--records", str(records), "--rate", str(rate)]
+    output = subprocess.run(command, capture_output=True, text=True).stdout
+    lines = [line for line in output.splitlines() if line.startswith('{"profile"')]
+    if not lines:
+        return {"path": "file drop", "error": "no report"}
+    report = json.loads(lines[-1])
+    return {
+        "path": "file drop (fs connector)",
+        "records": report["records_seen"],
+        "achieved_rate": report["throughput_per_sec"],
+        "latency_ms": {f"{key}_ms": value for key, value in report["latency_ms"].items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-to-visible latency: direct ingest vs file drop")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--rate", type=float, default=5000.0, help="records/sec")
+    parser.add_argument("--batch", type=int, default=50, help="records per submit (bulk ingest)")
+    parser.add_argument("--drivers", type=int, default=5000, help="distinct driver ids (upserts)")
+    parser.add_argument("--max-queue", type=int, default=10000)
+    parser.add_argument("--compare-files", action="store_true", help="also run the file-drop report")
+    args = parser.parse_args()
+
+    results = [run_direct(args.records, args.rate, args.batch, args.drivers, args.max_queue)]
+    if args.compare_files:
+        results.append(run_file_drop(min(args.records, 2000), min(args.rate, 500.0)))
+
+    print("\n📊 Write-to-visible latency")
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
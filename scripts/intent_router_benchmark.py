@@ -0,0 +1,69 @@
+import argparse
+import json
+import random
+import time
+
+WORDS = ("show me all high risk drivers with live data check overdue invoices now detect route deviations "
+         "for fleet efficiency what is the total count of critical emergency shipments on the way").split()
+ENTITIES = ("D-017", "SH-0042", "INV-0007", "Surat-Pune", "VH-003")
+
+
+def questions(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))) +
+            (f" {rng.choice(ENTITIES)}" if rng.random() < 0.3 else "") for _ in range(count)]
+
+
+def legacy_route(question: str) -> list:
+    """The chained substring checks of the four previous entry points"""
+    q = question.lower()
+    routes = []
+    if "emergency" in q or "critical" in q:
+        routes.append("emergency")
+    elif "high risk" in q or "risk" in q:
+        routes.append("high_risk")
+    elif "total" in q or "count" in q or "how many" in q:
+        routes.append("overview")
+    if "driver" in q or "safety" in q:
+        routes.append("safety")
+    elif "invoice" in q or "compliance" in q:
+        routes.append("compliance")
+    elif "fraud" in q or "anomaly" in q:
+        routes.append("fraud")
+    return routes
+
+
+def rate(name: str, func, items: list) -> dict:
+    started = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - started
+    return {"case": name, "questions": len(items), "questions_per_sec": round(len(items) / elapsed),
+            "us_per_question": round(elapsed / len(items) * 1e6, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent router throughput (target: 100k questions/s)")
+    parser.add_argument("--questions", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=2000, help="distinct questions in the repeated workload")
+    args = parser.parse_args()
+
+    from backend.utils.intent_router import intent_router
+
+    unique = questions(args.questions)
+    distinct = questions(args.distinct, seed=12)
+    repeated = [distinct[i % len(distinct)] for i in range(args.questions)]
+    # Warm the memo so the repeated case measures steady state
+    for question in distinct:
+        intent_router.route(question)
+
+    print(f"📊 Intent routing, {args.questions} questions")
+    for result in (rate("legacy substring chains (intents only)", legacy_route, unique),
+                   rate("aho-corasick + entities, uncached", intent_router.classify, unique),
+                   rate(f"memoized, {args.distinct} distinct questions", intent_router.route, repeated)):
+        print(json.dumps(result))
+    print(json.dumps({"router": intent_router.stats()}))
+
+
+if __name__ == "__main__":
+    main()
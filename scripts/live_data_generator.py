@@ -1,40 +1,95 @@
+import argparse
 import json
 import os
+import socket
 import time
 import random
 from datetime import datetime
 
-def generate_live_driver_data():
+DRIVERS = [
+    {"driver_id": "D-001", "name": "John Smith", "safety_score": 9.2, "incidents": 0},
+    {"driver_id": "D-002", "name": "Maria Garcia", "safety_score": 7.8, "incidents": 1},
+    {"driver_id": "D-003", "name": "David Chen", "safety_score": 8.5, "incidents": 0},
+]
+
+def update_driver(driver):
+    """Random safety score drift for one driver"""
+    driver["safety_score"] += random.uniform(-0.3, 0.2)
+    driver["safety_score"] = max(1.0, min(10.0, driver["safety_score"]))
+    driver["timestamp"] = datetime.now().isoformat()
+    return {
+        "content": f"Driver {driver['name']} safety analysis",
+        "driver_id": driver["driver_id"],
+        "safety_score": driver["safety_score"],
+        "timestamp": driver["timestamp"]
+    }
+
+def generate_live_driver_data(interval=10):
     """Generate live driver data for real-time demo"""
-    
+
     os.makedirs('./data/streams/drivers', exist_ok=True)
-    
-    drivers = [
-        {"driver_id": "D-001", "name": "John Smith", "safety_score": 9.2, "incidents": 0},
-        {"driver_id": "D-002", "name": "Maria Garcia", "safety_score": 7.8, "incidents": 1},
-        {"driver_id": "D-003", "name": "David Chen", "safety_score": 8.5, "incidents": 0},
-    ]
-    
+
     while True:
         # Simulate real-time updates
-        for driver in drivers:
-            # Random safety score changes
-            driver["safety_score"] += random.uniform(-0.3, 0.2)
-            driver["safety_score"] = max(1.0, min(10.0, driver["safety_score"]))
-            driver["timestamp"] = datetime.now().isoformat()
-            
+        for driver in DRIVERS:
             # Write individual files (triggers Pathway streaming)
             filename = f"./data/streams/drivers/driver_{driver['driver_id']}.json"
             with open(filename, 'w') as f:
-                json.dump({
-                    "content": f"Driver {driver['name']} safety analysis",
-                    "driver_id": driver["driver_id"],
-                    "safety_score": driver["safety_score"],
-                    "timestamp": driver["timestamp"]
-                }, f)
-        
+                json.dump(update_driver(driver), f)
+
         print(f"✅ Live data updated at {datetime.now().strftime('%H:%M:%S')}")
-        time.sleep(10)  # Update every 10 seconds
+        time.sleep(interval)  # Update every 10 seconds
+
+def connect_socket(address):
+    """Connect to the pipeline's NDJSON socket source (tcp://host:port or unix:///path)"""
+    from backend.pathway.socket_source import parse_address
+
+    scheme, host, port = parse_address(address)
+    while True:
+        try:
+            if scheme == "unix":
+                conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                conn.connect(host)
+                return conn
+            return socket.create_connection((host, port))
+        except OSError:
+            print(f"⏳ Waiting for socket source at {address}...")
+            time.sleep(1)
+
+def stream_live_driver_data(address, interval=10, extra_drivers=0):
+    """Same updates as NDJSON lines over a socket - no file create or directory scan per event"""
+
+    drivers = DRIVERS + [
+        {"driver_id": f"D-{i:05d}", "name": f"Driver {i}", "safety_score": random.uniform(5, 10), "incidents": 0}
+        for i in range(len(DRIVERS) + 1, len(DRIVERS) + 1 + extra_drivers)
+    ]
+    conn = connect_socket(address)
+
+    while True:
+        lines = []
+        for driver in drivers:
+            event = update_driver(driver)
+            event["sent_at"] = time.time()
+            lines.append(json.dumps(event))
+        try:
+            conn.sendall(("\n".join(lines) + "\n").encode())
+        except OSError:
+            conn = connect_socket(address)
+            continue
+
+        print(f"✅ Live data streamed at {datetime.now().strftime('%H:%M:%S')} ({len(lines)} events)")
+        time.sleep(interval)
 
 if __name__ == "__main__":
-    generate_live_driver_data()
+    parser = argparse.ArgumentParser(description="Live driver data generator")
+    parser.add_argument("--mode", choices=["files", "socket"], default="files",
+                        help="files: data/streams/drivers/*.json, socket: NDJSON to the stream_socket profile")
+    parser.add_argument("--address", default=os.getenv("STREAM_SOCKET_ADDRESS", "tcp://127.0.0.1:9911"))
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between update rounds")
+    parser.add_argument("--drivers", type=int, default=0, help="extra simulated drivers (socket mode)")
+    args = parser.parse_args()
+
+    if args.mode == "socket":
+        stream_live_driver_data(args.address, args.interval, args.drivers)
+    else:
+        generate_live_driver_data(args.interval)
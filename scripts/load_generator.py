@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.utils.segment_log import SegmentReader
+
+# Pipeline bookkeeping columns stripped from replayed records
+CONTROL_FIELDS = ("time", "diff", "source", "written_at", "ingested_at", "sent_at", "risk_level")
+
+
+class SyntheticEvents:
+    """Driver insert/update traffic over a pool of `drivers` ids"""
+
+    def __init__(self, drivers: int = 1000, insert_ratio: float = 0.1, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+        self.insert_ratio = insert_ratio
+        self.scores = {f"D-L{i:06d}": self.random.uniform(5.0, 10.0) for i in range(drivers)}
+        self.ids = list(self.scores)
+        self.inserts = 0
+        self.updates = 0
+
+    def next(self) -> Dict[str, Any]:
+        if not self.ids or self.random.random() < self.insert_ratio:
+            driver_id = f"D-L{len(self.ids):06d}"
+            self.ids.append(driver_id)
+            self.scores[driver_id] = self.random.uniform(5.0, 10.0)
+            self.inserts += 1
+        else:
+            driver_id = self.random.choice(self.ids)
+            self.scores[driver_id] = max(1.0, min(10.0, self.scores[driver_id] + self.random.uniform(-0.3, 0.2)))
+            self.updates += 1
+        return {
+            "driver_id": driver_id,
+            "name": f"Load Driver {driver_id[3:]}",
+            "safety_score": round(self.scores[driver_id], 3),
+            "incidents": 0,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+def load_event_log(path: str) -> List[Dict[str, Any]]:
+    """Recorded events from an NDJSON file or a segment log directory, oldest first
+
+    Each event gets `_at` (seconds) from its `sent_at`, `written_at` or
+    segment `time` so the replay can keep the original spacing.
+    """
+    if os.path.isdir(path):
+        rows: Iterator[Dict[str, Any]] = SegmentReader(path).scan()
+    else:
+        with open(path, 'r') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    events = []
+    for row in rows:
+        if row.get("diff", 1) < 0:
+            continue
+        at = row.get("sent_at") or row.get("written_at") or row.get("time", 0) / 1000
+        event = {key: value for key, value in row.items() if key not in CONTROL_FIELDS}
+        event["_at"] = float(at)
+        events.append(event)
+    events.sort(key=lambda event: event["_at"])
+    return events
+
+
+class FileTarget:
+    """One JSON file per driver in the stream folder (the `stream` profile's source)"""
+
+    def __init__(self, stream_dir: str):
+        self.stream_dir = stream_dir
+        # Temp files live outside the watched folder so no reader sees them
+        self.tmp_path = os.path.join(os.path.dirname(os.path.abspath(stream_dir)), ".load_generator.tmp")
+        os.makedirs(stream_dir, exist_ok=True)
+
+    def send(self, events: List[Dict[str, Any]]):
+        for event in events:
+            with open(self.tmp_path, 'w') as f:
+                json.dump(event, f)
+            os.replace(self.tmp_path, os.path.join(self.stream_dir, f"driver_{event['driver_id']}.json"))
+
+    def close(self):
+        pass
+
+
+class SocketTarget:
+    """NDJSON lines to the `stream_socket` profile's socket source"""
+
+    def __init__(self, address: str):
+        from scripts.live_data_generator import connect_socket
+
+        self.conn = connect_socket(address)
+
+    def send(self, events: List[Dict[str, Any]]):
+        self.conn.sendall(("\n".join(json.dumps(event) for event in events) + "\n").encode())
+
+    def close(self):
+        self.conn.close()
+
+
+class SinkTail:
+    """Follows a pipeline segment sink and records event -> output lag"""
+
+    def __init__(self, directory: str, poll_interval: float = 0.01):
+        self.reader = SegmentReader(directory)
+        self.poll_interval = poll_interval
+        segments = self.reader.segments()
+        # Only output produced after the generator starts counts
+        self.offset = segments[-1]["first_offset"] + segments[-1]["count"] if segments else 0
+        self.lags: List[tuple] = []
+        self.last_seen = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SinkTail", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            records, self.offset = self.reader.follow(self.offset)
+            seen_at = time.time()
+            if records:
+                self.last_seen = seen_at
+            for record in records:
+                if record.get("diff", 1) > 0 and record.get("written_at"):
+                    self.lags.append((record["written_at"], (seen_at - record["written_at"]) * 1000))
+            if not records:
+                time.sleep(self.poll_interval)
+
+    def settle(self, quiet: float = 0.5, timeout: float = 30.0):
+        """Wait until the sink has been idle for `quiet` seconds"""
+        deadline = time.time() + timeout
+        while time.time() < deadline and time.time() - self.last_seen < quiet:
+            time.sleep(0.05)
+
+    def window(self, start: float, end: float) -> List[tuple]:
+        """(written_at, lag_ms) for events written in [start, end)"""
+        return [lag for lag in list(self.lags) if start <= lag[0] < end]
+
+
+def run_step(target, events, rate: float, duration: float, record_file=None,
+             tick: float = 0.005) -> Dict[str, Any]:
+    """Send synthetic events at `rate`/s (or replay recorded ones) and time the sender"""
+    start = time.time()
+    sent = 0
+    max_behind = 0.0
+
+    if isinstance(events, SyntheticEvents):
+        total = int(rate * duration)
+        due_at = lambda n: start + n / rate
+        next_batch = lambda n: [events.next() for _ in range(n)]
+    else:
+        recorded, speed = events
+        total = len(recorded)
+        origin = recorded[0]["_at"] if recorded else 0.0
+        due_at = lambda n: start + (recorded[n]["_at"] - origin) / speed
+        next_batch = lambda n: [{k: v for k, v in recorded[sent + i].items() if k != "_at"} for i in range(n)]
+
+    while sent < total:
+        now = time.time()
+        # Everything that is due by now goes out in one batch
+        due = sent
+        while due < total and due_at(due) <= now:
+            due += 1
+        if due == sent:
+            time.sleep(min(tick, max(0.0, due_at(sent) - now)))
+            continue
+        max_behind = max(max_behind, now - due_at(sent))
+        batch = next_batch(due - sent)
+        sent_at = time.time()
+        for event in batch:
+            event["sent_at"] = sent_at
+        target.send(batch)
+        if record_file is not None:
+            for event in batch:
+                record_file.write(json.dumps(event) + "\n")
+        sent = due
+
+    elapsed = max(time.time() - start, 1e-9)
+    return {
+        "events": sent,
+        "seconds": round(elapsed, 3),
+        "achieved_rate": round(sent / elapsed, 1),
+        "max_behind_schedule_ms": round(max_behind * 1000, 1),
+        "start": start,
+        "end": time.time(),
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100))], 1)
+
+
+def lag_summary(lags: List[tuple]) -> Dict[str, Any]:
+    """Lag percentiles plus first-half vs second-half median (growth means queueing)"""
+    if not lags:
+        return {"visible": 0}
+    values = sorted(lag for _, lag in lags)
+    # Halves by write time: a growing backlog makes later events wait longer
+    ordered = [lag for _, lag in sorted(lags)]
+    half = len(ordered) // 2
+    return {
+        "visible": len(lags),
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "p99": _percentile(values, 99),
+        "max": round(values[-1], 1),
+        "median_first_half": _percentile(sorted(ordered[:half]) or [0.0], 50),
+        "median_second_half": _percentile(sorted(ordered[half:]), 50),
+    }
+
+
+def resolve_profile(name: str) -> Dict[str, Any]:
+    """Target and sink of a pipeline profile (socket/file source, first segments sink)"""
+    with open(os.getenv("PIPELINE_PROFILES", "./config/pipeline_profiles.json"), 'r') as f:
+        profile = json.load(f)[name]
+    source = profile["sources"][0]
+    sinks = [sink["path"] for sink in profile.get("sinks", []) if sink.get("format") == "segments"]
+    return {
+        "target": "socket" if source.get("format") == "ndjson_socket" else "files",
+        "address": source.get("address"),
+        "stream_dir": source.get("path"),
+        "sink": sinks[0] if sinks else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Configurable-rate load generator / event log replayer")
+    parser.add_argument("--profile", help="take target and sink from a pipeline profile (e.g. stream_socket)")
+    parser.add_argument("--target", choices=["files", "socket"], default=None)
+    parser.add_argument("--stream-dir", default=None, help="files target folder")
+    parser.add_argument("--address", default=None, help="socket target (tcp://host:port or unix:///path)")
+    parser.add_argument("--sink", default=None, help="segment sink to follow for end-to-end lag")
+    parser.add_argument("--rate", default="1000", help="events/sec, comma-separated for a step sweep")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per rate step")
+    parser.add_argument("--drivers", type=int, default=1000, help="initial distinct drivers")
+    parser.add_argument("--insert-ratio", type=float, default=0.1, help="share of events that add a new driver")
+    parser.add_argument("--replay", help="NDJSON file or segment log directory to replay instead")
+    parser.add_argument("--speed", default="1", help="replay speed multiplier, comma-separated for a sweep")
+    parser.add_argument("--record", help="also append every sent event to this NDJSON file")
+    parser.add_argument("--settle", type=float, default=30.0, help="max seconds to wait for output after each step")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = resolve_profile(args.profile) if args.profile else {}
+    target_name = args.target or settings.get("target", "files")
+    sink = args.sink or settings.get("sink")
+    if target_name == "socket":
+        target = SocketTarget(args.address or settings.get("address") or
+                              os.getenv("STREAM_SOCKET_ADDRESS", "tcp://127.0.0.1:9911"))
+    else:
+        target = FileTarget(args.stream_dir or settings.get("stream_dir") or "./data/streams/drivers")
+
+    tail = SinkTail(sink) if sink else None
+    if tail:
+        tail.start()
+    record_file = open(args.record, 'a') if args.record else None
+
+    if args.replay:
+        recorded = load_event_log(args.replay)
+        steps = [("speed", float(speed)) for speed in args.speed.split(",")]
+        print(f"🔁 Replaying {len(recorded)} events from {args.replay} → {target_name}")
+    else:
+        synthetic = SyntheticEvents(args.drivers, args.insert_ratio, args.seed)
+        steps = [("rate", float(rate)) for rate in args.rate.split(",")]
+        print(f"🚚 Load: {args.drivers} drivers, {args.insert_ratio:.0%} inserts → {target_name}")
+
+    results = []
+    try:
+        for kind, value in steps:
+            if kind == "speed":
+                step = run_step(target, (recorded, value), 0.0, 0.0, record_file)
+            else:
+                step = run_step(target, synthetic, value, args.duration, record_file)
+            result = {kind: value, **{k: v for k, v in step.items() if k not in ("start", "end")}}
+            if kind == "rate":
+                result["target_rate"] = value
+            if tail:
+                tail.settle(timeout=args.settle)
+                result["lag_ms"] = lag_summary(tail.window(step["start"], step["end"]))
+            results.append(result)
+            print(json.dumps(result))
+    finally:
+        target.close()
+        if record_file is not None:
+            record_file.close()
+        if tail:
+            tail.stop()
+
+    if not args.replay:
+        print(f"📦 Mix: {synthetic.inserts} inserts / {synthetic.updates} updates")
+    # Lag grows once the pipeline cannot keep up: the second half of a step waits longer
+    saturated = [r for r in results if r.get("lag_ms", {}).get("visible")
+                 and r["lag_ms"]["median_second_half"] > 2 * max(r["lag_ms"]["median_first_half"], 50.0)]
+    if saturated:
+        first = saturated[0]
+        print(f"📈 Lag starts growing at {first.get('rate', first.get('speed'))} "
+              f"({'ev/s' if 'rate' in first else 'x speed'}, achieved {first['achieved_rate']} ev/s)")
+    elif tail:
+        print("✅ Lag stayed flat at every step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+TOOLS = {
+    "live_data": ("GET", "/tools/live_data", None),
+    "driver_safety": ("GET", "/tools/driver_safety", None),
+    "batch": ("POST", "/tools/batch", {"calls": [{"tool": "live_data"}, {"tool": "driver_safety"},
+                                                  {"tool": "anomalies"}]}),
+}
+
+
+def write_streams(directory: str, drivers: int, shipments: int, seed: int = 7):
+    """drivers.json with `drivers` records (~1% high risk) and a shipments.json"""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(directory, "data", "streams"), exist_ok=True)
+    records = [{"driver_id": f"D-{i:06d}", "name": f"Driver {i}",
+                "safety_score": round(rng.uniform(2.0, 6.9) if rng.random() < 0.01 else rng.uniform(7.0, 10.0), 2),
+                "incidents": rng.randint(0, 5)} for i in range(drivers)]
+    write_json(os.path.join(directory, "data", "streams", "drivers.json"), records)
+    write_json(os.path.join(directory, "data", "streams", "shipments.json"),
+               [{"shipment_id": f"SH-{i:05d}", "route": "Delhi-Mumbai", "value": 1000,
+                 "deviation": rng.choice([0, 5, 45])} for i in range(shipments)])
+
+
+def write_json(path: str, data):
+    with open(path + ".tmp", 'w') as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def serve(port: int, mode: str, latency_ms: float = 0.0):
+    """Run WorkingMCPServer from the current directory (benchmark child process)"""
+    import uvicorn
+    from backend.mcp.working_mcp import WorkingMCPServer
+    from backend.utils import file_cache as cache_module
+
+    if mode == "reload":
+        # Previous behaviour: every call parses the file on the event loop
+        async def load(path, default=None):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                return default
+        cache_module.file_cache.get = load
+
+    server = WorkingMCPServer()
+    if latency_ms:
+        # Simulated network / remote MCP latency per request
+        @server.app.middleware("http")
+        async def delay(request, call_next):
+            await asyncio.sleep(latency_ms / 1000)
+            return await call_next(request)
+
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="error")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+async def drive(port: int, tool: str, duration: float, concurrency: int) -> dict:
+    import aiohttp
+
+    method, path, body = TOOLS[tool]
+    url = f"http://127.0.0.1:{port}{path}"
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(session):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with session.request(method, url, json=body) as response:
+                await response.read()
+                if response.status != 200:
+                    errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "tool": tool,
+        "qps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "errors": errors,
+    }
+
+
+async def wait_ready(port: int, timeout: float = 30.0):
+    import aiohttp
+
+    deadline = time.time() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f"http://127.0.0.1:{port}/") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                if time.time() > deadline:
+                    raise
+            await asyncio.sleep(0.1)
+
+
+def run_mode(mode: str, workdir: str, port: int, tools, duration: float, concurrency: int,
+             rewrite_every: float) -> list:
+    server = subprocess.Popen([sys.executable, "-m", "scripts.mcp_cache_benchmark", "--serve",
+                               "--port", str(port), "--mode", mode],
+                              cwd=workdir, env={**os.environ, "PYTHONPATH": os.getcwd()})
+    stop = threading.Event()
+    drivers_path = os.path.join(workdir, "data", "streams", "drivers.json")
+
+    def rewrite():
+        # The producer keeps replacing the file: calls arriving during a reload share one parse
+        with open(drivers_path, 'r') as f:
+            records = json.load(f)
+        while not stop.wait(rewrite_every):
+            records[0]["safety_score"] = round(random.uniform(7.0, 10.0), 2)
+            write_json(drivers_path, records)
+
+    try:
+        asyncio.run(wait_ready(port))
+        if rewrite_every:
+            threading.Thread(target=rewrite, daemon=True).start()
+        results = []
+        for tool in tools:
+            result = asyncio.run(drive(port, tool, duration, concurrency))
+            result["mode"] = mode
+            results.append(result)
+            print(json.dumps(result), flush=True)
+        if mode == "cached":
+            async def cache_stats():
+                import aiohttp
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(f"http://127.0.0.1:{port}/cache") as response:
+                        return await response.json()
+            print(json.dumps({"mode": mode, "file_cache": asyncio.run(cache_stats())}), flush=True)
+        return results
+    finally:
+        stop.set()
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP tool QPS with the shared file cache vs per-call reloads")
+    parser.add_argument("--drivers", type=int, default=100000)
+    parser.add_argument("--shipments", type=int, default=1000)
+    parser.add_argument("--tools", default="live_data,driver_safety,batch")
+    parser.add_argument("--modes", default="reload,cached", help="reload (per-call parse) and/or cached")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per tool")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rewrite-every", type=float, default=1.0,
+                        help="seconds between drivers.json rewrites during the run (0 = never)")
+    parser.add_argument("--port", type=int, default=8133)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="cached", help=argparse.SUPPRESS)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.mode, args.latency_ms)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="intelliflow_mcp_")
+    # The server runs from the temp dir and reads ./config (alert rules) there
+    shutil.copytree("config", os.path.join(workdir, "config"))
+    write_streams(workdir, args.drivers, args.shipments)
+    size_mb = os.path.getsize(os.path.join(workdir, "data", "streams", "drivers.json")) / 1e6
+    print(f"📊 MCP tool QPS: {args.drivers} drivers ({size_mb:.1f} MB), concurrency {args.concurrency}, "
+          f"drivers.json rewritten every {args.rewrite_every}s")
+    for mode in args.modes.split(","):
+        run_mode(mode, workdir, args.port, args.tools.split(","), args.duration, args.concurrency,
+                 args.rewrite_every)
+
+
+if __name__ == "__main__":
+    main()
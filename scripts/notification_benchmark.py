@@ -0,0 +1,80 @@
+import argparse
+import json
+import random
+import time
+
+from backend.utils.notifier import Notifier, NOTIFICATIONS_PATH
+from scripts.webhook_sink import WebhookSink
+
+RULES = ["driver_high_risk", "driver_critical", "invoice_overdue", "shipment_route_deviation"]
+
+
+def run(alerts: int, per_minute: float, port: int, latency_ms: float, fail_rate: float, drain_timeout: float) -> dict:
+    """Push `alerts` alert notifications at `per_minute` through the notifier into a local webhook"""
+    sink = WebhookSink(port=port, latency_ms=latency_ms, fail_rate=fail_rate).start()
+    with open(NOTIFICATIONS_PATH, 'r') as f:
+        destinations = json.load(f)["destinations"]
+    for destination in destinations:
+        destination["url"] = f"http://127.0.0.1:{port}/hooks/{destination['name']}"
+    notifier = Notifier(destinations)
+    notifier.start()
+
+    call_us = []
+    interval = 60.0 / per_minute
+    start = time.time()
+    for seq in range(alerts):
+        alert = {"rule": random.choice(RULES), "entity_id": f"BENCH-{seq}", "seq": seq, "fired_at": time.time()}
+        began = time.perf_counter()
+        notifier.notify_alerts([alert])
+        call_us.append((time.perf_counter() - began) * 1e6)
+        delay = start + (seq + 1) * interval - time.time()
+        if delay > 0:
+            time.sleep(delay)
+    produced_in = time.time() - start
+
+    deadline = time.time() + drain_timeout
+    stats = notifier.stats()
+    while time.time() < deadline:
+        stats = notifier.stats()
+        if all(s["pending"] == 0 for s in stats.values()) and \
+                sum(s["delivered"] + s["failed"] for s in stats.values()) >= alerts:
+            break
+        time.sleep(0.05)
+    elapsed = time.time() - start
+    sink.stop()
+
+    call_us.sort()
+    lags = sorted((arrived - n["fired_at"]) * 1000 for arrived, n in sink.arrivals)
+    pick = lambda values, pct: round(values[min(len(values) - 1, int(len(values) * pct / 100))], 2) if values else 0.0
+    return {
+        "alerts": alerts,
+        "target_per_minute": per_minute,
+        "achieved_per_minute": round(sum(s["delivered"] for s in stats.values()) / elapsed * 60, 1),
+        "delivered": sum(s["delivered"] for s in stats.values()),
+        "failed": sum(s["failed"] for s in stats.values()),
+        "dropped": sum(s["dropped"] for s in stats.values()),
+        "http_requests": sink.requests,
+        "injected_failures": sink.failures,
+        "retries": sum(s["retries"] for s in stats.values()),
+        "notify_call_us": {"p50": pick(call_us, 50), "p99": pick(call_us, 99), "max": round(call_us[-1], 2)},
+        "delivery_lag_ms": {"p50": pick(lags, 50), "p95": pick(lags, 95), "p99": pick(lags, 99)},
+        "produce_seconds": round(produced_in, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert notification fan-out throughput")
+    parser.add_argument("--alerts", type=int, default=10000)
+    parser.add_argument("--per-minute", type=float, default=10000.0)
+    parser.add_argument("--port", type=int, default=9109)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="webhook response time")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="share of webhook calls answered 503")
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print("📨 Notification fan-out benchmark (local webhook stand-in)")
+    print(json.dumps(run(args.alerts, args.per_minute, args.port, args.latency_ms, args.fail_rate, args.drain_timeout)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import copy
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.pathway.pipeline_runner import load_profile, _fixture_record
+
+FINISHED = re.compile(r"finished in ([0-9.]+)s")
+
+
+def write_fixture(directory: str, schema: dict, key: str, files: int, records_per_file: int,
+                  entities: int):
+    """Stream folder of JSON arrays; records cycle over `entities` distinct ids"""
+    for i in range(files):
+        records = []
+        for j in range(records_per_file):
+            seq = i * records_per_file + j
+            record = _fixture_record(schema, key, seq % entities)
+            record["incidents"] = seq
+            records.append(record)
+        with open(os.path.join(directory, f"fixture_{i:07d}.json"), 'w') as f:
+            json.dump(records, f)
+
+
+def run_once(profiles_path: str, workers: int, processes: int) -> float:
+    """Seconds spent in pw.run() catching up with the fixture"""
+    env = dict(os.environ, PIPELINE_PROFILES=profiles_path)
+    command = [sys.executable, "-m", "backend.pathway.pipeline_runner", "--profile", "scaling",
+               "--workers", str(workers), "--processes", str(processes)]
+    started = time.time()
+    output = subprocess.run(command, env=env, capture_output=True, text=True).stdout
+    times = [float(match) for match in FINISHED.findall(output)]
+    # With several processes every process reports; the slowest one is the run
+    return max(times) if times else time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline throughput at 1, 2, 4 and 8 workers")
+    parser.add_argument("--profile", default="stream")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--records-per-file", type=int, default=50)
+    parser.add_argument("--entities", type=int, default=10000, help="distinct entity ids in the fixture")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--scale", default="processes", choices=["threads", "processes"],
+                        help="scale worker threads in one process, or processes with one thread each")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="intelliflow_scaling_")
+    stream_dir = os.path.join(workdir, "streams")
+    os.makedirs(stream_dir)
+
+    profile = copy.deepcopy(load_profile(args.profile))
+    source = profile["sources"][0]
+    schema = profile["schemas"][source["entity"]]
+    key = source.get("key", "driver_id")
+    records = args.files * args.records_per_file
+    print(f"📦 Writing {args.files} files x {args.records_per_file} records "
+          f"({args.entities} entities) to {stream_dir}...")
+    write_fixture(stream_dir, schema, key, args.files, args.records_per_file, args.entities)
+
+    # Static mode over the same fixture: the run ends once every file is processed
+    profile.update(mode="static", rag=None, freshness=None, persistence=None)
+    profile["sinks"] = [{"entity": source["entity"], "format": "segments",
+                         "path": os.path.join(workdir, "processed")}]
+    for entry in profile["sources"]:
+        entry["path"] = stream_dir
+    if profile.get("aggregates"):
+        profile["aggregates"] = {"snapshot_path": os.path.join(workdir, "aggregates.json")}
+    profiles_path = os.path.join(workdir, "profiles.json")
+    with open(profiles_path, 'w') as f:
+        json.dump({"scaling": profile}, f)
+
+    results = []
+    for count in [int(value) for value in args.workers.split(",")]:
+        workers, processes = (count, 1) if args.scale == "threads" else (1, count)
+        seconds = run_once(profiles_path, workers, processes)
+        results.append((count, seconds))
+
+    print(f"\n📊 Scaling {args.scale} for profile '{args.profile}' ({records} records, {os.cpu_count()} CPUs)")
+    print(f"{args.scale:>10} {'seconds':>10} {'rec/s':>12} {'speedup':>10}")
+    baseline = results[0][1] if results else 0
+    for count, seconds in results:
+        print(f"{count:>10} {seconds:>10.2f} {records / seconds:>12.0f} {baseline / seconds:>9.2f}x")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
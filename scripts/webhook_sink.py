@@ -0,0 +1,79 @@
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class WebhookSink:
+    """Local stand-in for notification webhooks: counts batches, can inject latency and failures"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100, latency_ms: float = 0.0,
+                 fail_rate: float = 0.0, verbose: bool = False):
+        self.latency_ms = latency_ms
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        self.requests = 0
+        self.failures = 0
+        self.received = 0
+        self.by_path = {}
+        self.arrivals = []
+        self._lock = threading.Lock()
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if sink.latency_ms:
+                    time.sleep(sink.latency_ms / 1000)
+                with sink._lock:
+                    sink.requests += 1
+                    failed = random.random() < sink.fail_rate
+                    if failed:
+                        sink.failures += 1
+                if failed:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                document = json.loads(body or b"{}")
+                notifications = document.get("notifications", [])
+                now = time.time()
+                with sink._lock:
+                    sink.received += len(notifications)
+                    sink.by_path[self.path] = sink.by_path.get(self.path, 0) + len(notifications)
+                    sink.arrivals.extend((now, n) for n in notifications)
+                if sink.verbose:
+                    print(f"📨 {self.path}: {len(notifications)} notifications at {datetime.now().strftime('%H:%M:%S')}")
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    def start(self) -> "WebhookSink":
+        threading.Thread(target=self.server.serve_forever, name="WebhookSink", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local webhook stand-in for alert notifications")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args()
+
+    sink = WebhookSink(port=args.port, latency_ms=args.latency_ms, fail_rate=args.fail_rate, verbose=True)
+    print(f"🪝 Webhook stand-in on http://127.0.0.1:{args.port}/hooks/<destination>")
+    sink.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()